@@ -0,0 +1,206 @@
+"""
+Apply Journal
+Write-ahead journal of system changes with their before-state, for rollback
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Reihenfolge beim Zurücknehmen, wenn zwei Arten gleich spät angewendet wurden
+ROLLBACK_KINDS = ('hostname', 'workgroup', 'drive', 'route', 'network', 'file')
+
+# Können auch bei einem Fehler teilweise angewendet sein (netsh-Skript, Dateigruppe)
+PARTIAL_KINDS = ('network', 'file')
+
+
+class JournalEntry:
+    """One intended change, merged with its outcome and rollback records"""
+
+    def __init__(self, seq: int, kind: str, key: str, before: Any, after: Any, created: str = ''):
+        self.seq = seq
+        self.kind = kind
+        self.key = key
+        self.before = before
+        self.after = after
+        self.created = created
+        # None = Ausgang unbekannt (Abbruch mitten in der Änderung)
+        self.success: Optional[bool] = None
+        self.message = ''
+        self.rolled_back = False
+
+    def __repr__(self) -> str:
+        return f"JournalEntry({self.seq}, {self.kind!r}, {self.key!r}, success={self.success})"
+
+
+class Journal:
+    """
+    Append-only JSON-lines journal of one run
+
+    ``intent()`` is written and fsynced before the change is made, so after
+    a crash or power loss every change that may have happened is on disk
+    together with the state to restore. ``outcome()`` records the result,
+    ``item_done()`` the progress per configuration item (for resuming).
+    A journal without a path records nothing (dry runs).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._file = None
+        self._lock = threading.Lock()
+        self._seq = 0
+        if self.path is not None and self.path.exists():
+            entries = self.read(str(self.path))
+            self._seq = max((entry.seq for entry in entries), default=0)
+
+    def _write(self, record: Dict[str, Any], sync: bool):
+        if self.path is None:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if self._file.tell() and not self._ends_with_newline():
+                # Abgebrochene letzte Zeile abschließen, sonst geht der nächste Eintrag mit ihr verloren
+                self._file.write('\n')
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def intent(self, kind: str, key: str, before: Any, after: Any) -> int:
+        """
+        Record a change before making it
+
+        Args:
+            kind: Change type (one of ROLLBACK_KINDS)
+            key: What is changed (interface, drive letter, route, ...)
+            before: State to restore on rollback (None = did not exist)
+            after: State being applied
+
+        Returns:
+            Sequence number for ``outcome()``
+        """
+        with self._lock:
+            self._seq += 1
+            self._write({'t': 'intent', 'seq': self._seq, 'kind': kind, 'key': key,
+                         'before': before, 'after': after,
+                         'created': datetime.now().isoformat(timespec='seconds')}, sync=True)
+            return self._seq
+
+    def outcome(self, seq: int, success: bool, message: str = ''):
+        """Record the result of a change"""
+        with self._lock:
+            self._write({'t': 'done', 'seq': seq, 'ok': success, 'message': message}, sync=False)
+
+    def rolled_back(self, seq: int, success: bool, message: str = ''):
+        """Record that a change was undone (or that undoing it failed)"""
+        with self._lock:
+            self._write({'t': 'rollback', 'seq': seq, 'ok': success, 'message': message}, sync=True)
+
+    def item_done(self, config_key: str, success: bool):
+        """Record that a configuration item finished"""
+        with self._lock:
+            self._write({'t': 'item', 'key': config_key, 'ok': success}, sync=True)
+
+    @staticmethod
+    def completed_items(path: str) -> Set[str]:
+        """Config keys of the items that finished successfully in a journal"""
+        completed = set()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('t') == 'item':
+                        if record.get('ok'):
+                            completed.add(record['key'])
+                        else:
+                            completed.discard(record['key'])
+        except FileNotFoundError:
+            pass
+        return completed
+
+    @contextmanager
+    def change(self, kind: str, key: str, before: Any, after: Any):
+        """Journal a single change: intent before the block, outcome after it"""
+        seq = self.intent(kind, key, before, after)
+        try:
+            yield seq
+        except Exception as e:
+            self.outcome(seq, False, str(e))
+            raise
+        self.outcome(seq, True)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def read(path: str) -> List[JournalEntry]:
+        """
+        Read a journal file
+
+        A partly written last line (crash while appending) is ignored.
+
+        Returns:
+            Entries in sequence order
+        """
+        entries: Dict[int, JournalEntry] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                seq = record.get('seq')
+                if record.get('t') == 'intent':
+                    entries[seq] = JournalEntry(seq, record['kind'], record.get('key', ''),
+                                                record.get('before'), record.get('after'),
+                                                record.get('created', ''))
+                elif seq in entries and record.get('t') == 'done':
+                    entries[seq].success = record.get('ok')
+                    entries[seq].message = record.get('message', '')
+                elif seq in entries and record.get('t') == 'rollback' and record.get('ok'):
+                    entries[seq].rolled_back = True
+        return [entries[seq] for seq in sorted(entries)]
+
+
+def plan_rollback(entries: List[JournalEntry]) -> List[Tuple[str, List[JournalEntry]]]:
+    """
+    Group the changes to undo by kind, latest kind first
+
+    Changes with unknown outcome are undone as well (they may have been
+    half applied); restoring a before-state is safe to repeat. Failed
+    changes are skipped, except for PARTIAL_KINDS: a failed single command
+    (drive, route, hostname, workgroup) changed nothing, while a failed
+    netsh script or file group may have applied some of its steps. Within a
+    group entries are in reverse order, so the kinds can be undone as one
+    batch each (e.g. all drive mappings in one process).
+
+    Returns:
+        List of (kind, entries)
+    """
+    groups: Dict[str, List[JournalEntry]] = {}
+    for entry in reversed(entries):
+        if entry.rolled_back or (entry.success is False and entry.kind not in PARTIAL_KINDS):
+            continue
+        groups.setdefault(entry.kind, []).append(entry)
+
+    def order(kind: str):
+        latest = groups[kind][0].seq
+        rank = ROLLBACK_KINDS.index(kind) if kind in ROLLBACK_KINDS else len(ROLLBACK_KINDS)
+        return -latest, rank
+
+    return [(kind, groups[kind]) for kind in sorted(groups, key=order)]
@@ -0,0 +1,240 @@
+"""
+Apply Scheduler
+Runs selected configuration items as a dependency graph on a bounded worker pool
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+# Kategorie -> Kategorien, die vorher abgeschlossen sein müssen
+CATEGORY_DEPENDENCIES = {
+    'routes': ('network',),
+    'network_drives': ('network',),
+}
+
+# Laufen nach allen anderen Kategorien, nacheinander in dieser Reihenfolge
+# (Umbenennungen erfordern einen Neustart und sollen nichts anderes stören)
+FINAL_CATEGORIES = ('domain', 'workgroup', 'hostname')
+
+DEFAULT_WORKERS = 4
+
+
+class ApplyTask:
+    """A single selected configuration item"""
+
+    __slots__ = ('config_key', 'category', 'item_key', 'config', 'batch', 'depends_on', 'dependents')
+
+    def __init__(self, category: str, item_key: str, config: Any,
+                 batch: Optional[List['ApplyTask']] = None):
+        """
+        Args:
+            category: Configuration category
+            item_key: Item key within the category
+            config: Item configuration
+            batch: For batch tasks, the single-item tasks applied together
+        """
+        self.config_key = f"{category}.{item_key}"
+        self.category = category
+        self.item_key = item_key
+        self.config = config
+        self.batch = batch
+        self.depends_on: List['ApplyTask'] = []
+        self.dependents: List['ApplyTask'] = []
+
+    def __repr__(self) -> str:
+        return f"ApplyTask({self.config_key!r})"
+
+
+class TaskResult:
+    """Outcome of a task"""
+
+    __slots__ = ('task', 'success', 'message', 'skipped', 'duration')
+
+    def __init__(self, task: ApplyTask, success: bool, message: str,
+                 skipped: bool = False, duration: float = 0.0):
+        self.task = task
+        self.success = success
+        self.message = message
+        self.skipped = skipped
+        self.duration = duration
+
+
+def build_graph(items: Iterable[Tuple[str, str, Any]],
+                batch_categories: Iterable[str] = ()) -> List[ApplyTask]:
+    """
+    Build the dependency graph for the selected items
+
+    Args:
+        items: (category, item_key, config) tuples in file order
+        batch_categories: Categories whose items become one batch task
+
+    Returns:
+        Tasks in file order, with depends_on/dependents filled in
+    """
+    batch_categories = set(batch_categories)
+    tasks = []
+    batches: Dict[str, ApplyTask] = {}
+    for category, item_key, config in items:
+        task = ApplyTask(category, item_key, config)
+        if category not in batch_categories:
+            tasks.append(task)
+        elif category in batches:
+            batch = batches[category]
+            batch.batch.append(task)
+            batch.item_key = ', '.join(t.item_key for t in batch.batch)
+        else:
+            batches[category] = ApplyTask(category, item_key, None, batch=[task])
+            tasks.append(batches[category])
+
+    by_category: Dict[str, List[ApplyTask]] = {}
+    for task in tasks:
+        by_category.setdefault(task.category, []).append(task)
+
+    def link(before: ApplyTask, after: ApplyTask):
+        after.depends_on.append(before)
+        before.dependents.append(after)
+
+    for task in tasks:
+        if task.category in FINAL_CATEGORIES:
+            continue
+        for dep_category in CATEGORY_DEPENDENCIES.get(task.category, ()):
+            for dep in by_category.get(dep_category, ()):
+                link(dep, task)
+
+    # Abschlusskette: alle übrigen Tasks -> domain -> workgroup -> hostname
+    previous = [task for task in tasks if task.category not in FINAL_CATEGORIES]
+    for category in FINAL_CATEGORIES:
+        for task in by_category.get(category, ()):
+            for dep in previous:
+                link(dep, task)
+            previous = [task]
+    return tasks
+
+
+class ApplyScheduler:
+    """
+    Runs ApplyTasks in dependency order on a thread pool
+
+    Independent tasks run in parallel (up to ``max_workers``); a task starts
+    as soon as all tasks it depends on have finished.
+    """
+
+    def __init__(self, apply_func: Callable[[str, Any, str], Tuple[bool, str]],
+                 batch_func: Optional[Callable[[str, List[Tuple[str, Any]]], Dict[str, Tuple[bool, str]]]] = None,
+                 max_workers: int = DEFAULT_WORKERS,
+                 should_continue: Optional[Callable[[], bool]] = None,
+                 on_start: Optional[Callable[[ApplyTask], None]] = None,
+                 on_done: Optional[Callable[[TaskResult], None]] = None):
+        """
+        Args:
+            apply_func: Called as apply_func(category, config, item_key), e.g. ConfigApplier.apply_configuration
+            batch_func: Called as batch_func(category, [(item_key, config), ...]) for batch
+                tasks and returns {item_key: (success, message)}, e.g. ConfigApplier.apply_batch
+            max_workers: Size of the worker pool
+            should_continue: Checked before each task; False skips all remaining tasks
+            on_start: Callback when a task starts (called from a worker thread)
+            on_done: Callback with the TaskResult (called from a worker thread)
+        """
+        self.apply_func = apply_func
+        self.batch_func = batch_func
+        self.max_workers = max(1, max_workers)
+        self.should_continue = should_continue or (lambda: True)
+        self.on_start = on_start
+        self.on_done = on_done
+        self.results: List[TaskResult] = []
+        self._lock = threading.Lock()
+
+    def _record(self, result: TaskResult):
+        with self._lock:
+            self.results.append(result)
+        if self.on_done:
+            self.on_done(result)
+
+    def _record_failure(self, result: TaskResult, error: Exception):
+        """Replace a result whose recording failed by a failure of the same item"""
+        failure = TaskResult(result.task, False,
+                             f"Fehler bei {result.task.config_key}: {str(error)}",
+                             duration=result.duration)
+        with self._lock:
+            if result in self.results:
+                self.results.remove(result)
+            self.results.append(failure)
+
+    def _run_task(self, task: ApplyTask) -> List[TaskResult]:
+        members = task.batch or [task]
+        if not self.should_continue():
+            return [TaskResult(member, False, "Abgebrochen", skipped=True) for member in members]
+        if self.on_start:
+            self.on_start(task)
+        started = time.perf_counter()
+        try:
+            if task.batch is not None and self.batch_func:
+                outcome = self.batch_func(task.category, [(m.item_key, m.config) for m in members])
+            else:
+                outcome = {m.item_key: self.apply_func(m.category, m.config, m.item_key) for m in members}
+        except Exception as e:
+            outcome = {m.item_key: (False, f"Fehler bei {m.config_key}: {str(e)}") for m in members}
+        duration = time.perf_counter() - started
+        return [TaskResult(m, *outcome.get(m.item_key, (False, "Kein Ergebnis")), duration=duration)
+                for m in members]
+
+    def run(self, tasks: List[ApplyTask]) -> List[TaskResult]:
+        """
+        Execute all tasks and wait for completion
+
+        Returns:
+            Results in completion order
+        """
+        remaining = {id(task): len(task.depends_on) for task in tasks}
+        done = threading.Event()
+        pending = [len(tasks)]
+        if not tasks:
+            return []
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix='apply')
+
+        def submit(task: ApplyTask):
+            executor.submit(self._run_task, task).add_done_callback(
+                lambda future, t=task: finished(t, future))
+
+        def finished(task: ApplyTask, future):
+            # Läuft im Worker-Thread: jede Ausnahme hier würde von der
+            # Future verschluckt und run() nie zurückkehren
+            ready = []
+            try:
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [TaskResult(task, False, str(e))]
+                for result in results:
+                    try:
+                        self._record(result)
+                    except Exception as e:
+                        self._record_failure(result, e)
+
+                with self._lock:
+                    for dependent in task.dependents:
+                        remaining[id(dependent)] -= 1
+                        if remaining[id(dependent)] == 0:
+                            ready.append(dependent)
+            finally:
+                with self._lock:
+                    pending[0] -= 1
+                    all_done = pending[0] == 0
+                try:
+                    for dependent in ready:
+                        submit(dependent)
+                finally:
+                    if all_done:
+                        done.set()
+
+        try:
+            for task in tasks:
+                if not task.depends_on:
+                    submit(task)
+            done.wait()
+        finally:
+            executor.shutdown(wait=True)
+        return list(self.results)
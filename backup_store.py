@@ -0,0 +1,278 @@
+"""
+Backup Store
+Content-addressed, deduplicated storage for the backups of APPLY runs
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Standard-Ablage, relativ zum Arbeitsverzeichnis wie die früheren APPLY_Backup_<Zeit>-Ordner
+DEFAULT_BACKUP_ROOT = 'APPLY_Backup'
+
+CHUNK_SIZE = 64 * 1024
+
+# Chunks, die jünger sind, löscht gc() nicht (ein laufender Lauf hat sie evtl. noch nicht im Manifest)
+GC_GRACE_SECONDS = 3600
+
+
+def chunk_digest(data: bytes) -> str:
+    """Content address of a chunk (BLAKE2b, 20 bytes)"""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class BackupRun:
+    """
+    Backup of one APPLY run
+
+    Each named entry is split into fixed-size chunks; the manifest
+    ('runs/<run_id>.json') lists the chunk hashes per entry. Putting an
+    entry again under the same name replaces it (e.g. a growing .reg file);
+    unchanged chunks are not written again.
+    """
+
+    def __init__(self, store: 'BackupStore', run_id: str, entries: Optional[Dict[str, Any]] = None,
+                 created: Optional[str] = None):
+        self.store = store
+        self.run_id = run_id
+        self.created = created or datetime.now().isoformat(timespec='seconds')
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.store.runs_dir / f"{self.run_id}.json"
+
+    def put_bytes(self, name: str, data: bytes):
+        """Store ``data`` as entry ``name`` and update the manifest"""
+        chunks = self.store.put_chunks(data)
+        with self._lock:
+            self.entries[name] = {'size': len(data), 'digest': chunk_digest(data), 'chunks': chunks,
+                                  'stored_at': datetime.now().isoformat(timespec='seconds')}
+            self._save()
+
+    def put_file(self, name: str, file_path: str):
+        """
+        Store the content of a file as entry ``name``, one chunk at a time
+
+        Only a single chunk is held in memory, so large files (e.g. ALBIS
+        databases) can be backed up before they are overwritten.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        chunks = []
+        size = 0
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                chunks.append(self.store.put_chunk(chunk))
+                size += len(chunk)
+        with self._lock:
+            self.entries[name] = {'size': size, 'digest': digest.hexdigest(), 'chunks': chunks,
+                                  'stored_at': datetime.now().isoformat(timespec='seconds')}
+            self._save()
+
+    def put_text(self, name: str, text: str, encoding: str = 'utf-8'):
+        self.put_bytes(name, text.encode(encoding))
+
+    def put_json(self, name: str, data: Any):
+        self.put_text(name, json.dumps(data, indent=2, ensure_ascii=False))
+
+    def get_bytes(self, name: str) -> bytes:
+        """Read an entry back from its chunks"""
+        entry = self.entries[name]
+        data = b''.join(self.store.read_chunk(digest) for digest in entry['chunks'])
+        if chunk_digest(data) != entry['digest']:
+            raise ValueError(f"Backup-Eintrag beschädigt: {self.run_id}/{name}")
+        return data
+
+    def write_file(self, name: str, file_path: str):
+        """
+        Write an entry to a file chunk by chunk
+
+        Raises:
+            ValueError: The entry's chunks do not match its hash (the file is
+                left partly written; write to a temporary name first)
+        """
+        entry = self.entries[name]
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'wb') as f:
+            for chunk_id in entry['chunks']:
+                chunk = self.store.read_chunk(chunk_id)
+                digest.update(chunk)
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        if digest.hexdigest() != entry['digest']:
+            raise ValueError(f"Backup-Eintrag beschädigt: {self.run_id}/{name}")
+
+    def get_json(self, name: str) -> Any:
+        return json.loads(self.get_bytes(name).decode('utf-8'))
+
+    def names(self) -> List[str]:
+        return sorted(self.entries)
+
+    def extract(self, target_dir: str) -> List[Path]:
+        """Write all entries as plain files into ``target_dir``"""
+        target = Path(target_dir)
+        written = []
+        for name in self.names():
+            path = target / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.write_file(name, str(path))
+            written.append(path)
+        return written
+
+    def _save(self):
+        self.store.runs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'run_id': self.run_id, 'created': self.created, 'entries': self.entries},
+                      f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+
+class BackupStore:
+    """
+    Deduplicating backup store shared by all runs on a machine
+
+    Layout below ``root``: 'chunks/<2 hex>/<hash>' holds each distinct chunk
+    once, 'runs/<run_id>.json' is the small manifest of one run and
+    'journal/<run_id>.jsonl' its change journal (see apply_journal). Repeated
+    backups of unchanged data only add a manifest. ``gc()`` removes chunks
+    no manifest refers to any more.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Store directory (default: 'APPLY_Backup' in the working directory)
+        """
+        self.root = Path(root or DEFAULT_BACKUP_ROOT)
+        self.chunks_dir = self.root / 'chunks'
+        self.runs_dir = self.root / 'runs'
+        self.journal_dir = self.root / 'journal'
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def put_chunk(self, chunk: bytes) -> str:
+        """Store one chunk unless it already exists; returns its hash"""
+        digest = chunk_digest(chunk)
+        path = self._chunk_path(digest)
+        if path.exists():
+            # Als benutzt markieren, damit gc() ihn in der Schonfrist nicht löscht
+            os.utime(path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(chunk)
+            os.replace(tmp_path, path)
+        return digest
+
+    def put_chunks(self, data: bytes) -> List[str]:
+        """Store ``data`` chunk by chunk, skipping chunks that already exist"""
+        return [self.put_chunk(data[offset:offset + CHUNK_SIZE])
+                for offset in range(0, len(data), CHUNK_SIZE)]
+
+    def read_chunk(self, digest: str) -> bytes:
+        return self._chunk_path(digest).read_bytes()
+
+    def begin_run(self, run_id: Optional[str] = None) -> BackupRun:
+        """
+        Start the backup of a new run
+
+        The manifest is only written with the first entry, so runs that back
+        up nothing leave no trace.
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return BackupRun(self, run_id)
+
+    def open_run(self, run_id: str) -> BackupRun:
+        """Continue an existing run (e.g. after a reboot), or start it"""
+        if (self.runs_dir / f"{run_id}.json").exists():
+            return self.load_run(run_id)
+        return self.begin_run(run_id)
+
+    def runs(self) -> List[str]:
+        """Run ids, oldest first"""
+        if not self.runs_dir.is_dir():
+            return []
+        return sorted(path.stem for path in self.runs_dir.glob('*.json'))
+
+    def load_run(self, run_id: str) -> BackupRun:
+        with open(self.runs_dir / f"{run_id}.json", 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return BackupRun(self, data['run_id'], data.get('entries', {}), data.get('created'))
+
+    def journal_path(self, run_id: str) -> Path:
+        return self.journal_dir / f"{run_id}.jsonl"
+
+    def journals(self) -> List[str]:
+        """Run ids that have a change journal, oldest first"""
+        if not self.journal_dir.is_dir():
+            return []
+        return sorted(path.stem for path in self.journal_dir.glob('*.jsonl'))
+
+    def delete_run(self, run_id: str):
+        """Remove a run's manifest and journal (its chunks go with the next gc())"""
+        for path in (self.runs_dir / f"{run_id}.json", self.journal_path(run_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def prune(self, keep: int) -> List[str]:
+        """Delete all but the newest ``keep`` runs; returns the deleted run ids"""
+        runs = sorted(set(self.runs()) | set(self.journals()))
+        removed = runs[:max(len(runs) - keep, 0)]
+        for run_id in removed:
+            self.delete_run(run_id)
+        return removed
+
+    def gc(self, grace_seconds: float = GC_GRACE_SECONDS) -> Tuple[int, int]:
+        """
+        Delete chunks no manifest refers to
+
+        Args:
+            grace_seconds: Keep unreferenced chunks younger than this
+
+        Returns:
+            Tuple of (removed chunks, freed bytes)
+        """
+        referenced = set()
+        for run_id in self.runs():
+            try:
+                run = self.load_run(run_id)
+            except (OSError, ValueError, KeyError):
+                # Unlesbares Manifest: lieber nichts löschen
+                return 0, 0
+            for entry in run.entries.values():
+                referenced.update(entry['chunks'])
+
+        removed, freed = 0, 0
+        cutoff = time.time() - grace_seconds
+        if not self.chunks_dir.is_dir():
+            return removed, freed
+        for path in self.chunks_dir.glob('*/*'):
+            if path.name in referenced:
+                continue
+            try:
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += stat.st_size
+        return removed, freed
+
+    def usage(self) -> Dict[str, int]:
+        """Number of runs and chunks and the bytes they take on disk"""
+        chunks = list(self.chunks_dir.glob('*/*')) if self.chunks_dir.is_dir() else []
+        return {'runs': len(self.runs()), 'chunks': len(chunks),
+                'bytes': sum(path.stat().st_size for path in chunks)}
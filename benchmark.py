@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark
+Repeatable timings of parser, list model, GUI list and dry-run planning on
+synthetic COLLECT files, written as JSON for comparison between versions
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from apply_scheduler import ApplyScheduler, build_graph
+from collect_generator import SCHEMAS, write_collection
+from collect_parser import CollectParser
+from config_applier import ConfigApplier
+from config_list import ConfigListModel
+from parse_cache import ParseCache
+from reg_parser import RegFile
+
+# Größenstufen: Anzahl je Element-Art
+SIZES = {
+    'small': {'interfaces': 2, 'routes': 10, 'drives': 4, 'printers': 3,
+              'software': 50, 'registry_keys': 50},
+    'medium': {'interfaces': 8, 'routes': 500, 'drives': 12, 'printers': 20,
+               'software': 1000, 'registry_keys': 2000},
+    'large': {'interfaces': 32, 'routes': 5000, 'drives': 21, 'printers': 100,
+              'software': 10000, 'registry_keys': 20000},
+}
+
+DEFAULT_REPEAT = 5
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run ``func`` ``repeat`` times, return min/median/max in seconds"""
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+    return {'min': round(min(runs), 6), 'median': round(statistics.median(runs), 6),
+            'max': round(max(runs), 6), 'runs': repeat}
+
+
+def _gui_available() -> Optional[str]:
+    """None if the GUI list can be measured, otherwise the reason why not"""
+    if platform.system() != 'Windows' and not os.environ.get('DISPLAY'):
+        return "kein Display (unter Linux mit 'xvfb-run python3 benchmark.py' starten)"
+    try:
+        import customtkinter  # noqa: F401
+    except ImportError:
+        return "customtkinter nicht installiert"
+    return None
+
+
+def _bench_gui(model: ConfigListModel, repeat: int) -> Dict[str, Any]:
+    """Time creating the virtual list for ``model`` and scrolling through it"""
+    import customtkinter as ctk
+    from virtual_list import VirtualList
+
+    root = ctk.CTk()
+    root.geometry("900x600")
+    try:
+        view = VirtualList(root, height=400)
+        view.pack(fill="both", expand=True)
+        root.update()
+
+        def render():
+            view.set_model(model)
+            root.update()
+
+        def scroll():
+            for _ in range(50):
+                view.scroll_rows(20)
+                root.update_idletasks()
+
+        return {'render': _measure(render, repeat), 'scroll_50_pages': _measure(scroll, repeat)}
+    finally:
+        root.destroy()
+
+
+def _dry_run_plan(parser: CollectParser):
+    applier = ConfigApplier(dry_run=True, create_backup=False)
+    applier.preflight()
+    items = list(parser.model.iter_items())
+    scheduler = ApplyScheduler(applier.apply_configuration, batch_func=applier.apply_batch)
+    scheduler.run(build_graph(items, ConfigApplier.BATCH_CATEGORIES))
+
+
+def run_case(work_dir: Path, schema: str, size: str, repeat: int, gui: bool) -> Dict[str, Any]:
+    """Generate one collection and time all steps on it"""
+    sizes = SIZES[size]
+    json_path = work_dir / f"collect_{schema}_{size}.json"
+    reg_path = work_dir / f"albis_{size}.reg"
+    write_collection(str(json_path), schema, reg_file=str(reg_path), **sizes)
+
+    parser = CollectParser(str(json_path), streaming=False)
+    parser.load()
+    item_count = sum(1 for _ in parser.model.iter_items())
+    result = {'schema': schema, 'size': size, 'sizes': sizes,
+              'file_bytes': json_path.stat().st_size, 'items': item_count, 'timings': {}}
+    timings = result['timings']
+
+    timings['parser_load'] = _measure(lambda: CollectParser(str(json_path), streaming=False).load(), repeat)
+    timings['parser_load_streaming'] = _measure(
+        lambda: CollectParser(str(json_path), streaming=True).load(), repeat)
+
+    cache = ParseCache(cache_dir=str(work_dir / 'cache'))
+    CollectParser(str(json_path), cache=cache).load()
+    timings['parser_load_cached'] = _measure(lambda: CollectParser(str(json_path), cache=cache).load(), repeat)
+
+    def category_access():
+        streamed = CollectParser(str(json_path), streaming=True)
+        streamed.load()
+        for category in streamed.get_categories():
+            streamed.get_category_items(category)
+        for _ in streamed.model.iter_items():
+            pass
+    timings['category_access'] = _measure(category_access, repeat)
+
+    timings['list_model'] = _measure(lambda: ConfigListModel.from_collect(parser.model), repeat)
+    model = ConfigListModel.from_collect(parser.model)
+
+    def list_filter():
+        for query in ('n', 'ne', 'net', 'route 10', 'albis'):
+            model.set_filter(query)
+        model.set_filter('')
+    timings['list_filter'] = _measure(list_filter, repeat)
+
+    timings['dry_run_plan'] = _measure(lambda: _dry_run_plan(parser), repeat)
+
+    if schema == '2.6':
+        timings['reg_parse'] = _measure(lambda: RegFile.load(str(reg_path)), repeat)
+
+    if gui:
+        reason = _gui_available()
+        if reason is None:
+            timings.update({f"gui_{name}": value for name, value in _bench_gui(model, repeat).items()})
+        else:
+            result['gui_skipped'] = reason
+    return result
+
+
+def run_benchmarks(schemas: List[str], sizes: List[str], repeat: int = DEFAULT_REPEAT,
+                   gui: bool = True, work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the benchmark suite
+
+    Args:
+        schemas: Schemas to generate ('legacy', '2.6')
+        sizes: Size levels from SIZES
+        repeat: Runs per measurement
+        gui: Also measure the virtual list (needs customtkinter and a display)
+        work_dir: Directory for generated files (default: temporary)
+
+    Returns:
+        Report with environment and one result per schema/size
+    """
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory(prefix='apply_bench_') as tmp:
+        base = Path(work_dir) if work_dir else Path(tmp)
+        base.mkdir(parents=True, exist_ok=True)
+        for size in sizes:
+            for schema in schemas:
+                print(f"  {schema:<7} {size:<7} ...", end='', flush=True)
+                case = run_case(base, schema, size, repeat, gui)
+                print(f" {case['items']} Elemente, Laden {case['timings']['parser_load']['median'] * 1000:.1f} ms")
+                report['results'].append(case)
+    return report
+
+
+def compare_reports(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Median changes per measurement between two reports, as text lines"""
+    previous = {(r['schema'], r['size']): r['timings'] for r in old.get('results', [])}
+    lines = []
+    for result in new.get('results', []):
+        before = previous.get((result['schema'], result['size']))
+        if before is None:
+            continue
+        for name, timing in result['timings'].items():
+            if name not in before or not before[name]['median']:
+                continue
+            change = timing['median'] / before[name]['median'] - 1
+            lines.append(f"{result['schema']:<7} {result['size']:<7} {name:<24} "
+                         f"{before[name]['median'] * 1000:>9.2f} ms -> {timing['median'] * 1000:>9.2f} ms "
+                         f"({change:+.0%})")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="APPLY-Benchmarks auf synthetischen COLLECT-Dateien")
+    parser.add_argument('--schema', choices=SCHEMAS, action='append',
+                        help="Schema (mehrfach möglich, Standard: beide)")
+    parser.add_argument('--size', choices=list(SIZES), action='append',
+                        help="Größenstufe (mehrfach möglich, Standard: small und medium)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Läufe je Messung")
+    parser.add_argument('--no-gui', action='store_true', help="Liste in der GUI nicht messen")
+    parser.add_argument('--output', help="Ergebnis-Datei (Standard: benchmark_<Zeit>.json)")
+    parser.add_argument('--compare', metavar='DATEI', help="Mit einem früheren Ergebnis vergleichen")
+    args = parser.parse_args(argv)
+
+    print("APPLY Benchmark")
+    report = run_benchmarks(args.schema or list(SCHEMAS), args.size or ['small', 'medium'],
+                            repeat=args.repeat, gui=not args.no_gui)
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✓ Ergebnis: {output}")
+
+    for result in report['results']:
+        if 'gui_skipped' in result:
+            print(f"⚠️ GUI nicht gemessen: {result['gui_skipped']}")
+            break
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            for line in compare_reports(json.load(f), report):
+                print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
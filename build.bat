@@ -66,6 +66,27 @@ copy /Y main.py "%BUILDDIR%\" >nul
 copy /Y gui.py "%BUILDDIR%\" >nul
 copy /Y collect_parser.py "%BUILDDIR%\" >nul
 copy /Y config_applier.py "%BUILDDIR%\" >nul
+copy /Y collect_schema.py "%BUILDDIR%\" >nul
+copy /Y parse_cache.py "%BUILDDIR%\" >nul
+copy /Y reg_parser.py "%BUILDDIR%\" >nul
+copy /Y registry_backend.py "%BUILDDIR%\" >nul
+copy /Y registry_diff.py "%BUILDDIR%\" >nul
+copy /Y apply_scheduler.py "%BUILDDIR%\" >nul
+copy /Y route_table.py "%BUILDDIR%\" >nul
+copy /Y system_snapshot.py "%BUILDDIR%\" >nul
+copy /Y config_list.py "%BUILDDIR%\" >nul
+copy /Y virtual_list.py "%BUILDDIR%\" >nul
+copy /Y ui_events.py "%BUILDDIR%\" >nul
+copy /Y search_index.py "%BUILDDIR%\" >nul
+copy /Y selection.py "%BUILDDIR%\" >nul
+copy /Y headless.py "%BUILDDIR%\" >nul
+copy /Y cancellation.py "%BUILDDIR%\" >nul
+copy /Y step_timing.py "%BUILDDIR%\" >nul
+copy /Y backup_store.py "%BUILDDIR%\" >nul
+copy /Y apply_journal.py "%BUILDDIR%\" >nul
+copy /Y resume.py "%BUILDDIR%\" >nul
+copy /Y network_state.py "%BUILDDIR%\" >nul
+copy /Y file_restore.py "%BUILDDIR%\" >nul
 copy /Y example_collect_data.json "%BUILDDIR%\" >nul
 copy /Y requirements.txt "%BUILDDIR%\" >nul
 copy /Y start.bat "%BUILDDIR%\" >nul
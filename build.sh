@@ -45,6 +45,27 @@ FILES=(
     "gui.py"
     "collect_parser.py"
     "config_applier.py"
+    "collect_schema.py"
+    "parse_cache.py"
+    "reg_parser.py"
+    "registry_backend.py"
+    "registry_diff.py"
+    "apply_scheduler.py"
+    "route_table.py"
+    "system_snapshot.py"
+    "config_list.py"
+    "virtual_list.py"
+    "ui_events.py"
+    "search_index.py"
+    "selection.py"
+    "headless.py"
+    "cancellation.py"
+    "step_timing.py"
+    "backup_store.py"
+    "apply_journal.py"
+    "resume.py"
+    "network_state.py"
+    "file_restore.py"
     "example_collect_data.json"
     "requirements.txt"
     "start.sh"
@@ -0,0 +1,150 @@
+"""
+Cancellation
+Cancel token and subprocess runner with timeout and kill on cancel
+"""
+import os
+import platform
+import signal
+import subprocess
+import threading
+from typing import List, Optional
+
+# Standard-Timeout je externem Befehl (Sekunden)
+DEFAULT_COMMAND_TIMEOUT = 120
+
+# So oft prüft der Runner, ob abgebrochen wurde (Sekunden)
+POLL_INTERVAL = 0.2
+
+
+class OperationCancelled(Exception):
+    """Raised when work is stopped through a CancelToken"""
+
+
+class CancelToken:
+    """
+    Shared stop signal for one run
+
+    ``cancel()`` sets the flag and immediately kills all child processes
+    started through ``run_command`` with this token.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: List[subprocess.Popen] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Request cancellation and terminate running child processes"""
+        self._event.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            kill_process(process)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled("Vom Benutzer abgebrochen")
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; True if cancelled meanwhile"""
+        return self._event.wait(timeout)
+
+    def _register(self, process: subprocess.Popen):
+        with self._lock:
+            self._processes.append(process)
+        # cancel() kann zwischen Start und Registrierung gelaufen sein
+        if self._event.is_set():
+            kill_process(process)
+
+    def _unregister(self, process: subprocess.Popen):
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+
+
+def kill_process(process: subprocess.Popen):
+    """Kill a child process including its children (e.g. route.exe below cmd /c)"""
+    if process.poll() is not None:
+        return
+    try:
+        if platform.system() == 'Windows':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           capture_output=True, timeout=10)
+        elif os.getpgid(process.pid) == process.pid:
+            # Eigene Prozessgruppe (run_command): Enkelprozesse halten sonst die Pipes offen
+            os.killpg(process.pid, signal.SIGKILL)
+        if process.poll() is None:
+            process.kill()
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+def run_command(args, timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT,
+                token: Optional[CancelToken] = None, check: bool = False,
+                capture_output: bool = True, **kwargs) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run, but stoppable
+
+    Args:
+        args: Command and arguments
+        timeout: Seconds until the process is killed (None = no limit)
+        token: Cancel token; cancelling kills the process (and on POSIX its
+            process group) within POLL_INTERVAL
+        check: Raise CalledProcessError on a non-zero exit code
+        capture_output: Capture stdout/stderr (default True)
+        **kwargs: Passed to subprocess.Popen (text, encoding, errors, ...)
+
+    Returns:
+        CompletedProcess
+
+    Raises:
+        OperationCancelled: The token was cancelled
+        subprocess.TimeoutExpired: The timeout elapsed
+        subprocess.CalledProcessError: ``check`` and non-zero exit code
+    """
+    if token is not None:
+        token.raise_if_cancelled()
+    if capture_output:
+        kwargs.setdefault('stdout', subprocess.PIPE)
+        kwargs.setdefault('stderr', subprocess.PIPE)
+
+    if platform.system() != 'Windows':
+        # Eigene Sitzung, damit kill_process die ganze Prozessgruppe beenden kann
+        kwargs.setdefault('start_new_session', True)
+
+    process = subprocess.Popen(args, **kwargs)
+    if token is not None:
+        token._register(process)
+    try:
+        waited = 0.0
+        while True:
+            step = POLL_INTERVAL if token is not None else timeout
+            if timeout is not None and step is not None:
+                step = min(step, max(timeout - waited, 0.0))
+            try:
+                stdout, stderr = process.communicate(timeout=step)
+                break
+            except subprocess.TimeoutExpired:
+                waited += step
+                if token is not None and token.cancelled:
+                    kill_process(process)
+                    process.communicate()
+                    raise OperationCancelled(f"Abgebrochen: {args[0]}")
+                if timeout is not None and waited >= timeout:
+                    kill_process(process)
+                    stdout, stderr = process.communicate()
+                    raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+    finally:
+        if token is not None:
+            token._unregister(process)
+
+    if token is not None and token.cancelled and process.returncode != 0:
+        # Durch cancel() beendet
+        raise OperationCancelled(f"Abgebrochen: {args[0]}")
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
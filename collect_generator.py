@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+COLLECT Generator
+Synthetic COLLECT files of any size, in the legacy and the v2.6 schema
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCHEMAS = ('legacy', '2.6')
+
+# Laufwerksbuchstaben, die der Collector für Netzlaufwerke liefern kann
+DRIVE_LETTERS = 'FGHIJKLMNOPQRSTUVWXYZ'
+
+_VENDORS = ['CompuGroup Medical Deutschland AG', 'Microsoft Corporation', 'Igor Pavlov',
+            'BOSCH + SOHN GmbH & Co. KG', 'Adobe Inc.', 'Mozilla', 'Google LLC', 'Citrix Systems']
+_PRODUCTS = ['ALBIS', 'CGM PRAXISARCHIV', 'Labor-Connector', 'Scan-Modul', 'Kartenleser-Treiber',
+             'PDF Reader', 'Office Add-in', 'Fernwartung', 'Backup Agent', 'Druckertreiber']
+_PRINTER_MODELS = ['HP LaserJet M404', 'Brother HL-L5100DN', 'Kyocera ECOSYS P2235',
+                   'Zebra GK420d', 'Epson TM-T88VI']
+_SHARES = ['ALBIS', 'SCAN', 'ARCHIV', 'DATEN', 'BRIEFE', 'LABOR', 'BACKUP', 'AUSTAUSCH']
+
+
+class _Spec:
+    """Sizes and random source shared by both schema writers"""
+
+    def __init__(self, interfaces: int, routes: int, drives: int, printers: int,
+                 software: int, registry_keys: int, seed: int):
+        self.interfaces = interfaces
+        self.routes = routes
+        self.drives = min(drives, len(DRIVE_LETTERS))
+        self.printers = printers
+        self.software = software
+        self.registry_keys = registry_keys
+        self.rng = random.Random(seed)
+        self.hostname = f"PRAXIS-PC{seed:02d}"
+
+    def adapter(self, index: int) -> Dict[str, Any]:
+        subnet = 10 + index
+        return {
+            'name': 'Ethernet' if index == 0 else f"Ethernet {index + 1}",
+            'mac': '-'.join(f"{self.rng.randrange(256):02X}" for _ in range(6)),
+            'ipv4': f"192.168.{subnet % 256}.{self.rng.randrange(20, 250)}",
+            'netmask': '255.255.255.0',
+            'prefix': 24,
+            'gateway': f"192.168.{subnet % 256}.1",
+            'dns': [f"192.168.{subnet % 256}.1", '8.8.8.8'][:1 + index % 2],
+        }
+
+    def route(self, index: int) -> Dict[str, Any]:
+        return {'destination': f"10.{index // 256 % 256}.{index % 256}.0",
+                'mask': '255.255.255.0',
+                'gateway': f"192.168.10.{254 - index % 200}"}
+
+    def drive(self, index: int) -> Dict[str, Any]:
+        share = _SHARES[index % len(_SHARES)]
+        return {'drive_letter': DRIVE_LETTERS[index],
+                'unc_path': f"\\\\SERVER{index // len(_SHARES) + 1}\\{share}"}
+
+    def printer(self, index: int) -> Dict[str, Any]:
+        return {'name': f"{_PRINTER_MODELS[index % len(_PRINTER_MODELS)]} ({index + 1})",
+                'default': index == 0, 'port': f"IP_192.168.10.{100 + index % 150}",
+                'treiber': _PRINTER_MODELS[index % len(_PRINTER_MODELS)], 'freigabe': 'Nein'}
+
+    def software_entry(self, index: int) -> Dict[str, Any]:
+        product = _PRODUCTS[index % len(_PRODUCTS)]
+        return {'name': f"{product} {index + 1}",
+                'version': f"{self.rng.randrange(1, 20)}.{self.rng.randrange(10)}.{self.rng.randrange(1000)}",
+                'publisher': _VENDORS[self.rng.randrange(len(_VENDORS))]}
+
+    def registry_value(self, index: int) -> Dict[str, Any]:
+        if index % 3 == 0:
+            return {'key': f"HKEY_LOCAL_MACHINE\\SOFTWARE\\ALBIS\\Module{index // 10}\\Port{index}",
+                    'value': str(8000 + index), 'type': 'dword'}
+        return {'key': f"HKEY_LOCAL_MACHINE\\SOFTWARE\\ALBIS\\Module{index // 10}\\Pfad{index}",
+                'value': f"C:\\ALBIS\\Modul{index // 10}\\Daten{index}", 'type': 'string'}
+
+
+def _legacy(spec: _Spec) -> Dict[str, Any]:
+    configurations = {
+        'hostname': {'value': spec.hostname, 'description': 'Original hostname from source system'},
+        'network': {},
+        'routes': {},
+        'network_drives': {},
+        'printers': {},
+        'packages': {},
+        'albis_registry': {},
+    }
+    for i in range(spec.interfaces):
+        adapter = spec.adapter(i)
+        configurations['network'][adapter['name']] = {
+            'description': f"Netzwerkschnittstelle {adapter['name']}", 'interface': adapter['name'],
+            'ip_address': adapter['ipv4'], 'netmask': adapter['netmask'],
+            'gateway': adapter['gateway'], 'dns': adapter['dns']}
+    for i in range(spec.routes):
+        route = spec.route(i)
+        configurations['routes'][f"{route['destination']}/{route['mask']}"] = dict(
+            route, description=f"{route['destination']} mask {route['mask']} via {route['gateway']}")
+    for i in range(spec.drives):
+        drive = spec.drive(i)
+        configurations['network_drives'][drive['drive_letter']] = dict(
+            drive, description=f"{drive['drive_letter']}: -> {drive['unc_path']}")
+    for i in range(spec.printers):
+        printer = spec.printer(i)
+        configurations['printers'][printer['name']] = dict(printer, description=printer['treiber'])
+    for i in range(spec.software):
+        entry = spec.software_entry(i)
+        configurations['packages'][entry['name']] = {
+            'description': f"{entry['publisher']} {entry['version']}", 'packages': [entry['name']]}
+    for i in range(spec.registry_keys):
+        value = spec.registry_value(i)
+        configurations['albis_registry'][f"value_{i}"] = dict(value, description=f"ALBIS Wert {i}")
+
+    return {
+        'system_info': {
+            'hostname': spec.hostname,
+            'os': 'Windows 11 Pro',
+            'architecture': 'x86_64',
+            'collection_date': datetime(2025, 11, 28, 18, 23).isoformat() + 'Z',
+            'albis_version': 'ALBIS 5.2',
+            'collect_tool_version': '1.0',
+        },
+        'configurations': {category: items for category, items in configurations.items() if items},
+    }
+
+
+def _v26(spec: _Spec) -> Dict[str, Any]:
+    network = []
+    for i in range(spec.interfaces):
+        adapter = spec.adapter(i)
+        network.append({'name': adapter['name'], 'status': 'Up', 'mac': adapter['mac'],
+                        'ipv4': adapter['ipv4'], 'prefix': adapter['prefix'],
+                        'gateway': adapter['gateway'], 'dns': ', '.join(adapter['dns'])})
+    # Wie der Collector: gemappte Laufwerke hängen als "<buchstabe>": "-> <UNC>" am ersten Adapter
+    if network:
+        for i in range(spec.drives):
+            drive = spec.drive(i)
+            network[0][drive['drive_letter'].lower()] = f"-> {drive['unc_path']}"
+
+    created = datetime(2025, 11, 28, 18, 23, 25)
+    return {
+        'version': '2.6',
+        'created': created.isoformat(),
+        'source': {'tool': 'eXpletus COLLECT', 'hostname': spec.hostname},
+        'system': {
+            '\ufeffdatum/zeit': (created - timedelta(seconds=14)).strftime('%Y-%m-%d %H:%M:%S'),
+            'computername': spec.hostname,
+            'benutzername': 'ALBIS',
+            'benutzer_domaene': spec.hostname,
+            'computer_domaene': 'WORKGROUP',
+            'arbeitsgruppe': 'WORKGROUP',
+            'standard_browser': 'Google Chrome',
+            'standard_pdf': 'AcroExch.Document.DC',
+            'standard_mail': 'Outlook.File.msg.15',
+            'standard_word': 'Word.Document.12',
+        },
+        'network': network,
+        'routes': [spec.route(i) for i in range(spec.routes)],
+        'printers': [spec.printer(i) for i in range(spec.printers)],
+        'email': {'outlook_installed': True, 'thunderbird_installed': False, 'accounts': []},
+        'office': {'installed': True},
+        'software': {'all': [spec.software_entry(i) for i in range(spec.software)]},
+        'autostart': [{'name': 'SecurityHealth', 'path': 'C:\\Windows\\system32\\SecurityHealthSystray.exe'}],
+        'browser': {'edge': True, 'chrome': True, 'firefox': False},
+    }
+
+
+def generate_collection(schema: str = '2.6', interfaces: int = 2, routes: int = 10, drives: int = 4,
+                        printers: int = 3, software: int = 50, registry_keys: int = 50,
+                        seed: int = 0) -> Dict[str, Any]:
+    """
+    Build a synthetic COLLECT document
+
+    The same arguments always give the same document. In the v2.6 schema
+    registry keys are not part of the JSON (the collector exports them to
+    'albis.reg', see generate_reg_text).
+
+    Args:
+        schema: 'legacy' or '2.6'
+        interfaces: Number of network adapters
+        routes: Number of persistent routes
+        drives: Number of network drives (at most one per letter F-Z)
+        printers: Number of printers
+        software: Number of installed software entries
+        registry_keys: Number of ALBIS registry values (legacy only)
+        seed: Random seed
+
+    Returns:
+        COLLECT data as plain dict
+    """
+    if schema not in SCHEMAS:
+        raise ValueError(f"Unbekanntes Schema: {schema} (erlaubt: {', '.join(SCHEMAS)})")
+    spec = _Spec(interfaces, routes, drives, printers, software, registry_keys, seed)
+    return _legacy(spec) if schema == 'legacy' else _v26(spec)
+
+
+def generate_reg_text(registry_keys: int = 50, seed: int = 0) -> str:
+    """Registry export in the 'regedit /e' layout with ``registry_keys`` values"""
+    spec = _Spec(0, 0, 0, 0, 0, registry_keys, seed)
+    lines = ['Windows Registry Editor Version 5.00', '']
+    current = None
+    for i in range(registry_keys):
+        value = spec.registry_value(i)
+        key, name = value['key'].rsplit('\\', 1)
+        if key != current:
+            lines.extend(['', f"[{key}]"] if current else [f"[{key}]"])
+            current = key
+        if value['type'] == 'dword':
+            lines.append(f'"{name}"=dword:{int(value["value"]):08x}')
+        else:
+            escaped = value['value'].replace('\\', '\\\\')
+            lines.append(f'"{name}"="{escaped}"')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def write_collection(file_path: str, schema: str = '2.6', reg_file: Optional[str] = None,
+                     **sizes) -> Path:
+    """
+    Write a synthetic COLLECT file (and for v2.6 optionally its albis.reg)
+
+    Args:
+        file_path: Target JSON file
+        schema: 'legacy' or '2.6'
+        reg_file: Registry export to write next to a v2.6 file (UTF-16 like regedit)
+        **sizes: Passed to generate_collection
+
+    Returns:
+        Path of the written JSON file
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(generate_collection(schema, **sizes), f, indent=2, ensure_ascii=False)
+    if reg_file and schema == '2.6':
+        with open(reg_file, 'w', encoding='utf-16', newline='') as f:
+            f.write(generate_reg_text(sizes.get('registry_keys', 50), sizes.get('seed', 0)))
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetische COLLECT-Datei erzeugen")
+    parser.add_argument('output', help="Ziel-Datei (JSON)")
+    parser.add_argument('--schema', choices=SCHEMAS, default='2.6')
+    parser.add_argument('--interfaces', type=int, default=2)
+    parser.add_argument('--routes', type=int, default=10)
+    parser.add_argument('--drives', type=int, default=4)
+    parser.add_argument('--printers', type=int, default=3)
+    parser.add_argument('--software', type=int, default=50)
+    parser.add_argument('--registry-keys', type=int, default=50)
+    parser.add_argument('--reg-file', help="Registry-Export dazu schreiben (nur v2.6)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    path = write_collection(args.output, args.schema, reg_file=args.reg_file,
+                            interfaces=args.interfaces, routes=args.routes, drives=args.drives,
+                            printers=args.printers, software=args.software,
+                            registry_keys=args.registry_keys, seed=args.seed)
+    print(f"✓ {path} ({path.stat().st_size} Bytes, Schema {args.schema})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,22 +3,179 @@ COLLECT Data Parser
 Parses configuration data collected by the COLLECT tool
 """
 import json
+import mmap
 import os
-from typing import Dict, List, Any
+import re
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from collect_schema import CollectModel, normalize
+
+# Ablage des Collectors (<Sammlung>\ALBISWIN) und Zielordner auf dem Arbeitsplatz
+ALBIS_FOLDER = 'ALBISWIN'
+DEFAULT_ALBIS_TARGET = r'C:\CGM\ALBISWIN'
+
+# Strukturzeichen und Stringbegrenzer für den Offset-Scanner
+_STRUCT_RE = re.compile(rb'["{}\[\],:]')
+_STRING_END_RE = re.compile(rb'["\\]')
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def _index_sections(buf, nested=('configurations',)) -> Tuple[Dict[str, Tuple[int, int]],
+                                                            Dict[str, Dict[str, Tuple[int, int]]]]:
+    """
+    Index the top-level members of a JSON object by byte offset in one pass
+
+    Only the structure is scanned, no values are decoded. Members of the
+    top-level objects named in ``nested`` are indexed as well, so that single
+    categories below ``configurations`` can be decoded on their own.
+
+    Args:
+        buf: Bytes-like object (e.g. mmap) containing the JSON document
+        nested: Names of top-level members whose children are indexed too
+
+    Returns:
+        Tuple of (top-level offsets, child offsets per nested member)
+    """
+    sections = {}
+    children = {}
+    pos = len(_UTF8_BOM) if buf[:3] == _UTF8_BOM else 0
+    end = len(buf)
+
+    # Pro offener Klammer: (Typ, Zielindex oder None)
+    stack = []
+    expect_key = False
+    current_key = None
+    value_start = None
+    pending_key = None
+
+    while pos < end:
+        m = _STRUCT_RE.search(buf, pos)
+        if not m:
+            break
+        ch = m.group()
+        pos = m.end()
+
+        if ch == b'"':
+            start = pos
+            while True:
+                s = _STRING_END_RE.search(buf, pos)
+                if not s:
+                    raise ValueError("Unterminated string in JSON document")
+                if s.group() == b'\\':
+                    pos = s.end() + 1
+                    continue
+                pos = s.end()
+                break
+            # Schlüssel nur auf den indizierten Ebenen erfassen
+            if expect_key and stack and stack[-1][1] is not None:
+                pending_key = json.loads(b'"' + bytes(buf[start:pos - 1]) + b'"')
+            continue
+
+        depth = len(stack)
+        if ch == b':':
+            if expect_key and pending_key is not None:
+                current_key = pending_key
+                value_start = pos
+                pending_key = None
+            expect_key = False
+        elif ch in (b'{', b'['):
+            target = None
+            if depth == 0 and ch == b'{':
+                target = sections
+            elif depth == 1 and ch == b'{' and current_key in nested and stack[-1][1] is sections:
+                target = children.setdefault(current_key, {})
+            stack.append((ch, target, current_key, value_start))
+            expect_key = ch == b'{'
+            current_key = None
+            value_start = None
+        elif ch in (b'}', b']', b','):
+            if stack and stack[-1][1] is not None and current_key is not None:
+                stack[-1][1][current_key] = (value_start, m.start())
+                current_key = None
+                value_start = None
+            if ch == b',':
+                expect_key = bool(stack) and stack[-1][0] == b'{'
+            else:
+                if not stack:
+                    raise ValueError("Unbalanced brackets in JSON document")
+                _, _, current_key, value_start = stack.pop()
+                expect_key = False
+
+    if stack:
+        raise ValueError("Unexpected end of JSON document")
+    return sections, children
+
+
+class _LazySection:
+    """Read-only mapping that decodes indexed JSON members on first access"""
+
+    def __init__(self, parser: 'CollectParser', offsets: Dict[str, Tuple[int, int]],
+                 children: Optional[Dict[str, Dict[str, Tuple[int, int]]]] = None):
+        self._parser = parser
+        self._offsets = offsets
+        self._children = children or {}
+        self._cache = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._cache:
+            if key in self._children:
+                self._cache[key] = _LazySection(self._parser, self._children[key])
+            else:
+                start, end = self._offsets[key]
+                self._cache[key] = self._parser._decode_range(start, end)
+        return self._cache[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._offsets:
+            return default
+        return self[key]
+
+    def keys(self):
+        return self._offsets.keys()
+
+    def items(self):
+        return ((key, self[key]) for key in self._offsets)
+
+    def values(self):
+        return (self[key] for key in self._offsets)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode all members into a plain dictionary"""
+        return {key: value.to_dict() if isinstance(value, _LazySection) else value
+                for key, value in self.items()}
 
 
 class CollectParser:
     """Parser for COLLECT tool output files"""
 
-    def __init__(self, collect_file_path: str):
+    # Ab dieser Dateigröße wird automatisch im Streaming-Modus geladen
+    STREAMING_THRESHOLD = 32 * 1024 * 1024
+
+    def __init__(self, collect_file_path: str, streaming: Optional[bool] = None, cache=None):
         """
         Initialize parser with path to COLLECT output file
 
         Args:
             collect_file_path: Path to the JSON file containing collected configurations
+            streaming: If True, only index the file on load and decode each
+                section on first access. None selects the mode by file size.
+            cache: Optional ParseCache for normalized results (not used in streaming mode)
         """
         self.collect_file_path = collect_file_path
+        self.streaming = streaming
+        self.cache = cache
+        self.from_cache = False
         self.data = None
+        self.model = CollectModel('unknown', {}, {})
 
     def load(self) -> bool:
         """
@@ -31,14 +188,72 @@ class CollectParser:
             if not os.path.exists(self.collect_file_path):
                 raise FileNotFoundError(f"File not found: {self.collect_file_path}")
 
-            with open(self.collect_file_path, 'r', encoding='utf-8') as f:
+            streaming = self.streaming
+            if streaming is None:
+                streaming = os.path.getsize(self.collect_file_path) >= self.STREAMING_THRESHOLD
+
+            self.from_cache = False
+            if streaming:
+                self.data = self._load_streaming()
+                self.model = normalize(self.data)
+                self._add_collected_files()
+                return True
+
+            if self.cache:
+                cached = self.cache.get(self.collect_file_path)
+                if cached is not None:
+                    self.data = None
+                    self.model = cached
+                    self.from_cache = True
+                    self._add_collected_files()
+                    return True
+
+            with open(self.collect_file_path, 'r', encoding='utf-8-sig') as f:
                 self.data = json.load(f)
 
+            self.model = normalize(self.data)
+            if self.cache and self.model.get_categories():
+                self.cache.put(self.collect_file_path, self.model)
+            # Nach dem Cache: der Ordnerinhalt kann sich ohne Änderung der JSON-Datei ändern
+            self._add_collected_files()
             return True
         except Exception as e:
             print(f"Error loading COLLECT file: {e}")
             return False
 
+    def _add_collected_files(self):
+        """Offer the ALBISWIN files the collector copied next to the JSON file as 'albis_files'"""
+        albis_dir = os.path.join(os.path.dirname(os.path.abspath(self.collect_file_path)), ALBIS_FOLDER)
+        try:
+            with os.scandir(albis_dir) as entries:
+                # Der Collector kopiert keine Unterordner
+                files = sorted((entry.name, entry.stat().st_size) for entry in entries if entry.is_file())
+        except FileNotFoundError:
+            return
+        items = {}
+        for name, size in files:
+            items[name] = {'description': f"{name} ({size / 1024:.0f} KB) -> {DEFAULT_ALBIS_TARGET}",
+                           'file': name, 'size': size,
+                           'source_dir': albis_dir, 'target_dir': DEFAULT_ALBIS_TARGET}
+        if items:
+            self.model.add_category('albis_files', items)
+
+    def _load_streaming(self) -> _LazySection:
+        """Index the file by byte offset without decoding any values"""
+        with open(self.collect_file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Empty COLLECT file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                sections, children = _index_sections(buf)
+        return _LazySection(self, sections, children)
+
+    def _decode_range(self, start: int, end: int) -> Any:
+        """Decode a single JSON value from the given byte range of the file"""
+        with open(self.collect_file_path, 'rb') as f:
+            f.seek(start)
+            raw = f.read(end - start)
+        return json.loads(raw.decode('utf-8'))
+
     def get_categories(self) -> List[str]:
         """
         Get all configuration categories
@@ -46,9 +261,7 @@ class CollectParser:
         Returns:
             List of category names
         """
-        if not self.data:
-            return []
-        return list(self.data.get('configurations', {}).keys())
+        return self.model.get_categories()
 
     def get_category_items(self, category: str) -> Dict[str, Any]:
         """
@@ -60,9 +273,7 @@ class CollectParser:
         Returns:
             Dictionary of items in the category
         """
-        if not self.data:
-            return {}
-        return self.data.get('configurations', {}).get(category, {})
+        return self.model.get_category_items(category)
 
     def get_system_info(self) -> Dict[str, Any]:
         """
@@ -71,9 +282,16 @@ class CollectParser:
         Returns:
             Dictionary containing system information
         """
-        if not self.data:
-            return {}
-        return self.data.get('system_info', {})
+        return self.model.system_info
+
+    def get_schema(self) -> str:
+        """
+        Get the detected schema of the loaded file
+
+        Returns:
+            'legacy', the COLLECT version (e.g. '2.6') or 'unknown'
+        """
+        return self.model.schema
 
     def get_all_data(self) -> Dict[str, Any]:
         """
@@ -82,4 +300,10 @@ class CollectParser:
         Returns:
             Complete data dictionary
         """
+        if self.data is None and self.from_cache:
+            # Rohdaten werden bei Cache-Treffern erst bei Bedarf gelesen
+            with open(self.collect_file_path, 'r', encoding='utf-8-sig') as f:
+                self.data = json.load(f)
+        if isinstance(self.data, _LazySection):
+            return self.data.to_dict()
         return self.data or {}
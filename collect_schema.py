@@ -0,0 +1,293 @@
+"""
+COLLECT Schema Adapter
+Normalizes the different COLLECT output formats into the category/item model
+used by ConfigApplier
+"""
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+# Kategorie -> Schlüssel im Item, den der jeweilige Applier erwartet
+_DEFAULT_APPS = (
+    ('standard_browser', 'default_browser', 'browser', 'Standard-Browser'),
+    ('standard_pdf', 'default_pdf', 'application', 'Standard-PDF-Anwendung'),
+    ('standard_mail', 'default_mail', 'application', 'Standard-Mailprogramm'),
+    ('standard_word', 'default_word', 'application', 'Standard für Word-Dokumente'),
+)
+
+
+class CollectModel:
+    """Normalized, indexed view of a COLLECT file"""
+
+    def __init__(self, schema: str, system_info: Dict[str, Any], categories: Dict[str, Any]):
+        """
+        Initialize model
+
+        Args:
+            schema: Name of the detected schema (e.g. 'legacy', '2.6')
+            system_info: Read-only information about the source system
+            categories: Mapping of category name to its items
+        """
+        self.schema = schema
+        self.system_info = system_info
+        self.categories = categories
+        # Kategorien, die nicht aus der Datei selbst stammen (z.B. mitgesammelte Dateien)
+        self._extra: Dict[str, Any] = {}
+        self._index = {}
+        self._indexed = set()
+
+    def get_categories(self) -> List[str]:
+        """Get all category names in file order, added categories last"""
+        return list(self.categories.keys()) + [c for c in self._extra if c not in self.categories]
+
+    def get_category_items(self, category: str) -> Any:
+        """Get the items of a category (dict of items, or a plain value)"""
+        if category in self._extra:
+            return self._extra[category]
+        return self.categories.get(category, {})
+
+    def add_category(self, category: str, items: Dict[str, Any]):
+        """Add or replace a category that is not part of the file data"""
+        self._extra[category] = items
+        self._indexed.discard(category)
+
+    def _index_category(self, category: str):
+        """Add the items of a category to the config key index"""
+        if category in self._indexed:
+            return
+        items = self.get_category_items(category)
+        if hasattr(items, 'items'):
+            for item_key, item_value in items.items():
+                self._index[f"{category}.{item_key}"] = (category, item_key, item_value)
+        self._indexed.add(category)
+
+    def get_item(self, config_key: str) -> Optional[Tuple[str, str, Any]]:
+        """
+        Look up a single item by its config key ("<category>.<item>")
+
+        Returns:
+            Tuple of (category, item_key, item_value) or None
+        """
+        category = config_key.split('.', 1)[0]
+        self._index_category(category)
+        return self._index.get(config_key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the model into plain, picklable data"""
+        return {
+            'schema': self.schema,
+            'system_info': dict(self.system_info),
+            'categories': {category: self.get_category_items(category)
+                           for category in self.get_categories()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CollectModel':
+        """Create a model from the output of to_dict()"""
+        return cls(data['schema'], data['system_info'], data['categories'])
+
+    def iter_items(self) -> Iterator[Tuple[str, str, Any]]:
+        """Iterate over all (category, item_key, item_value) tuples in order"""
+        for category in self.get_categories():
+            self._index_category(category)
+            items = self.get_category_items(category)
+            if hasattr(items, 'items'):
+                for item_key in items.keys():
+                    yield self._index[f"{category}.{item_key}"]
+
+
+def _clean_key(key: str) -> str:
+    """Strip BOM and whitespace the collector leaves in some keys"""
+    return key.replace('\ufeff', '').strip()
+
+
+def _split_list(value: Any) -> List[str]:
+    """Turn a comma/space separated string (or list) into a list of strings"""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [part for part in str(value).replace(',', ' ').split() if part]
+
+
+def _prefix_to_mask(prefix: Any) -> str:
+    """Convert a prefix length (e.g. 24) to a dotted netmask"""
+    try:
+        bits = int(prefix)
+    except (TypeError, ValueError):
+        return ''
+    if not 0 <= bits <= 32:
+        return ''
+    mask = (0xffffffff << (32 - bits)) & 0xffffffff
+    return '.'.join(str((mask >> shift) & 0xff) for shift in (24, 16, 8, 0))
+
+
+def _single_value_item(value: Any, description: str = '') -> Dict[str, Any]:
+    """Wrap a plain category value (e.g. legacy 'hostname') as one item"""
+    return {str(value): {'description': description, 'value': value}}
+
+
+class _LegacyCategories:
+    """
+    Category mapping for the legacy layout
+
+    Categories are normalized on first access, so a lazily loaded
+    'configurations' section stays lazy.
+    """
+
+    def __init__(self, configurations):
+        self._configurations = configurations
+        self._cache = {}
+
+    def __getitem__(self, category: str) -> Any:
+        if category not in self._cache:
+            items = self._configurations[category]
+            if isinstance(items, dict) and 'value' in items \
+                    and not isinstance(items['value'], dict):
+                items = _single_value_item(items['value'], items.get('description', ''))
+            elif not isinstance(items, dict) and not hasattr(items, 'items'):
+                items = _single_value_item(items)
+            self._cache[category] = items
+        return self._cache[category]
+
+    def __contains__(self, category: str) -> bool:
+        return category in self._configurations
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._configurations.keys())
+
+    def __len__(self) -> int:
+        return len(self._configurations)
+
+    def keys(self):
+        return self._configurations.keys()
+
+    def get(self, category: str, default: Any = None) -> Any:
+        if category not in self._configurations:
+            return default
+        return self[category]
+
+
+def _adapt_legacy(sections) -> CollectModel:
+    """Legacy layout: already has 'system_info' and 'configurations'"""
+    return CollectModel('legacy', sections.get('system_info', {}) or {},
+                        _LegacyCategories(sections.get('configurations', {}) or {}))
+
+
+def _adapt_v26(sections) -> CollectModel:
+    """COLLECT v2.x layout ('system', 'network' list, 'browser', ...)"""
+    system = {_clean_key(k): v for k, v in (sections.get('system') or {}).items()}
+    source = sections.get('source') or {}
+    categories = {}
+
+    def add(category: str, item_key: str, item: Dict[str, Any]):
+        categories.setdefault(category, {})[item_key] = item
+
+    hostname = system.get('computername') or source.get('hostname', '')
+    if hostname:
+        add('hostname', hostname, {'description': 'Computername des Quellsystems',
+                                   'hostname': hostname})
+
+    username = system.get('benutzername', '')
+    if username:
+        add('username', username, {'description': 'Angemeldeter Benutzer',
+                                   'username': username})
+
+    workgroup = system.get('arbeitsgruppe', '')
+    domain = system.get('computer_domaene', '')
+    if domain and domain.upper() != workgroup.upper():
+        add('domain', domain, {'description': 'Domäne des Quellsystems', 'domain': domain})
+    if workgroup:
+        add('workgroup', workgroup, {'description': 'Arbeitsgruppe des Quellsystems',
+                                     'workgroup': workgroup})
+
+    adapter_notes = {}
+    for adapter in sections.get('network') or []:
+        name = adapter.get('name', '')
+        if not name:
+            continue
+        ip_address = adapter.get('ipv4', '')
+        netmask = adapter.get('netmask') or _prefix_to_mask(adapter.get('prefix'))
+        if ip_address and netmask:
+            add('network', name, {
+                'description': f"{name} ({adapter.get('mac', '')}, {adapter.get('status', '')})",
+                'interface': name,
+                'ip_address': ip_address,
+                'netmask': netmask,
+                'gateway': adapter.get('gateway', ''),
+                'dns': _split_list(adapter.get('dns')),
+            })
+        elif ip_address:
+            # Ohne Maske keine statische Konfiguration möglich: nur zur Information anzeigen
+            adapter_notes[f"netzwerk_{name}"] = (f"{ip_address}, Gateway {adapter.get('gateway', '') or '-'} "
+                                                 f"(ohne Subnetzmaske, wird nicht übernommen)")
+        # Der Collector hängt gemappte Laufwerke als "<Buchstabe>": "-> <UNC>" an
+        for key, value in adapter.items():
+            if len(key) == 1 and key.isalpha() and isinstance(value, str) \
+                    and value.lstrip().startswith('->'):
+                letter = key.upper()
+                add('network_drives', letter, {
+                    'description': f"{letter}: -> {value.lstrip()[2:].strip()}",
+                    'drive_letter': letter,
+                    'unc_path': value.lstrip()[2:].strip(),
+                })
+
+    for drive in sections.get('network_drives') or []:
+        letter = str(drive.get('drive_letter', drive.get('letter', ''))).rstrip(':').upper()
+        unc_path = drive.get('unc_path', drive.get('path', ''))
+        if letter and unc_path:
+            add('network_drives', letter, {'description': f"{letter}: -> {unc_path}",
+                                           'drive_letter': letter, 'unc_path': unc_path,
+                                           'username': drive.get('username', '')})
+
+    for route in sections.get('routes') or []:
+        dest = route.get('destination', '')
+        mask = route.get('mask', route.get('netmask', ''))
+        gateway = route.get('gateway', '')
+        if dest and gateway:
+            add('routes', f"{dest}/{mask}", {'description': f"{dest} mask {mask} via {gateway}",
+                                             'destination': dest, 'mask': mask,
+                                             'gateway': gateway})
+
+    for system_key, category, field, label in _DEFAULT_APPS:
+        value = system.get(system_key, '')
+        if value:
+            add(category, value, {'description': label, field: value})
+
+    for browser, installed in (sections.get('browser') or {}).items():
+        if installed is True:
+            add('browser_favorites', browser, {'description': f"Favoriten aus {browser}",
+                                               'browser': browser, 'favorites_file': ''})
+
+    email = sections.get('email') or {}
+    if email.get('outlook_installed'):
+        add('mobackup', 'outlook', {'description': 'Outlook-Daten per MoBackup sichern',
+                                    'outlook_backup': True})
+
+    system_info = {'collect_version': sections.get('version', ''),
+                   'created': sections.get('created', '')}
+    system_info.update(system)
+    system_info.update(adapter_notes)
+    return CollectModel(str(sections.get('version', '2')), system_info, categories)
+
+
+# Erkennung in Reihenfolge: (Prüffunktion, Adapter)
+SCHEMA_ADAPTERS: List[Tuple[Callable[[Any], bool], Callable[[Any], CollectModel]]] = [
+    (lambda s: 'configurations' in s, _adapt_legacy),
+    (lambda s: str(s.get('version', '')).startswith('2.'), _adapt_v26),
+]
+
+
+def normalize(sections) -> CollectModel:
+    """
+    Convert raw COLLECT data into a CollectModel
+
+    Args:
+        sections: Top-level mapping of the COLLECT file (dict or lazy mapping)
+
+    Returns:
+        Normalized model; empty if the schema is not recognized
+    """
+    if sections:
+        for matches, adapter in SCHEMA_ADAPTERS:
+            if matches(sections):
+                return adapter(sections)
+    return CollectModel('unknown', {}, {})
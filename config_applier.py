@@ -3,178 +3,559 @@ Configuration Applier
 Applies collected configurations to the new system
 """
 import os
-import subprocess
 import shutil
 import platform
-import winreg
-import json
-from datetime import datetime
-from typing import Dict, Any, List, Tuple
+import re
+import tempfile
+import threading
 from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from apply_journal import Journal, JournalEntry, plan_rollback
+from backup_store import BackupRun, BackupStore
+from cancellation import CancelToken, DEFAULT_COMMAND_TIMEOUT, OperationCancelled, run_command
+from collect_parser import DEFAULT_ALBIS_TARGET
+from file_restore import CopyStats, copy_files, plan_restore
+from network_state import NetworkState, compact_adapter, restore_lines
+from reg_parser import encode_reg_file, format_keys
+from registry_backend import RegistryBackend, get_default_backend, is_same_or_below, merge_key_paths
+from route_table import Route
+from step_timing import StepRecorder
+from system_snapshot import SystemSnapshot
 
 
 class ConfigApplier:
     """Applies configurations to the system"""
 
-    def __init__(self, dry_run: bool = False, create_backup: bool = True):
+    # Kategorien, deren Elemente gemeinsam in einem Prozess angewendet werden
+    BATCH_CATEGORIES = ('network', 'routes', 'albis_files')
+
+    def __init__(self, dry_run: bool = False, create_backup: bool = True,
+                 registry_backend: Optional[RegistryBackend] = None,
+                 cancel_token: Optional[CancelToken] = None,
+                 command_timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT,
+                 backup_store: Optional[BackupStore] = None,
+                 run_id: Optional[str] = None):
         """
         Initialize configuration applier
 
         Args:
             dry_run: If True, only simulate actions without applying them
             create_backup: If True, create backup before applying changes
+            registry_backend: Registry access for backups (default: live registry)
+            cancel_token: Stops running commands when cancelled
+            command_timeout: Seconds until an external command is killed (None = no limit)
+            backup_store: Where backups go (default: BackupStore in 'APPLY_Backup')
+            run_id: Continue this run (same journal and backup) instead of starting a new one
         """
         self.dry_run = dry_run
         self.create_backup = create_backup
+        self.cancel_token = cancel_token or CancelToken()
+        self.command_timeout = command_timeout
         self.applied_configs = []
         self.errors = []
-        self.backup_dir = None
+        self.aborted = []
+        self.timings = StepRecorder()
+        self.backup: Optional[BackupRun] = None
+        self.store: Optional[BackupStore] = None
+        self.run_id: Optional[str] = None
+        # Hostname/Arbeitsgruppe wurden geändert, wirksam erst nach Neustart
+        self.reboot_required = False
+        self._registry_backend = registry_backend
+        self._registry_backed_up = []
+        self._registry_sections = []
+        self._registry_backup: Optional[str] = None
+        self._backup_lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        # Kopierleistung je Dateigruppe (albis_files)
+        self.file_copies: List[CopyStats] = []
+
+        # Journal ohne Pfad schreibt nichts (Dry Run)
+        self.journal = Journal()
+        if not self.dry_run:
+            self.store = backup_store or BackupStore()
+            # Unveränderte Daten früherer Läufe werden nicht erneut gespeichert
+            run = self.store.open_run(run_id) if run_id else self.store.begin_run()
+            self.run_id = run.run_id
+            if self.create_backup:
+                self.backup = run
+            # Journal auch ohne Backup, sonst ist kein Rollback möglich
+            self.journal = Journal(str(self.store.journal_path(run.run_id)))
+
+    @property
+    def registry_backend(self) -> RegistryBackend:
+        """Registry access, created on first use"""
+        if self._registry_backend is None:
+            self._registry_backend = get_default_backend()
+        return self._registry_backend
+
+    def _run(self, args: List[str], retry: bool = False, **kwargs):
+        """
+        Run an external command with the configured timeout, stoppable via the cancel token
+
+        Duration, exit code and output size are recorded in ``self.timings``;
+        ``retry`` marks a command that repeats an earlier, failed attempt.
+        """
+        with self.timings.command(args, retry=retry) as timing:
+            result = run_command(args, timeout=self.command_timeout, token=self.cancel_token, **kwargs)
+            timing.set_result(result.returncode, result.stdout, result.stderr)
+        return result
+
+    def _failed(self, error_msg: str, error: Exception) -> Tuple[bool, str]:
+        """Record a failed item; cancelled items are recorded as aborted, not as errors"""
+        if isinstance(error, OperationCancelled):
+            self.aborted.append(error_msg)
+        else:
+            self.errors.append(error_msg)
+        return False, error_msg
 
-        if self.create_backup and not self.dry_run:
-            self._create_backup_directory()
+    @property
+    def snapshot(self) -> SystemSnapshot:
+        """Current state of the target system, captured on first use"""
+        return self.preflight()
 
-    def _create_backup_directory(self):
-        """Create backup directory"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.backup_dir = Path(f"APPLY_Backup_{timestamp}")
-        self.backup_dir.mkdir(exist_ok=True)
+    def preflight(self) -> SystemSnapshot:
+        """
+        Capture the system state once before applying
+
+        The snapshot is shared by all appliers to detect settings that are
+        already in place and is saved as 'system_snapshot.json' in the backup
+        directory, the network part also as 'network_state.json'. A resumed
+        run keeps the entries of its first attempt.
+
+        Returns:
+            The snapshot of this run
+        """
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                with self.timings.step('preflight'):
+                    self._snapshot = SystemSnapshot.capture(run=self._run)
+                if self.backup:
+                    # Beim Fortsetzen steht der Zustand vor dem ersten Versuch bereits
+                    # im Backup und darf nicht durch den teilweise geänderten ersetzt werden
+                    try:
+                        if "system_snapshot.json" not in self.backup.entries:
+                            self.backup.put_json("system_snapshot.json", self._snapshot.to_dict())
+                        # Alle Adapter in einem Eintrag, unabhängig von der Anzahl ausgewählter Schnittstellen
+                        if self._snapshot.network.adapters and "network_state.json" not in self.backup.entries:
+                            self.backup.put_json("network_state.json", self._snapshot.network.to_dict())
+                    except Exception as e:
+                        self.errors.append(f"Backup failed for system snapshot: {str(e)}")
+            return self._snapshot
+
+    def backup_registry_keys(self, key_paths: List[str]) -> Optional[str]:
+        """
+        Backup several registry keys into one consolidated .reg file
+
+        Overlapping paths are merged (a parent covers its children) and keys
+        already saved in this run are skipped. Each remaining subtree is read
+        once through the registry backend instead of one 'reg export' per key.
+        The file grows with each call; the backup store only writes its new
+        chunks.
+
+        Args:
+            key_paths: Registry key paths to back up
+
+        Returns:
+            Name of the backup entry, or None if no backup was written
+        """
+        if not self.backup or self.dry_run:
+            return None
+
+        with self._backup_lock:
+            backup_name = self._registry_backup_name()
+            roots = [path for path in merge_key_paths(key_paths)
+                     if not any(is_same_or_below(path, done) for done in self._registry_backed_up)]
+            if not roots:
+                return backup_name
+
+            trees = []
+            for path in roots:
+                try:
+                    tree = self.registry_backend.read_tree(path)
+                except Exception as e:
+                    self.errors.append(f"Backup failed for {path}: {str(e)}")
+                    continue
+                if tree is not None:
+                    trees.append(tree)
+                self._registry_backed_up.append(path)
+
+            try:
+                self._registry_sections.extend(format_keys(trees))
+                self.backup.put_bytes(backup_name, encode_reg_file(self._registry_sections))
+            except Exception as e:
+                self.errors.append(f"Backup failed for {', '.join(roots)}: {str(e)}")
+                return None
+        return backup_name
+
+    def _registry_backup_name(self) -> str:
+        """
+        Entry name of this attempt's registry backup
+
+        A resumed run writes to a new entry ('registry_backup_2.reg', ...), the
+        keys saved by earlier attempts hold the state before any change.
+        """
+        if self._registry_backup is None:
+            name, attempt = "registry_backup.reg", 1
+            while name in self.backup.entries:
+                attempt += 1
+                name = f"registry_backup_{attempt}.reg"
+            self._registry_backup = name
+        return self._registry_backup
 
     def _backup_registry_key(self, key_path: str):
         """Backup a registry key before modifying"""
-        if not self.backup_dir or self.dry_run:
-            return
-
-        try:
-            # Fix f-string backslash issue by doing replacements outside f-string
-            safe_path = key_path.replace('\\', '_').replace(':', '')
-            backup_file = self.backup_dir / f"registry_{safe_path}.reg"
-            # Export registry key
-            subprocess.run(
-                ['reg', 'export', key_path, str(backup_file), '/y'],
-                check=True,
-                capture_output=True
-            )
-        except Exception as e:
-            self.errors.append(f"Backup failed for {key_path}: {str(e)}")
+        self.backup_registry_keys([key_path])
 
     def apply_hostname_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply hostname configuration"""
         try:
             hostname = config.get('hostname', config.get('value', ''))
+            current_hostname = self.snapshot.hostname
+
+            if current_hostname.lower() == hostname.lower():
+                return True, f"Hostname bereits gesetzt: {current_hostname}"
 
             if self.dry_run:
-                current_hostname = platform.node()
                 return True, f"[DRY RUN] Would change hostname from '{current_hostname}' to '{hostname}'"
 
             if platform.system() == 'Windows':
                 # Backup current hostname
-                if self.create_backup:
-                    current = subprocess.run(['hostname'], capture_output=True, text=True).stdout.strip()
-                    backup_file = self.backup_dir / "hostname_backup.txt"
-                    backup_file.write_text(current)
+                if self.backup:
+                    self.backup.put_text("hostname_backup.txt", current_hostname)
 
                 # Change hostname
-                subprocess.run(['wmic', 'computersystem', 'where', 'name="%computername%"', 'call', 'rename', f'name="{hostname}"'],
+                with self.journal.change('hostname', hostname, {'hostname': current_hostname},
+                                         {'hostname': hostname}):
+                    self._run(['wmic', 'computersystem', 'where', 'name="%computername%"', 'call', 'rename', f'name="{hostname}"'],
                               check=True, capture_output=True)
+                self.reboot_required = True
                 message = f"Hostname geändert zu: {hostname} (Neustart erforderlich)"
             else:
-                subprocess.run(['hostnamectl', 'set-hostname', hostname], check=True)
+                with self.journal.change('hostname', hostname, {'hostname': current_hostname},
+                                         {'hostname': hostname}):
+                    self._run(['hostnamectl', 'set-hostname', hostname], check=True)
                 message = f"Hostname geändert zu: {hostname}"
 
             self.applied_configs.append(message)
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler beim Ändern des Hostnames: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler beim Ändern des Hostnames: {str(e)}", e)
 
-    def apply_network_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
-        """Apply network configuration (IPv4: IP, DNS, Gateway)"""
+    @staticmethod
+    def _netsh_lines(config: Dict[str, Any]) -> List[str]:
+        """
+        Render the netsh script lines for one interface
+
+        Raises:
+            ValueError: If address or subnet mask is missing (the positional
+                form would shift the gateway into the mask)
+        """
+        interface = config.get('interface', 'LAN')
+        ip_address = config.get('ip_address', '')
+        netmask = config.get('netmask', '')
+        gateway = config.get('gateway', '') or 'none'
+        dns_servers = config.get('dns', [])
+        if not ip_address or not netmask:
+            raise ValueError(f"Netzwerk {interface}: IP-Adresse oder Subnetzmaske fehlt")
+
+        lines = [f'interface ip set address name="{interface}" source=static '
+                 f'address={ip_address} mask={netmask} gateway={gateway}']
+        for idx, dns in enumerate(dns_servers):
+            # validate=no spart die Erreichbarkeitsprüfung jedes DNS-Servers
+            if idx == 0:
+                lines.append(f'interface ip set dns name="{interface}" static {dns} validate=no')
+            else:
+                lines.append(f'interface ip add dns name="{interface}" {dns} index={idx+1} validate=no')
+        return lines
+
+    def _run_netsh_script(self, lines: List[str], retry: bool = False) -> Tuple[bool, str]:
+        """
+        Execute netsh commands in a single 'netsh -f' call
+
+        Args:
+            lines: netsh commands
+            retry: True when re-running lines of a failed batch
+
+        Returns:
+            Tuple of (success, netsh output)
+        """
+        fd, script_path = tempfile.mkstemp(prefix='apply_netsh_', suffix='.txt')
         try:
-            interface = config.get('interface', 'LAN')
-            ip_address = config.get('ip_address', '')
-            netmask = config.get('netmask', '')
-            gateway = config.get('gateway', '')
-            dns_servers = config.get('dns', [])
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write('\r\n'.join(lines) + '\r\n')
+            result = self._run(['netsh', '-f', script_path], retry=retry, capture_output=True, text=True)
+        finally:
+            os.remove(script_path)
+        output = (result.stdout + result.stderr).strip()
+        return not self._netsh_failed(result.returncode != 0, output), output
+
+    @staticmethod
+    def _netsh_failed(exit_error: bool, output: str) -> bool:
+        """True if netsh failed (successful commands print nothing or only "Ok.")"""
+        return exit_error or any(
+            line.strip() and line.strip().rstrip('.').lower() != 'ok' for line in output.splitlines())
+
+    def _run_netsh_batch(self, item_lines: List[List[str]]) -> List[Tuple[bool, str]]:
+        """
+        Run the netsh lines of several items with one cmd process
 
-            if self.dry_run:
-                return True, f"[DRY RUN] Would configure {interface}: IP={ip_address}, Gateway={gateway}, DNS={dns_servers}"
+        Each item gets its own netsh script, framed by markers in a single
+        cmd script (see ``_run_cmd_script``), so the result is known per
+        item. Only failed items are run once more. A single ``netsh -f``
+        for all items would save the cmd process, but netsh reports no
+        status per line, so a failure could not be traced to its interface.
 
-            if platform.system() == 'Windows':
-                # Backup current network config
-                if self.create_backup:
-                    backup_file = self.backup_dir / f"network_{interface}.json"
-                    current_config = {
-                        'interface': interface,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    backup_file.write_text(json.dumps(current_config, indent=2))
-
-                # Set static IP
-                subprocess.run([
-                    'netsh', 'interface', 'ip', 'set', 'address',
-                    f'name="{interface}"', 'static', ip_address, netmask, gateway
-                ], check=True, capture_output=True)
-
-                # Set DNS
-                if dns_servers:
-                    for idx, dns in enumerate(dns_servers):
-                        if idx == 0:
-                            subprocess.run([
-                                'netsh', 'interface', 'ip', 'set', 'dns',
-                                f'name="{interface}"', 'static', dns
-                            ], check=True, capture_output=True)
-                        else:
-                            subprocess.run([
-                                'netsh', 'interface', 'ip', 'add', 'dns',
-                                f'name="{interface}"', dns, f'index={idx+1}'
-                            ], check=True, capture_output=True)
+        Returns:
+            (success, netsh output) per item
+        """
+        if len(item_lines) == 1:
+            return [self._run_netsh_script(item_lines[0])]
 
-                message = f"Netzwerk {interface} konfiguriert: {ip_address}"
+        script_paths = []
+        try:
+            for lines in item_lines:
+                fd, script_path = tempfile.mkstemp(prefix='apply_netsh_', suffix='.txt')
+                script_paths.append(script_path)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write('\r\n'.join(lines) + '\r\n')
+            outcomes = self._run_cmd_script([[f'netsh -f "{path}"'] for path in script_paths],
+                                            prefix='apply_netsh_',
+                                            failed=lambda exit_code, output:
+                                            self._netsh_failed(exit_code != '0', output))
+        finally:
+            for script_path in script_paths:
+                os.remove(script_path)
+        return [outcome if outcome[0] else self._run_netsh_script(lines, retry=True)
+                for lines, outcome in zip(item_lines, outcomes)]
+
+    def apply_network_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Apply several network configurations with one cmd process
+
+        The address, gateway and DNS changes of all interfaces run as one
+        batch with a result per interface (see ``_run_netsh_batch``).
+        Interfaces that already match the system snapshot are skipped.
+
+        Args:
+            items: List of (item_key, config) tuples
+
+        Returns:
+            Dictionary of item_key -> (success, message)
+        """
+        results = {}
+        snapshot = self.snapshot
+        pending = []
+        for item_key, config in items:
+            if not config.get('ip_address') or not config.get('netmask'):
+                message = (f"Netzwerk {config.get('interface', 'LAN')}: IP-Adresse oder Subnetzmaske fehlt, "
+                           f"keine statische Konfiguration möglich")
+                self.errors.append(message)
+                results[item_key] = (False, message)
+            elif snapshot.network_matches(config):
+                results[item_key] = (True, f"Netzwerk {config.get('interface', 'LAN')} bereits konfiguriert: "
+                                           f"{config.get('ip_address', '')}")
             else:
-                # Linux network configuration
-                message = f"Netzwerk {interface}: {ip_address} (Linux-Implementierung pending)"
+                pending.append((item_key, config))
+        items = pending
+        if not items:
+            return results
+
+        if self.dry_run:
+            for item_key, config in items:
+                results[item_key] = (True, f"[DRY RUN] Would configure {config.get('interface', 'LAN')}: "
+                                           f"IP={config.get('ip_address', '')}, Gateway={config.get('gateway', '')}, "
+                                           f"DNS={config.get('dns', [])}")
+            return results
+
+        if platform.system() != 'Windows':
+            for item_key, config in items:
+                message = f"Netzwerk {config.get('interface', 'LAN')}: {config.get('ip_address', '')} (Linux-Implementierung pending)"
+                self.applied_configs.append(message)
+                results[item_key] = (True, message)
+            return results
 
-            self.applied_configs.append(message)
-            return True, message
+        try:
+            # Vorzustand aller Adapter steht bereits als network_state.json im Backup (preflight)
+            item_lines = [(item_key, config, self._netsh_lines(config)) for item_key, config in items]
+            seqs = [self.journal.intent('network', config.get('interface', 'LAN'),
+                                        snapshot.network.adapter(config.get('interface', 'LAN')),
+                                        {field: config.get(field) for field in
+                                         ('ip_address', 'netmask', 'gateway', 'dns')})
+                    for _, config, _ in item_lines]
+            outcomes = self._run_netsh_batch([lines for _, _, lines in item_lines])
+            for seq, (item_key, config, _), (item_success, item_output) in zip(seqs, item_lines, outcomes):
+                if item_success:
+                    message = f"Netzwerk {config.get('interface', 'LAN')} konfiguriert: {config.get('ip_address', '')}"
+                    self.applied_configs.append(message)
+                else:
+                    message = f"Fehler bei Netzwerkkonfiguration ({config.get('interface', 'LAN')}): {item_output}"
+                    self.errors.append(message)
+                self.journal.outcome(seq, item_success, item_output)
+                results[item_key] = (item_success, message)
 
         except Exception as e:
-            error_msg = f"Fehler bei Netzwerkkonfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            failed = self._failed(f"Fehler bei Netzwerkkonfiguration: {str(e)}", e)
+            for item_key, _ in items:
+                results.setdefault(item_key, failed)
+        return results
 
-    def apply_routes_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
-        """Apply persistent IPv4 routes"""
+    def apply_network_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
+        """Apply network configuration (IPv4: IP, DNS, Gateway)"""
+        return self.apply_network_batch([('', config)])['']
+
+    def _run_cmd_script(self, blocks: List[List[str]], prefix: str = 'apply_cmd_',
+                        failed: Optional[Callable[[str, str], bool]] = None) -> List[Tuple[bool, str]]:
+        """
+        Run several command blocks with one cmd process
+
+        Each block is framed by marker lines carrying its index and the exit
+        code of its last command, so the combined output can be split per
+        block again.
+
+        Args:
+            blocks: Command lines per block
+            prefix: Name prefix of the temporary script
+            failed: Judges a block by (exit code, output); default: exit code
+                other than 0 or an error word in the output
+
+        Returns:
+            List of (success, output) in input order
+        """
+        lines = ['@echo off']
+        for idx, block in enumerate(blocks):
+            lines.append(f'echo @@begin {idx}')
+            lines.extend(block)
+            lines.append(f'echo @@end {idx} %ERRORLEVEL%')
+
+        fd, script_path = tempfile.mkstemp(prefix=prefix, suffix='.cmd')
         try:
-            dest = config.get('destination', '')
-            mask = config.get('mask', '')
-            gateway = config.get('gateway', '')
+            # cmd liest Skripte in der OEM-Codepage (Pfade mit Umlauten im Benutzernamen)
+            encoding = 'oem' if platform.system() == 'Windows' else 'ascii'
+            with os.fdopen(fd, 'w', encoding=encoding, errors='replace') as f:
+                f.write('\r\n'.join(lines) + '\r\n')
+            result = self._run(['cmd', '/c', script_path], capture_output=True, text=True,
+                               errors='replace')
+        finally:
+            os.remove(script_path)
+
+        outcomes = [(False, "Kein Ergebnis")] * len(blocks)
+        current, buffer = None, []
+        for line in result.stdout.splitlines():
+            marker = line.strip().split()
+            if marker[:1] == ['@@begin']:
+                current, buffer = int(marker[1]), []
+            elif marker[:1] == ['@@end'] and current is not None:
+                output = '\n'.join(buffer).strip()
+                exit_code = marker[2] if len(marker) > 2 else ''
+                if failed is not None:
+                    block_failed = failed(exit_code, output)
+                else:
+                    # route.exe und net.exe melden Fehler nicht immer über den Exit-Code
+                    block_failed = exit_code != '0' or re.search(r'fail|fehl', output, re.IGNORECASE)
+                outcomes[current] = (not block_failed, output)
+                current = None
+            elif current is not None:
+                buffer.append(line)
+        return outcomes
+
+    def _run_route_script(self, routes: List[Tuple[str, str, str, bool]]) -> List[Tuple[bool, str]]:
+        """
+        Add several persistent routes with one cmd process
 
-            if self.dry_run:
-                return True, f"[DRY RUN] Would add persistent route: {dest} mask {mask} via {gateway}"
+        Args:
+            routes: List of (destination, mask, gateway, replace) tuples;
+                replace first deletes an active, non-persistent entry
 
-            if platform.system() == 'Windows':
-                # Add persistent route
-                subprocess.run([
-                    'route', '-p', 'add', dest, 'mask', mask, gateway
-                ], check=True, capture_output=True)
-                message = f"Persistente Route hinzugefügt: {dest} via {gateway}"
-            else:
-                message = f"Route {dest} via {gateway} (Linux-Implementierung pending)"
+        Returns:
+            List of (success, output) in input order
+        """
+        blocks = []
+        for dest, mask, gateway, replace in routes:
+            block = [f'route delete {dest} mask {mask} {gateway} >nul 2>&1'] if replace else []
+            block.append(f'route -p add {dest} mask {mask} {gateway}')
+            blocks.append(block)
+        return self._run_cmd_script(blocks, prefix='apply_routes_')
+
+    def apply_routes_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Apply persistent IPv4 routes, skipping those already present
 
-            self.applied_configs.append(message)
-            return True, message
+        The route table is read once; only routes without a persistent entry
+        for the same destination/mask/gateway are added, all in one process.
+
+        Args:
+            items: List of (item_key, config) tuples
+
+        Returns:
+            Dictionary of item_key -> (success, message)
+        """
+        results = {}
+        try:
+            table = self.snapshot.routes
+            todo = []
+            for item_key, config in items:
+                dest = config.get('destination', '')
+                mask = config.get('mask', '')
+                gateway = config.get('gateway', '')
+                existing = table.find(dest, mask, gateway)
+                if existing is not None and existing.persistent:
+                    results[item_key] = (True, f"Route bereits vorhanden: {dest} mask {mask} via {gateway}")
+                elif self.dry_run:
+                    results[item_key] = (True, f"[DRY RUN] Would add persistent route: {dest} mask {mask} via {gateway}")
+                else:
+                    todo.append((item_key, dest, mask, gateway, existing is not None))
+
+            if not todo:
+                return results
+
+            if platform.system() != 'Windows':
+                for item_key, dest, mask, gateway, _ in todo:
+                    message = f"Route {dest} via {gateway} (Linux-Implementierung pending)"
+                    self.applied_configs.append(message)
+                    results[item_key] = (True, message)
+                return results
+
+            seqs = [self.journal.intent('route', f"{dest} mask {mask} {gateway}",
+                                        {'destination': dest, 'mask': mask, 'gateway': gateway,
+                                         'persistent': False} if replace else None,
+                                        {'destination': dest, 'mask': mask, 'gateway': gateway,
+                                         'persistent': True})
+                    for _, dest, mask, gateway, replace in todo]
+            outcomes = self._run_route_script([(dest, mask, gateway, replace)
+                                               for _, dest, mask, gateway, replace in todo])
+            for seq, (success, output) in zip(seqs, outcomes):
+                self.journal.outcome(seq, success, output)
+            for (item_key, dest, mask, gateway, _), (success, output) in zip(todo, outcomes):
+                if success:
+                    table.add(Route(dest, mask, gateway, persistent=True))
+                    message = f"Persistente Route hinzugefügt: {dest} via {gateway}"
+                    self.applied_configs.append(message)
+                else:
+                    message = f"Fehler bei Route-Konfiguration ({dest} via {gateway}): {output}"
+                    self.errors.append(message)
+                results[item_key] = (success, message)
 
         except Exception as e:
-            error_msg = f"Fehler bei Route-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            failed = self._failed(f"Fehler bei Route-Konfiguration: {str(e)}", e)
+            for item_key, _ in items:
+                results.setdefault(item_key, failed)
+        return results
+
+    def apply_routes_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
+        """Apply persistent IPv4 routes"""
+        return self.apply_routes_batch([('', config)])['']
 
     def apply_domain_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply domain configuration"""
         try:
             domain = config.get('domain', config.get('value', ''))
+            snapshot = self.snapshot
+
+            if snapshot.part_of_domain and snapshot.domain.lower() == domain.lower():
+                return True, f"Domäne bereits gesetzt: {snapshot.domain}"
 
             if self.dry_run:
                 return True, f"[DRY RUN] Would join domain: {domain}"
@@ -185,24 +566,30 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Domänenkonfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Domänenkonfiguration: {str(e)}", e)
 
     def apply_workgroup_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply workgroup configuration"""
         try:
             workgroup = config.get('workgroup', config.get('value', ''))
+            snapshot = self.snapshot
+
+            if not snapshot.part_of_domain and snapshot.workgroup.lower() == workgroup.lower():
+                return True, f"Arbeitsgruppe bereits gesetzt: {snapshot.workgroup}"
 
             if self.dry_run:
                 return True, f"[DRY RUN] Would set workgroup to: {workgroup}"
 
             if platform.system() == 'Windows':
                 # Change workgroup via WMI
-                subprocess.run([
-                    'wmic', 'computersystem', 'where', 'name="%computername%"',
-                    'call', 'joindomainorworkgroup', f'name="{workgroup}"'
-                ], check=True, capture_output=True)
+                before = {'workgroup': snapshot.workgroup, 'domain': snapshot.domain,
+                          'part_of_domain': snapshot.part_of_domain}
+                with self.journal.change('workgroup', workgroup, before, {'workgroup': workgroup}):
+                    self._run([
+                        'wmic', 'computersystem', 'where', 'name="%computername%"',
+                        'call', 'joindomainorworkgroup', f'name="{workgroup}"'
+                    ], check=True, capture_output=True)
+                self.reboot_required = True
                 message = f"Arbeitsgruppe geändert zu: {workgroup} (Neustart erforderlich)"
             else:
                 message = f"Arbeitsgruppe: {workgroup} (Nur Windows)"
@@ -211,9 +598,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Arbeitsgruppen-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Arbeitsgruppen-Konfiguration: {str(e)}", e)
 
     def apply_network_drives_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply network drives configuration"""
@@ -222,6 +607,9 @@ class ConfigApplier:
             unc_path = config.get('unc_path', '')
             username = config.get('username', '')
 
+            if self.snapshot.drive_matches(drive_letter, unc_path):
+                return True, f"Netzlaufwerk bereits verbunden: {drive_letter}: -> {unc_path}"
+
             if self.dry_run:
                 return True, f"[DRY RUN] Would map {drive_letter}: to {unc_path}"
 
@@ -231,7 +619,11 @@ class ConfigApplier:
                 if username:
                     cmd.extend([f'/user:{username}'])
 
-                subprocess.run(cmd, check=True, capture_output=True)
+                current = self.snapshot.drive(drive_letter)
+                before = {'unc_path': current.get('unc_path', '')} if current else None
+                with self.journal.change('drive', drive_letter.rstrip(':').upper(), before,
+                                         {'unc_path': unc_path}):
+                    self._run(cmd, check=True, capture_output=True)
                 message = f"Netzlaufwerk gemappt: {drive_letter}: -> {unc_path}"
             else:
                 message = f"Netzlaufwerk: {drive_letter} -> {unc_path} (Nur Windows)"
@@ -240,9 +632,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Netzlaufwerk-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Netzlaufwerk-Konfiguration: {str(e)}", e)
 
     def apply_default_browser_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply default browser configuration"""
@@ -258,9 +648,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Browser-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Browser-Konfiguration: {str(e)}", e)
 
     def apply_default_pdf_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply default PDF application configuration"""
@@ -275,9 +663,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei PDF-App-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei PDF-App-Konfiguration: {str(e)}", e)
 
     def apply_default_mail_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply default mail program configuration"""
@@ -292,9 +678,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Mail-App-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Mail-App-Konfiguration: {str(e)}", e)
 
     def apply_default_word_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply default Word application configuration"""
@@ -309,9 +693,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Word-App-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Word-App-Konfiguration: {str(e)}", e)
 
     def apply_browser_favorites_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply browser favorites configuration"""
@@ -327,9 +709,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Browser-Favoriten: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Browser-Favoriten: {str(e)}", e)
 
     def apply_username_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply username configuration"""
@@ -344,9 +724,7 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei Benutzerkonfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei Benutzerkonfiguration: {str(e)}", e)
 
     def apply_mobackup_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Apply MoBackup configuration"""
@@ -361,17 +739,108 @@ class ConfigApplier:
             return True, message
 
         except Exception as e:
-            error_msg = f"Fehler bei MoBackup-Konfiguration: {str(e)}"
-            self.errors.append(error_msg)
-            return False, error_msg
+            return self._failed(f"Fehler bei MoBackup-Konfiguration: {str(e)}", e)
+
+    def apply_albis_files_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Restore collected files (ALBISWIN) that differ on this system
 
-    def apply_configuration(self, category: str, config: Dict[str, Any]) -> Tuple[bool, str]:
+        Source and target are hashed in parallel, identical files are
+        skipped. The rest is copied with a bounded thread pool (see
+        file_restore), each copy verified against the source hash. Files
+        that get replaced are saved to the backup first; every copy is
+        journaled, so rollback restores or removes it. Re-running after an
+        interruption only copies what is still missing.
+
+        Args:
+            items: List of (item_key, config) tuples
+
+        Returns:
+            Dictionary of item_key -> (success, message)
+        """
+        results = {}
+        groups: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+        for item_key, config in items:
+            target_dir = config.get('target_dir') or DEFAULT_ALBIS_TARGET
+            groups.setdefault((config.get('source_dir', ''), target_dir), []).append((item_key, config))
+
+        for (source_dir, target_dir), group in groups.items():
+            if not os.path.isabs(target_dir):
+                # C:\CGM\ALBISWIN ist außerhalb von Windows kein gültiger Pfad
+                for item_key, config in group:
+                    name = config.get('file', item_key)
+                    results[item_key] = (True, f"[DRY RUN] Would copy {name} to {target_dir}" if self.dry_run
+                                         else f"Datei {name}: {target_dir} (Nur Windows)")
+                continue
+            try:
+                results.update(self._restore_file_group(source_dir, target_dir, group))
+            except Exception as e:
+                failed = self._failed(f"Fehler beim Wiederherstellen von {target_dir}: {str(e)}", e)
+                for item_key, _ in group:
+                    results.setdefault(item_key, failed)
+        return results
+
+    def _restore_file_group(self, source_dir: str, target_dir: str,
+                            group: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Tuple[bool, str]]:
+        keys = {config.get('file', item_key): item_key for item_key, config in group}
+        with self.timings.command(['hash', source_dir, target_dir]):
+            tasks = plan_restore(source_dir, target_dir, list(keys), token=self.cancel_token)
+        pending = [task for task in tasks if not task.identical and not task.error]
+
+        if self.dry_run:
+            results = {}
+            for task in tasks:
+                if task.error:
+                    results[keys[task.name]] = (False, f"[DRY RUN] {task.name}: {task.error}")
+                elif task.identical:
+                    results[keys[task.name]] = (True, f"[DRY RUN] {task.name} unverändert")
+                else:
+                    results[keys[task.name]] = (True, f"[DRY RUN] Would copy {task.name} to {target_dir}")
+            return results
+
+        seqs = {}
+        for task in pending:
+            before = None
+            if task.exists:
+                before = {'run_id': self.run_id, 'entry': None}
+                if self.backup:
+                    entry = f"ALBISWIN/{task.name}"
+                    self.backup.put_file(entry, str(task.target))
+                    before['entry'] = entry
+            seqs[task.name] = self.journal.intent('file', str(task.target), before,
+                                                  {'digest': task.digest, 'size': task.size})
+
+        with self.timings.command(['copy', source_dir, target_dir]):
+            outcomes, stats = copy_files(tasks, token=self.cancel_token)
+        if pending:
+            self.file_copies.append(stats)
+
+        results = {}
+        for task in tasks:
+            success, message = outcomes[task.name]
+            if task.name in seqs:
+                self.journal.outcome(seqs[task.name], success, message)
+            if success:
+                self.applied_configs.append(message)
+            elif self.cancel_token.cancelled:
+                self.aborted.append(message)
+            else:
+                self.errors.append(f"Fehler beim Kopieren: {message}")
+            results[keys[task.name]] = (success, message)
+        return results
+
+    def apply_albis_file_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
+        """Restore a single collected file"""
+        return self.apply_albis_files_batch([('', config)])['']
+
+    def apply_configuration(self, category: str, config: Dict[str, Any], item_key: str = '') -> Tuple[bool, str]:
         """
         Apply a configuration based on its category
 
         Args:
             category: Configuration category
             config: Configuration data
+            item_key: Item name, used to label the step in ``self.timings``
 
         Returns:
             Tuple of (success, message)
@@ -390,20 +859,281 @@ class ConfigApplier:
             'default_word': self.apply_default_word_config,
             'browser_favorites': self.apply_browser_favorites_config,
             'mobackup': self.apply_mobackup_config,
+            'albis_files': self.apply_albis_file_config,
         }
 
         applier = appliers.get(category)
-        if applier:
-            return applier(config)
-        else:
+        if not applier:
             return False, f"Unbekannte Kategorie: {category}"
+        with self.timings.step(category, [item_key]) as step:
+            success, message = applier(config)
+            step.success = success
+        return success, message
+
+    def apply_batch(self, category: str, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Apply all items of a batchable category in one go
+
+        Args:
+            category: One of BATCH_CATEGORIES
+            items: List of (item_key, config) tuples
+
+        Returns:
+            Dictionary of item_key -> (success, message)
+        """
+        batch_appliers = {
+            'network': self.apply_network_batch,
+            'routes': self.apply_routes_batch,
+            'albis_files': self.apply_albis_files_batch,
+        }
+        applier = batch_appliers.get(category)
+        if not applier:
+            return {item_key: self.apply_configuration(category, config, item_key) for item_key, config in items}
+        with self.timings.step(category, [item_key for item_key, _ in items]) as step:
+            results = applier(items)
+            step.success = all(success for success, _ in results.values())
+        return results
+
+    def _undo_hostname(self, entries: List[JournalEntry]) -> List[Tuple[bool, str]]:
+        # Der älteste Eintrag enthält den ursprünglichen Namen
+        hostname = (entries[-1].before or {}).get('hostname', '')
+        if not hostname:
+            return [(False, "Kein ursprünglicher Hostname im Journal")] * len(entries)
+        if self.dry_run:
+            return [(True, f"[DRY RUN] Would rename computer back to '{hostname}'")] * len(entries)
+        if platform.system() == 'Windows':
+            self._run(['wmic', 'computersystem', 'where', 'name="%computername%"', 'call', 'rename',
+                       f'name="{hostname}"'], check=True)
+        else:
+            self._run(['hostnamectl', 'set-hostname', hostname], check=True)
+        return [(True, f"Hostname zurückgesetzt auf: {hostname}")] * len(entries)
+
+    def _undo_workgroup(self, entries: List[JournalEntry]) -> List[Tuple[bool, str]]:
+        before = entries[-1].before or {}
+        if before.get('part_of_domain'):
+            return [(False, f"Domäne {before.get('domain', '')}: Domänenbeitritt muss manuell "
+                            f"wiederhergestellt werden")] * len(entries)
+        workgroup = before.get('workgroup', '')
+        if not workgroup:
+            return [(False, "Keine ursprüngliche Arbeitsgruppe im Journal")] * len(entries)
+        if self.dry_run:
+            return [(True, f"[DRY RUN] Would set workgroup back to '{workgroup}'")] * len(entries)
+        self._run(['wmic', 'computersystem', 'where', 'name="%computername%"',
+                   'call', 'joindomainorworkgroup', f'name="{workgroup}"'], check=True)
+        return [(True, f"Arbeitsgruppe zurückgesetzt auf: {workgroup}")] * len(entries)
+
+    def _undo_drives(self, entries: List[JournalEntry]) -> List[Tuple[bool, str]]:
+        blocks, texts = [], []
+        for entry in entries:
+            letter = entry.key
+            previous = (entry.before or {}).get('unc_path', '')
+            if previous:
+                blocks.append([f'net use {letter}: /delete /y >nul 2>&1',
+                               f'net use {letter}: "{previous}" /persistent:yes'])
+                texts.append(f"Netzlaufwerk {letter}: wieder verbunden mit {previous}")
+            else:
+                blocks.append([f'net use {letter}: /delete /y'])
+                texts.append(f"Netzlaufwerk {letter}: getrennt")
+        if self.dry_run:
+            return [(True, f"[DRY RUN] {text}") for text in texts]
+        outcomes = self._run_cmd_script(blocks, prefix='apply_undo_drives_')
+        return [(ok, text if ok else f"{text} fehlgeschlagen: {output}")
+                for text, (ok, output) in zip(texts, outcomes)]
+
+    def _undo_routes(self, entries: List[JournalEntry]) -> List[Tuple[bool, str]]:
+        blocks, texts = [], []
+        for entry in entries:
+            route = entry.after or {}
+            dest, mask, gateway = route.get('destination', ''), route.get('mask', ''), route.get('gateway', '')
+            block = [f'route delete {dest} mask {mask} {gateway}']
+            text = f"Persistente Route entfernt: {dest} via {gateway}"
+            if entry.before:
+                # Vorher war die Route nur aktiv, nicht persistent
+                block = [block[0] + ' >nul 2>&1', f'route add {dest} mask {mask} {gateway}']
+                text = f"Route {dest} via {gateway} wieder nicht persistent"
+            blocks.append(block)
+            texts.append(text)
+        if self.dry_run:
+            return [(True, f"[DRY RUN] {text}") for text in texts]
+        outcomes = self._run_cmd_script(blocks, prefix='apply_undo_routes_')
+        return [(ok, text if ok else f"{text} fehlgeschlagen: {output}")
+                for text, (ok, output) in zip(texts, outcomes)]
+
+    def _undo_network(self, entries: List[JournalEntry]) -> List[Tuple[bool, str]]:
+        results: List[Optional[Tuple[bool, str]]] = [None] * len(entries)
+        item_lines = []
+        for idx, entry in enumerate(entries):
+            if not entry.before:
+                results[idx] = (False, f"Netzwerk {entry.key}: kein Vorzustand im Journal")
+                continue
+            before = compact_adapter(entry.before)
+            if not before['dhcp'] and not before['addresses']:
+                results[idx] = (False, f"Netzwerk {entry.key}: keine IPv4-Adresse im Vorzustand")
+                continue
+            item_lines.append((idx, entry, restore_lines(entry.key, before)))
+
+        if self.dry_run:
+            for idx, entry, lines in item_lines:
+                results[idx] = (True, f"[DRY RUN] Would restore {entry.key}: {'; '.join(lines)}")
+            return results
+        if item_lines:
+            outcomes = self._run_netsh_batch([lines for _, _, lines in item_lines])
+            for (idx, entry, _), (item_success, item_output) in zip(item_lines, outcomes):
+                results[idx] = (item_success, f"Netzwerk {entry.key} zurückgesetzt" if item_success
+                                else f"Netzwerk {entry.key} zurücksetzen fehlgeschlagen: {item_output}")
+        return results
+
+    def _undo_files(self, entries: List[JournalEntry]) -> List[Tuple[bool, str]]:
+        results = []
+        store = self.store or BackupStore()
+        runs = {}
+        for entry in entries:
+            target = Path(entry.key)
+            before = entry.before
+            if before is not None and not before.get('entry'):
+                results.append((False, f"{target.name}: ohne Backup überschrieben, nicht wiederherstellbar"))
+                continue
+            if self.dry_run:
+                action = "Would remove" if before is None else "Would restore"
+                results.append((True, f"[DRY RUN] {action} {target}"))
+                continue
+            try:
+                if before is None:
+                    # Datei gab es vorher nicht
+                    try:
+                        target.unlink()
+                    except FileNotFoundError:
+                        pass
+                    results.append((True, f"{target.name} entfernt"))
+                else:
+                    if before['run_id'] not in runs:
+                        runs[before['run_id']] = store.load_run(before['run_id'])
+                    tmp_path = target.with_name(target.name + '.apply_tmp')
+                    try:
+                        runs[before['run_id']].write_file(before['entry'], str(tmp_path))
+                    except (OSError, ValueError):
+                        tmp_path.unlink(missing_ok=True)
+                        raise
+                    os.replace(tmp_path, target)
+                    results.append((True, f"{target.name} wiederhergestellt"))
+            except (OSError, ValueError, KeyError) as e:
+                results.append((False, f"{target.name} zurücksetzen fehlgeschlagen: {e}"))
+        return results
+
+    def restore_network(self, state: NetworkState,
+                        names: Optional[List[str]] = None) -> List[Tuple[str, bool, str]]:
+        """
+        Restore a saved network state in bulk
+
+        The current state is queried once; only adapters that differ are
+        changed, all of them in one netsh script. Each change is journaled,
+        so a restore can be rolled back like an apply run.
+
+        Args:
+            state: State to restore (e.g. 'network_state.json' of a backup)
+            names: Only these adapters (default: all in ``state``)
+
+        Returns:
+            List of (adapter, success, message)
+        """
+        current = self.snapshot.network if self.snapshot.complete else NetworkState.capture(run=self._run)
+        if current is None:
+            return [(name, False, "Netzwerkzustand konnte nicht abgefragt werden (nur Windows)")
+                    for name in (names or sorted(state.adapters))]
+        item_lines = state.restore_lines(current, names)
+        if self.dry_run:
+            return [(name, True, f"[DRY RUN] {'; '.join(lines)}") for name, lines in item_lines]
+
+        seqs = [self.journal.intent('network', name, current.adapter(name), state.adapters[name])
+                for name, _ in item_lines]
+        results = []
+        try:
+            outcomes = self._run_netsh_batch([lines for _, lines in item_lines]) if item_lines else []
+        except Exception as e:
+            for seq in seqs:
+                self.journal.outcome(seq, False, str(e))
+            self._failed(f"Fehler beim Wiederherstellen des Netzwerks: {str(e)}", e)
+            return [(name, False, str(e)) for name, _ in item_lines]
+        for seq, (name, _), (success, output) in zip(seqs, item_lines, outcomes):
+            self.journal.outcome(seq, success, output)
+            results.append((name, success, f"Netzwerk {name} wiederhergestellt" if success
+                            else f"Netzwerk {name} wiederherstellen fehlgeschlagen: {output}"))
+        return results
+
+    def rollback(self, journal_path: str) -> List[Tuple[JournalEntry, bool, str]]:
+        """
+        Undo the changes of an earlier run from its journal
+
+        Changes are undone in reverse order, grouped by kind, with one process
+        per kind where possible (all drive mappings in one cmd script, all
+        interfaces in one netsh script, ...). Every undone change is recorded
+        in the journal, so a second rollback only retries what failed.
+
+        Args:
+            journal_path: Journal file of the run ('APPLY_Backup/journal/<run_id>.jsonl')
+
+        Returns:
+            List of (entry, success, message) in rollback order
+        """
+        undo = {
+            'hostname': self._undo_hostname,
+            'workgroup': self._undo_workgroup,
+            'drive': self._undo_drives,
+            'route': self._undo_routes,
+            'network': self._undo_network,
+            'file': self._undo_files,
+        }
+        journal = Journal(None if self.dry_run else journal_path)
+        results = []
+        try:
+            for kind, entries in plan_rollback(Journal.read(journal_path)):
+                if self.cancel_token.cancelled:
+                    break
+                handler = undo.get(kind)
+                with self.timings.step(f"rollback_{kind}", [entry.key for entry in entries]) as step:
+                    try:
+                        if handler is None:
+                            outcomes = [(False, f"Unbekannte Änderungsart im Journal: {kind}")] * len(entries)
+                        else:
+                            outcomes = handler(entries)
+                    except Exception as e:
+                        failed = self._failed(f"Fehler beim Zurücksetzen ({kind}): {str(e)}", e)
+                        outcomes = [None] * len(entries)
+                        results.extend((entry, False, failed[1]) for entry in entries)
+                    step.success = all(outcome is not None and outcome[0] for outcome in outcomes)
+
+                for entry, outcome in zip(entries, outcomes):
+                    if outcome is None:
+                        continue
+                    success, message = outcome
+                    (self.applied_configs if success else self.errors).append(message)
+                    journal.rolled_back(entry.seq, success, message)
+                    results.append((entry, success, message))
+        finally:
+            journal.close()
+        return results
 
     def get_summary(self) -> Dict[str, Any]:
         """Get summary of applied configurations"""
         return {
             'applied_count': len(self.applied_configs),
             'error_count': len(self.errors),
+            'aborted_count': len(self.aborted),
             'applied_configs': self.applied_configs,
             'errors': self.errors,
-            'backup_dir': str(self.backup_dir) if self.backup_dir else None
+            'aborted': self.aborted,
+            'timings': self.timings.table(),
+            'backup_manifest': str(self.backup.manifest_path) if self.backup and self.backup.entries else None,
+            'journal': str(self.journal.path) if self.journal.path and self.journal.path.exists() else None,
+            'run_id': self.run_id,
+            'reboot_required': self.reboot_required,
+            'file_copy': str(self._file_copy_total()) if self.file_copies else None
         }
+
+    def _file_copy_total(self) -> CopyStats:
+        total = CopyStats()
+        for stats in self.file_copies:
+            total.files += stats.files
+            total.bytes += stats.bytes
+            total.seconds += stats.seconds
+        return total
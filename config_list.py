@@ -0,0 +1,216 @@
+"""
+Config List Model
+Flat row model behind the configuration list (no Tk dependency)
+"""
+from typing import Any, Dict, List, Iterable, Optional
+
+from collect_schema import CollectModel
+from search_index import SearchIndex
+from selection import SelectionProfile, SelectionSet
+
+# Zeilenarten
+HEADER = 'header'
+INFO = 'info'
+SEPARATOR = 'separator'
+ITEM = 'item'
+
+# Kategorie -> (Icon, Anzeigename)
+CATEGORY_INFO = {
+    'hostname': ('🖥️', 'Hostname'),
+    'username': ('👤', 'Benutzername'),
+    'domain': ('🏢', 'Domäne'),
+    'workgroup': ('👥', 'Arbeitsgruppe'),
+    'network': ('🌐', 'Netzwerk (IPv4)'),
+    'routes': ('🛣️', 'Ständige Routen'),
+    'network_drives': ('💾', 'Netzlaufwerke'),
+    'default_browser': ('🌍', 'Standard-Browser'),
+    'default_pdf': ('📄', 'Standard-PDF-Anwendung'),
+    'default_mail': ('📧', 'Standard-Mailprogramm'),
+    'default_word': ('📝', 'Standard für Word-Dokumente'),
+    'browser_favorites': ('⭐', 'Browser-Favoriten'),
+    'mobackup': ('💼', 'MoBackup (Outlook-Backup)'),
+    'albis_files': ('📁', 'ALBIS-Dateien (ALBISWIN)')
+}
+
+
+def category_title(category: str) -> str:
+    """Display title of a category header"""
+    icon, display_name = CATEGORY_INFO.get(category, ('•', category.capitalize()))
+    return f"{icon} {display_name}:"
+
+
+class ListRow:
+    """One row of the list: header, info line, separator or selectable item"""
+
+    __slots__ = ('kind', 'text', 'detail', 'config_key', 'category', 'item')
+
+    def __init__(self, kind: str, text: str = '', detail: str = '',
+                 config_key: Optional[str] = None, category: Optional[str] = None,
+                 item: int = -1):
+        """
+        Args:
+            kind: HEADER, INFO, SEPARATOR or ITEM
+            text: Main text (checkbox text for items)
+            detail: Secondary text (description for items)
+            config_key: 'category.item_key' for items
+            category: Category the row belongs to
+            item: Position of the item in the selection (-1 for non-items)
+        """
+        self.kind = kind
+        self.text = text
+        self.detail = detail
+        self.config_key = config_key
+        self.category = category
+        self.item = item
+
+
+class ConfigListModel:
+    """
+    Rows and selection state of the configuration list
+
+    The list widget only renders the visible part of ``visible_rows``; the
+    selection lives here, so nothing depends on widgets existing for every
+    item. Items are indexed for prefix search as they are added.
+    """
+
+    def __init__(self):
+        self.rows: List[ListRow] = []
+        self.items: List[ListRow] = []
+        self.selection = SelectionSet()
+        self._by_key: Dict[str, int] = {}
+        self._headers: Dict[str, ListRow] = {}
+        self.search = SearchIndex()
+        self.query = ''
+        self.matches: Optional[List[int]] = None
+        self._view: Optional[List[ListRow]] = None
+
+    @classmethod
+    def from_collect(cls, model: CollectModel) -> 'ConfigListModel':
+        """Build the rows for a loaded COLLECT model"""
+        rows = cls()
+        rows.extend(cls.system_info_rows(model.system_info))
+        for category in model.get_categories():
+            rows.extend(cls.category_rows(category, model.get_category_items(category)))
+        return rows
+
+    @staticmethod
+    def system_info_rows(system_info: Dict[str, Any]) -> List[ListRow]:
+        """Rows for the read-only system information block"""
+        if not system_info:
+            return []
+        rows = [ListRow(HEADER, "📋 System-Information:")]
+        for key, value in system_info.items():
+            rows.append(ListRow(INFO, f"  • {key}: {value}"))
+        rows.append(ListRow(SEPARATOR))
+        return rows
+
+    @staticmethod
+    def category_rows(category: str, items: Any) -> List[ListRow]:
+        """Header and item rows of a category"""
+        rows = [ListRow(HEADER, category_title(category), category=category)]
+        if isinstance(items, dict):
+            for item_key, item_value in items.items():
+                if isinstance(item_value, dict):
+                    desc = item_value.get('description', '')
+                else:
+                    desc = str(item_value)[:60]
+                rows.append(ListRow(ITEM, f"{item_key}", desc, f"{category}.{item_key}", category))
+        elif isinstance(items, str):
+            rows.append(ListRow(ITEM, f"Wiederherstellen: {items}", '', f"{category}.value", category))
+        return rows
+
+    def add(self, row: ListRow):
+        """Append a row"""
+        if row.kind == ITEM:
+            row.item = len(self.items)
+            self._by_key[row.config_key] = row.item
+            self.items.append(row)
+            self.selection.extend(1, True)
+            self.search.add(row.item, row.category, category_title(row.category), row.text, row.detail)
+        elif row.kind == HEADER and row.category:
+            self._headers[row.category] = row
+        self.rows.append(row)
+
+    def extend(self, rows: Iterable[ListRow]):
+        """Append several rows (e.g. a category that finished loading)"""
+        for row in rows:
+            self.add(row)
+        self.search.prepare()
+        if self.query:
+            self.set_filter(self.query)
+
+    def set_filter(self, query: str):
+        """
+        Show only items matching ``query`` (prefix match per word)
+
+        Category headers are kept for categories with matches; an empty query
+        shows all rows again.
+        """
+        self.query = query
+        self.matches = self.search.search(query)
+        if self.matches is None:
+            self._view = None
+            return
+        view = []
+        category = None
+        for item in self.matches:
+            row = self.items[item]
+            if row.category != category:
+                category = row.category
+                header = self._headers.get(category)
+                if header is not None:
+                    view.append(header)
+            view.append(row)
+        self._view = view
+
+    @property
+    def visible_rows(self) -> List[ListRow]:
+        """Rows after filtering"""
+        return self.rows if self._view is None else self._view
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def item_count(self) -> int:
+        return len(self.items)
+
+    def is_selected(self, config_key: str) -> bool:
+        """True if the item exists and is selected"""
+        index = self._by_key.get(config_key)
+        return index is not None and self.selection.get(index)
+
+    def is_row_selected(self, row: ListRow) -> bool:
+        return row.item >= 0 and self.selection.get(row.item)
+
+    def set_selected(self, config_key: str, selected: bool):
+        index = self._by_key.get(config_key)
+        if index is not None:
+            self.selection.set(index, selected)
+
+    def set_all(self, selected: bool):
+        """Select or deselect every item"""
+        self.selection.set_all(selected)
+
+    def select_only(self, items: Iterable[int]):
+        """Select exactly the given item numbers"""
+        self.selection.select_only(items)
+
+    def apply_profile(self, profile: SelectionProfile) -> int:
+        """
+        Replace the selection with the items matching a profile
+
+        Returns:
+            Number of selected items
+        """
+        matches = [row.item for row in self.items if profile.matches(row.category, row.config_key)]
+        self.selection.select_only(matches)
+        return len(matches)
+
+    def selected_keys(self) -> List[str]:
+        """Config keys of all selected items in list order (consistent snapshot)"""
+        return [self.items[index].config_key for index in self.selection.indices()]
+
+    def categories(self) -> Iterable[str]:
+        """Categories in list order"""
+        return [row.category for row in self.rows if row.kind == HEADER and row.category]
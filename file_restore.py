@@ -0,0 +1,213 @@
+"""
+File Restore
+Delta-aware, parallel copy of collected files (ALBISWIN) back to the target system
+"""
+import hashlib
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cancellation import CancelToken, OperationCancelled
+
+DEFAULT_WORKERS = 4
+
+HASH_BLOCK = 1024 * 1024
+# Größe je copy_file_range-Aufruf; dazwischen wird auf Abbruch geprüft
+COPY_BLOCK = 8 * 1024 * 1024
+
+# Kopie wird erst nach erfolgreicher Prüfung über die Zieldatei geschoben
+TMP_SUFFIX = '.apply_tmp'
+
+
+def file_digest(path: str) -> str:
+    """Content hash of a file (BLAKE2b, 20 bytes, like the backup store)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileTask:
+    """One file to restore, with the result of comparing source and target"""
+
+    __slots__ = ('name', 'source', 'target', 'size', 'digest', 'exists', 'identical', 'error')
+
+    def __init__(self, name: str, source: Path, target: Path):
+        self.name = name
+        self.source = source
+        self.target = target
+        self.size = 0
+        self.digest = ''
+        self.exists = False
+        self.identical = False
+        # Quelle oder Ziel nicht lesbar: Datei wird nicht kopiert
+        self.error = ''
+
+    def __repr__(self) -> str:
+        return f"FileTask({self.name!r}, identical={self.identical})"
+
+
+class CopyStats:
+    """Files and bytes copied and the time it took"""
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1024 / 1024 / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.files} Dateien, {self.bytes / 1024 / 1024:.1f} MB in {self.seconds:.2f} s "
+                f"({self.mb_per_second:.1f} MB/s)")
+
+
+def list_files(source_dir: str) -> List[str]:
+    """Names of the files directly in ``source_dir`` (the collector copies no subfolders)"""
+    try:
+        with os.scandir(source_dir) as entries:
+            return sorted(entry.name for entry in entries
+                          if entry.is_file() and not entry.name.endswith(TMP_SUFFIX))
+    except FileNotFoundError:
+        return []
+
+
+def _compare(task: FileTask, token: Optional[CancelToken]) -> FileTask:
+    if token is not None:
+        token.raise_if_cancelled()
+    try:
+        task.size = task.source.stat().st_size
+        task.digest = file_digest(str(task.source))
+    except OSError as e:
+        task.error = f"Quelldatei nicht lesbar: {e}"
+        return task
+    try:
+        target_size = task.target.stat().st_size
+        task.exists = True
+        # Unterschiedliche Größe: Zieldatei muss nicht gelesen werden
+        task.identical = target_size == task.size and file_digest(str(task.target)) == task.digest
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        task.error = f"Zieldatei nicht lesbar: {e}"
+    return task
+
+
+def plan_restore(source_dir: str, target_dir: str, names: Optional[List[str]] = None,
+                 max_workers: int = DEFAULT_WORKERS,
+                 token: Optional[CancelToken] = None) -> List[FileTask]:
+    """
+    Hash source and target files in parallel
+
+    Args:
+        source_dir: Folder of the collection (e.g. '<Sammlung>/ALBISWIN')
+        target_dir: Folder on this system (e.g. 'C:\\CGM\\ALBISWIN')
+        names: File names to restore (default: all files in ``source_dir``)
+        max_workers: Size of the thread pool
+        token: Stops hashing files not yet started
+
+    Returns:
+        One FileTask per file; ``identical`` is True where nothing needs copying,
+        ``error`` is set where source or target could not be read
+    """
+    source, target = Path(source_dir), Path(target_dir)
+    tasks = [FileTask(name, source / name, target / name)
+             for name in (names if names is not None else list_files(source_dir))]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        return list(pool.map(lambda task: _compare(task, token), tasks))
+
+
+def _copy_range(source: Path, target: Path, token: Optional[CancelToken]) -> bool:
+    """Copy in the kernel with copy_file_range; False if not supported here"""
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            while True:
+                if token is not None:
+                    token.raise_if_cancelled()
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), COPY_BLOCK)
+                if copied == 0:
+                    break
+        except OSError:
+            # z.B. anderes Dateisystem oder Kernel ohne Unterstützung
+            return False
+        os.fsync(dst.fileno())
+    return True
+
+
+def copy_file(source: Path, target: Path, token: Optional[CancelToken] = None):
+    """
+    Copy a file, letting the kernel move the data where possible
+
+    Uses copy_file_range (Linux), otherwise shutil's platform fast path
+    (sendfile on Linux, fcopyfile on macOS, large-buffer copy on Windows).
+    """
+    if not _copy_range(source, target, token):
+        if token is not None:
+            token.raise_if_cancelled()
+        shutil.copyfile(source, target)
+        with open(target, 'rb+') as f:
+            os.fsync(f.fileno())
+    shutil.copystat(source, target)
+
+
+def _restore(task: FileTask, token: Optional[CancelToken]) -> Tuple[bool, str]:
+    tmp_path = task.target.with_name(task.target.name + TMP_SUFFIX)
+    try:
+        task.target.parent.mkdir(parents=True, exist_ok=True)
+        copy_file(task.source, tmp_path, token)
+        if file_digest(str(tmp_path)) != task.digest:
+            raise OSError(f"Prüfsumme nach dem Kopieren stimmt nicht: {task.name}")
+        os.replace(tmp_path, task.target)
+        return True, f"{task.name} kopiert ({task.size / 1024:.0f} KB)"
+    except (OSError, OperationCancelled) as e:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        if isinstance(e, OperationCancelled):
+            return False, f"{task.name}: Abgebrochen"
+        return False, f"{task.name}: {e}"
+
+
+def copy_files(tasks: List[FileTask], max_workers: int = DEFAULT_WORKERS,
+               token: Optional[CancelToken] = None) -> Tuple[Dict[str, Tuple[bool, str]], CopyStats]:
+    """
+    Copy the files that differ, with a bounded thread pool
+
+    Each file is written to a temporary name, verified against the source
+    hash and only then moved over the target, so an interrupted restore
+    leaves no half-written file; running it again skips the files that
+    are already identical.
+
+    Args:
+        tasks: Result of ``plan_restore`` (identical files and files with an
+            ``error`` are skipped, the latter reported as failed)
+        max_workers: Size of the thread pool
+        token: Stops copying, files not yet started are reported as aborted
+
+    Returns:
+        Tuple of (file name -> (success, message), statistics)
+    """
+    pending = [task for task in tasks if not task.identical and not task.error]
+    stats = CopyStats()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        outcomes = list(pool.map(lambda task: _restore(task, token), pending))
+    stats.seconds = time.perf_counter() - started
+
+    results = {task.name: (True, f"{task.name} unverändert") for task in tasks if task.identical}
+    results.update((task.name, (False, f"{task.name}: {task.error}")) for task in tasks if task.error)
+    for task, (success, message) in zip(pending, outcomes):
+        results[task.name] = (success, message)
+        if success:
+            stats.files += 1
+            stats.bytes += task.size
+    return results, stats
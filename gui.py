@@ -5,13 +5,21 @@ eXpletus Design mit CustomTkinter
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import threading
-import json
 import subprocess
 import platform
 from pathlib import Path
 from typing import Dict, List, Any
+from apply_scheduler import ApplyScheduler, build_graph
+from cancellation import CancelToken
 from collect_parser import CollectParser
+from parse_cache import ParseCache
+from resume import finish_run, track_run
+from selection import ProfileStore, SelectionProfile
+from step_timing import format_timing_table
 from config_applier import ConfigApplier
+from config_list import ConfigListModel
+from ui_events import FRAME_MS, MAX_LOG_LINES, LogSpool, UiEventQueue
+from virtual_list import VirtualList
 from expletus_style import *
 
 
@@ -31,13 +39,21 @@ class ApplyGUI(ctk.CTk):
 
         # Data
         self.parser = None
+        self.parse_cache = ParseCache()
+        self.profiles = ProfileStore()
         self.applier = None
-        self.selected_configs = {}
-        self.checkboxes = {}
         self.is_running = False
+        self.cancel_token = CancelToken()
+        self._load_cancel = None
+
+        # Log/Status/Fortschritt laufen über eine Queue, die der Main-Loop pro Frame leert
+        self.ui_events = UiEventQueue()
+        self.log_spool = LogSpool()
+        self._log_line_count = 0
 
         # Create GUI
         self.create_gui()
+        self.after(FRAME_MS, self._drain_ui_events)
 
     def create_gui(self):
         """Erstelle GUI-Elemente"""
@@ -70,15 +86,32 @@ class ApplyGUI(ctk.CTk):
                                       fg_color=Colors.GREEN, hover_color=Colors.GREEN_HOVER)
         self.load_btn.pack(side="left")
 
+        self.cancel_load_btn = ctk.CTkButton(file_inner, text="Abbrechen", command=self.cancel_load,
+                                             height=Sizes.BUTTON_SMALL, width=80, font=Fonts.BUTTON,
+                                             fg_color=Colors.GRAY, hover_color=Colors.GRAY_HOVER,
+                                             state="disabled")
+        self.cancel_load_btn.pack(side="left", padx=(5, 0))
+
         # 2. Configuration selection (scrollable)
         config_frame = ctk.CTkFrame(content)
         config_frame.pack(fill="both", expand=True, pady=(0, 10))
 
-        ctk.CTkLabel(config_frame, text="Konfigurationen auswählen:", font=Fonts.SUBTITLE).pack(anchor="w", padx=10, pady=(10, 5))
+        list_header = ctk.CTkFrame(config_frame, fg_color="transparent")
+        list_header.pack(fill="x", padx=10, pady=(10, 5))
+        ctk.CTkLabel(list_header, text="Konfigurationen auswählen:", font=Fonts.SUBTITLE).pack(side="left")
 
-        # Scrollable frame for checkboxes
-        self.scroll_frame = ctk.CTkScrollableFrame(config_frame, height=250)
-        self.scroll_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        # Filter über Kategorie, Element und Beschreibung (Präfixsuche je Wort)
+        self.filter_var = ctk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.apply_filter())
+        self.filter_entry = ctk.CTkEntry(list_header, textvariable=self.filter_var, width=220,
+                                         height=Sizes.ENTRY_HEIGHT, placeholder_text="Filtern...")
+        self.filter_entry.pack(side="right")
+        self.filter_label = ctk.CTkLabel(list_header, text="", font=Fonts.SMALL, text_color=Colors.MUTED)
+        self.filter_label.pack(side="right", padx=(0, 10))
+
+        # Virtualisierte Liste: Widgets nur für sichtbare Zeilen
+        self.config_list = VirtualList(config_frame, height=250)
+        self.config_list.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         # Button row for select all/none
         btn_row = ctk.CTkFrame(config_frame, fg_color="transparent")
@@ -87,7 +120,18 @@ class ApplyGUI(ctk.CTk):
         ctk.CTkButton(btn_row, text="Alle auswählen", command=self.select_all,
                      height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=100).pack(side="left", padx=(0, 5))
         ctk.CTkButton(btn_row, text="Alle abwählen", command=self.deselect_all,
-                     height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=100).pack(side="left")
+                     height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=100).pack(side="left", padx=(0, 5))
+        ctk.CTkButton(btn_row, text="Nur Treffer auswählen", command=self.select_matches,
+                     height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=140).pack(side="left")
+
+        # Auswahlprofile (vordefiniert oder gespeichert)
+        ctk.CTkButton(btn_row, text="Als Profil speichern", command=self.save_profile,
+                     height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=130).pack(side="right")
+        ctk.CTkButton(btn_row, text="Profil anwenden", command=self.apply_profile,
+                     height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=110).pack(side="right", padx=(0, 5))
+        self.profile_menu = ctk.CTkOptionMenu(btn_row, values=self.profiles.names(),
+                                              height=Sizes.BUTTON_SMALL, font=Fonts.SMALL, width=190)
+        self.profile_menu.pack(side="right", padx=(0, 5))
 
         # 3. Options
         options_frame = ctk.CTkFrame(content)
@@ -150,157 +194,184 @@ class ApplyGUI(ctk.CTk):
             self.file_entry.insert(0, filename)
 
     def load_file(self):
-        """COLLECT Datei laden"""
+        """COLLECT Datei im Hintergrund laden"""
         file_path = self.file_entry.get()
         if not file_path:
             messagebox.showerror("Fehler", "Bitte wählen Sie eine Datei aus")
             return
 
+        # Ein noch laufender Ladevorgang wird verworfen
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+        cancel = threading.Event()
+        self._load_cancel = cancel
+
         self.log("Lade Datei: " + file_path)
+        self.parser = None
+        self.start_btn.configure(state="disabled")
+        self.mobackup_btn.pack_forget()
+        self.config_list.set_model(ConfigListModel())
+        self.filter_var.set("")
+        self.cancel_load_btn.configure(state="normal")
+        self.ui_events.progress(0)
+        self.set_status("Lade Datei...")
+
+        thread = threading.Thread(target=self._load_thread, args=(file_path, cancel))
+        thread.daemon = True
+        thread.start()
 
+    def _load_thread(self, file_path: str, cancel: threading.Event):
+        """Lade-Thread: Parsen, Normalisieren und Prüfen, Liste kategorieweise füllen"""
         try:
-            self.parser = CollectParser(file_path)
-            if self.parser.load():
-                self.log("✓ Datei erfolgreich geladen")
-
-                # Check if configurations exist
-                categories = self.parser.get_categories()
-                if not categories:
-                    self.log("⚠️ Warnung: Keine Konfigurationen in der Datei gefunden")
-                    messagebox.showwarning("Warnung", "Die JSON-Datei enthält keine Konfigurationen.\n\nErwartet wird eine 'configurations' Struktur.")
+            parser = CollectParser(file_path, cache=self.parse_cache)
+            if not parser.load():
+                self.log("✗ Fehler beim Laden der Datei")
+                self.ui_events.call(messagebox.showerror, "Fehler", "Fehler beim Laden der Datei")
+                return
+            if cancel.is_set():
+                return
+
+            source = " aus Cache" if parser.from_cache else ""
+            self.log(f"✓ Datei erfolgreich{source} geladen (Format: {parser.get_schema()})")
+
+            # Check if configurations exist
+            categories = parser.get_categories()
+            if not categories:
+                self.log("⚠️ Warnung: Keine Konfigurationen in der Datei gefunden")
+                self.ui_events.call(messagebox.showwarning, "Warnung",
+                                    "Die JSON-Datei enthält keine Konfigurationen.\n\n"
+                                    "Unterstützt werden COLLECT v2.x ('version', 'system', 'network', ...) "
+                                    "und das ältere Format mit 'configurations' Struktur.")
+                return
+
+            self.ui_events.progress(0.3)
+            self.ui_events.call(self._append_rows, cancel,
+                                ConfigListModel.system_info_rows(parser.get_system_info()))
+
+            # Kategorien einzeln normalisieren und sofort anzeigen
+            for index, category in enumerate(categories):
+                if cancel.is_set():
                     return
+                rows = ConfigListModel.category_rows(category, parser.get_category_items(category))
+                self.ui_events.call(self._append_rows, cancel, rows)
+                self.ui_events.progress(0.3 + 0.7 * (index + 1) / len(categories))
+
+            self.ui_events.call(self._finish_load, cancel, parser)
 
-                self.populate_configs()
-                self.start_btn.configure(state="normal")
-            else:
-                messagebox.showerror("Fehler", "Fehler beim Laden der Datei")
-                self.log("✗ Fehler beim Laden der Datei")
-        except json.JSONDecodeError as e:
-            error_msg = f"Ungültige JSON-Datei:\n{str(e)}"
-            messagebox.showerror("JSON-Fehler", error_msg)
-            self.log(f"✗ JSON-Fehler: {str(e)}")
         except Exception as e:
-            error_msg = f"Fehler beim Laden:\n{str(e)}"
-            messagebox.showerror("Fehler", error_msg)
             self.log(f"✗ Fehler: {str(e)}")
             import traceback
             self.log(traceback.format_exc())
+            self.ui_events.call(messagebox.showerror, "Fehler", f"Fehler beim Laden:\n{str(e)}")
 
-    def populate_configs(self):
-        """Konfigurationen in der Liste anzeigen"""
-        # Clear existing
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
+        finally:
+            self.ui_events.call(self._end_load, cancel)
 
-        self.checkboxes = {}
-        self.selected_configs = {}
+    def _append_rows(self, cancel: threading.Event, rows):
+        """Fertig geladene Zeilen an die Liste anhängen (Main-Thread)"""
+        if cancel.is_set():
+            return
+        self.config_list.model.extend(rows)
+        self.config_list.refresh()
+        self._update_filter_label()
 
-        if not self.parser:
+    def _finish_load(self, cancel: threading.Event, parser: CollectParser):
+        """Geladene Datei übernehmen (Main-Thread)"""
+        if cancel.is_set():
             return
+        self.parser = parser
+        self.start_btn.configure(state="normal")
 
-        # System info (read-only)
-        system_info = self.parser.get_system_info()
-        if system_info:
-            info_label = ctk.CTkLabel(self.scroll_frame, text="📋 System-Information:",
-                                     font=Fonts.SUBTITLE, anchor="w")
-            info_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(5, 5))
-
-            row = 1
-            for key, value in system_info.items():
-                label = ctk.CTkLabel(self.scroll_frame, text=f"  • {key}: {value}",
-                                    font=Fonts.SMALL, text_color=Colors.MUTED, anchor="w")
-                label.grid(row=row, column=0, columnspan=2, sticky="w", padx=(20, 0))
-                row += 1
-
-            # Separator
-            sep = ctk.CTkFrame(self.scroll_frame, height=2, fg_color=Colors.GRAY)
-            sep.grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
-            row += 1
-        else:
-            row = 0
-
-        # Categories mit Checkboxes
-        categories = self.parser.get_categories()
-
-        category_info = {
-            'hostname': ('🖥️', 'Hostname'),
-            'username': ('👤', 'Benutzername'),
-            'domain': ('🏢', 'Domäne'),
-            'workgroup': ('👥', 'Arbeitsgruppe'),
-            'network': ('🌐', 'Netzwerk (IPv4)'),
-            'routes': ('🛣️', 'Ständige Routen'),
-            'network_drives': ('💾', 'Netzlaufwerke'),
-            'default_browser': ('🌍', 'Standard-Browser'),
-            'default_pdf': ('📄', 'Standard-PDF-Anwendung'),
-            'default_mail': ('📧', 'Standard-Mailprogramm'),
-            'default_word': ('📝', 'Standard für Word-Dokumente'),
-            'browser_favorites': ('⭐', 'Browser-Favoriten'),
-            'mobackup': ('💼', 'MoBackup (Outlook-Backup)')
-        }
-
-        for category in categories:
-            icon, display_name = category_info.get(category, ('•', category.capitalize()))
-
-            # Category header
-            header = ctk.CTkLabel(self.scroll_frame, text=f"{icon} {display_name}:",
-                                 font=Fonts.SUBTITLE, anchor="w")
-            header.grid(row=row, column=0, columnspan=2, sticky="w", pady=(10, 5))
-            row += 1
-
-            items = self.parser.get_category_items(category)
-
-            if isinstance(items, dict):
-                for item_key, item_value in items.items():
-                    var = ctk.BooleanVar(value=True)
-                    config_key = f"{category}.{item_key}"
-                    self.checkboxes[config_key] = var
-                    self.selected_configs[config_key] = var
-
-                    # Description
-                    if isinstance(item_value, dict):
-                        desc = item_value.get('description', '')
-                    else:
-                        desc = str(item_value)[:60]
-
-                    # Checkbox
-                    cb = ctk.CTkCheckBox(self.scroll_frame, text=f"{item_key}",
-                                        variable=var, font=Fonts.NORMAL)
-                    cb.grid(row=row, column=0, sticky="w", padx=(20, 10))
-
-                    # Description label
-                    desc_label = ctk.CTkLabel(self.scroll_frame, text=desc,
-                                             font=Fonts.SMALL, text_color=Colors.MUTED, anchor="w")
-                    desc_label.grid(row=row, column=1, sticky="w")
-                    row += 1
-
-            elif isinstance(items, str):
-                var = ctk.BooleanVar(value=True)
-                config_key = f"{category}.value"
-                self.checkboxes[config_key] = var
-                self.selected_configs[config_key] = var
-
-                cb = ctk.CTkCheckBox(self.scroll_frame, text=f"Wiederherstellen: {items}",
-                                    variable=var, font=Fonts.NORMAL)
-                cb.grid(row=row, column=0, columnspan=2, sticky="w", padx=(20, 10))
-                row += 1
-
-        self.log(f"✓ {len(categories)} Kategorien mit {len(self.checkboxes)} Elementen geladen")
+        categories = parser.get_categories()
+        self.log(f"✓ {len(categories)} Kategorien mit {self.config_list.model.item_count} Elementen geladen")
 
         # Check if MoBackup category exists
         if 'mobackup' in categories or any('outlook' in cat.lower() for cat in categories):
             self.mobackup_btn.pack(side="left", fill="x", expand=True, padx=(0, 5))
             self.log("💼 MoBackup verfügbar - Button aktiviert")
 
+    def _end_load(self, cancel: threading.Event):
+        """Ladevorgang beendet, abgebrochen oder fehlgeschlagen (Main-Thread)"""
+        if cancel is not self._load_cancel:
+            return
+        self._load_cancel = None
+        self.cancel_load_btn.configure(state="disabled")
+        if cancel.is_set():
+            self.ui_events.progress(0)
+            self.set_status("Laden abgebrochen", Colors.ERROR)
+        else:
+            self.ui_events.progress(1 if self.parser else 0)
+            self.set_status("Bereit" if self.parser else "Laden fehlgeschlagen",
+                            Colors.MUTED if self.parser else Colors.ERROR)
+
+    def cancel_load(self):
+        """Laufenden Ladevorgang abbrechen"""
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+            self.cancel_load_btn.configure(state="disabled")
+            self.config_list.set_model(ConfigListModel())
+            self.log("⚠️ Laden abgebrochen")
+
+    def apply_filter(self):
+        """Liste auf Treffer des Filtertexts einschränken"""
+        self.config_list.model.set_filter(self.filter_var.get())
+        self.config_list.scroll_to(0)
+        self._update_filter_label()
+
+    def _update_filter_label(self):
+        model = self.config_list.model
+        if model.matches is None:
+            self.filter_label.configure(text="")
+        else:
+            self.filter_label.configure(text=f"{len(model.matches)} von {model.item_count}")
+
+    def select_matches(self):
+        """Nur die gefilterten Elemente auswählen"""
+        model = self.config_list.model
+        if model.matches is None:
+            self.log("⚠️ Kein Filter gesetzt")
+            return
+        model.select_only(model.matches)
+        self.config_list.refresh()
+        self.log(f"✓ {len(model.matches)} gefilterte Konfigurationen ausgewählt")
+
+    def apply_profile(self):
+        """Ausgewähltes Profil in einem Schritt auf die Liste anwenden"""
+        profile = self.profiles.get(self.profile_menu.get())
+        if profile is None:
+            return
+        count = self.config_list.model.apply_profile(profile)
+        self.config_list.refresh()
+        self.log(f"✓ Profil '{profile.name}': {count} Konfigurationen ausgewählt")
+
+    def save_profile(self):
+        """Aktuelle Auswahl als Profil speichern"""
+        model = self.config_list.model
+        if not model.item_count:
+            messagebox.showerror("Fehler", "Keine Daten geladen")
+            return
+        name = ctk.CTkInputDialog(title="Profil speichern", text="Name des Profils:").get_input()
+        if not name or not name.strip():
+            return
+        try:
+            self.profiles.save(SelectionProfile.from_keys(name.strip(), model.selected_keys()))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Fehler", f"Profil konnte nicht gespeichert werden:\n{str(e)}")
+            return
+        self.profile_menu.configure(values=self.profiles.names())
+        self.profile_menu.set(name.strip())
+        self.log(f"✓ Profil '{name.strip()}' gespeichert ({self.profiles.path})")
+
     def select_all(self):
         """Alle auswählen"""
-        for var in self.checkboxes.values():
-            var.set(True)
+        self.config_list.model.set_all(True)
+        self.config_list.refresh()
         self.log("✓ Alle Konfigurationen ausgewählt")
 
     def deselect_all(self):
         """Alle abwählen"""
-        for var in self.checkboxes.values():
-            var.set(False)
+        self.config_list.model.set_all(False)
+        self.config_list.refresh()
         self.log("○ Alle Konfigurationen abgewählt")
 
     def start_apply(self):
@@ -309,7 +380,9 @@ class ApplyGUI(ctk.CTk):
             messagebox.showerror("Fehler", "Keine Daten geladen")
             return
 
+        # Tk-Variablen nur im UI-Thread lesen
         dry_run = self.dry_run_var.get()
+        create_backup = self.backup_var.get()
         mode = "Dry Run (Simulation)" if dry_run else "ECHTE ÄNDERUNGEN"
 
         if not dry_run:
@@ -323,59 +396,73 @@ class ApplyGUI(ctk.CTk):
 
         self.log(f"\n{'='*60}")
         self.log(f"Starte Migration im Modus: {mode}")
+        self.log(f"Vollständiges Log: {self.log_spool.path}")
         self.log(f"{'='*60}\n")
 
         # UI anpassen
         self.is_running = True
+        self.cancel_token = CancelToken()
         self.start_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
-        self.progress_bar.set(0)
-        self.status_label.configure(text="Migration läuft...", text_color=Colors.SUCCESS)
+        self.ui_events.progress(0)
+        self.set_status("Migration läuft...", Colors.SUCCESS)
 
         # Thread starten
-        thread = threading.Thread(target=self._apply_thread, args=(dry_run,))
+        thread = threading.Thread(target=self._apply_thread, args=(dry_run, create_backup))
         thread.daemon = True
         thread.start()
 
-    def _apply_thread(self, dry_run: bool):
+    def _apply_thread(self, dry_run: bool, create_backup: bool):
         """Apply-Thread"""
         try:
-            self.applier = ConfigApplier(dry_run=dry_run, create_backup=self.backup_var.get())
-            categories = self.parser.get_categories()
-
-            # Count selected items
-            selected_count = sum(1 for key, var in self.checkboxes.items() if var.get())
-            processed = 0
-
-            for category in categories:
-                if not self.is_running:
-                    self.log("\n⚠️ Migration abgebrochen")
-                    break
-
-                items = self.parser.get_category_items(category)
-                if not isinstance(items, dict):
-                    continue
-
-                for item_key, item_value in items.items():
-                    if not self.is_running:
-                        break
-
-                    config_key = f"{category}.{item_key}"
-
-                    if config_key in self.checkboxes and self.checkboxes[config_key].get():
-                        self.log(f"Anwenden: {category} -> {item_key}")
-                        self.status_label.configure(text=f"Verarbeite: {category} -> {item_key}")
-
-                        success, message = self.applier.apply_configuration(category, item_value)
-
-                        if success:
-                            self.log(f"  ✓ {message}")
-                        else:
-                            self.log(f"  ✗ {message}")
-
-                        processed += 1
-                        progress = processed / selected_count if selected_count > 0 else 0
-                        self.progress_bar.set(progress)
+            token = self.cancel_token
+            self.applier = ConfigApplier(dry_run=dry_run, create_backup=create_backup,
+                                         cancel_token=token)
+
+            # Ist-Zustand einmal erfassen, die Applier erkennen damit bereits gesetzte Werte
+            self.set_status("Erfasse Systemzustand...")
+            snapshot = self.applier.preflight()
+            if snapshot.complete:
+                self.log(f"Systemzustand erfasst: {snapshot.hostname}, {len(snapshot.interfaces)} Adapter, "
+                         f"{len(snapshot.drives)} Netzlaufwerke, {len(snapshot.routes)} Routen")
+            else:
+                self.log("⚠️ Systemzustand nur teilweise erfasst")
+
+            # Ausgewählte Elemente als Abhängigkeitsgraph einplanen
+            # Auswahl einmal als Momentaufnahme lesen (Bitset ist threadsicher)
+            selected_keys = set(self.config_list.model.selected_keys())
+            selected = [(category, item_key, item_value)
+                        for category, item_key, item_value in self.parser.model.iter_items()
+                        if f"{category}.{item_key}" in selected_keys]
+            selected_count = len(selected)
+            processed = [0]
+
+            # Fortschritt sichern, damit ein Neustart mitten im Lauf fortgesetzt wird
+            resume_state = track_run(self.applier, self.parser.collect_file_path,
+                                     [f"{category}.{item_key}" for category, item_key, _ in selected])
+
+            def on_start(task):
+                self.log(f"Anwenden: {task.category} -> {task.item_key}")
+                self.set_status(f"Verarbeite: {task.category} -> {task.item_key}")
+
+            def on_done(result):
+                if result.skipped:
+                    return
+                if result.success:
+                    self.log(f"  ✓ {result.message}")
+                else:
+                    self.log(f"  ✗ {result.message}")
+                self.applier.journal.item_done(result.task.config_key, result.success)
+                processed[0] += 1
+                self.ui_events.progress(processed[0] / selected_count if selected_count > 0 else 0)
+
+            scheduler = ApplyScheduler(self.applier.apply_configuration,
+                                       batch_func=self.applier.apply_batch,
+                                       should_continue=lambda: not token.cancelled,
+                                       on_start=on_start, on_done=on_done)
+            scheduler.run(build_graph(selected, ConfigApplier.BATCH_CATEGORIES))
+            if token.cancelled:
+                self.log("\n⚠️ Migration abgebrochen")
 
             # Summary
             summary = self.applier.get_summary()
@@ -384,45 +471,105 @@ class ApplyGUI(ctk.CTk):
             self.log(f"{'='*60}")
             self.log(f"Erfolgreich: {summary['applied_count']}")
             self.log(f"Fehler: {summary['error_count']}")
+            if summary['aborted_count']:
+                self.log(f"Abgebrochen: {summary['aborted_count']}")
+            if summary['file_copy']:
+                self.log(f"Dateien kopiert: {summary['file_copy']}")
 
             if summary['errors']:
                 self.log("\nFehler:")
                 for error in summary['errors']:
                     self.log(f"  - {error}")
 
-            self.status_label.configure(text="Abgeschlossen", text_color=Colors.SUCCESS)
-
-            messagebox.showinfo(
+            if summary['journal']:
+                self.log(f"\nÄnderungsjournal: {summary['journal']}")
+                self.log("Rückgängig machen: python main.py rollback")
+
+            pending = finish_run(self.applier, resume_state)
+            if pending:
+                self.log(f"\n⚠️ {pending}")
+            elif summary['reboot_required']:
+                self.log("\n⚠️ Neustart erforderlich, damit Hostname/Arbeitsgruppe wirksam werden")
+
+            if summary['timings']:
+                self.log("\nZeiten je Kategorie:")
+                for line in format_timing_table(summary['timings']):
+                    self.log(f"  {line}")
+                trace_path = self.log_spool.path.with_suffix('.trace.json')
+                try:
+                    self.applier.timings.save_trace(str(trace_path))
+                    self.log(f"Zeitprofil (chrome://tracing): {trace_path}")
+                except OSError as e:
+                    self.log(f"⚠️ Zeitprofil konnte nicht gespeichert werden: {e}")
+
+            self.set_status("Abgeschlossen", Colors.SUCCESS)
+
+            self.ui_events.call(
+                messagebox.showinfo,
                 "Abgeschlossen",
                 f"Migration abgeschlossen!\n\n"
                 f"Erfolgreich: {summary['applied_count']}\n"
-                f"Fehler: {summary['error_count']}"
+                f"Fehler: {summary['error_count']}\n"
+                f"Abgebrochen: {summary['aborted_count']}"
             )
 
         except Exception as e:
             self.log(f"\n✗ FEHLER: {str(e)}")
-            self.status_label.configure(text="Fehler aufgetreten", text_color=Colors.ERROR)
-            messagebox.showerror("Fehler", f"Fehler bei der Migration: {str(e)}")
+            self.set_status("Fehler aufgetreten", Colors.ERROR)
+            self.ui_events.call(messagebox.showerror, "Fehler", f"Fehler bei der Migration: {str(e)}")
 
         finally:
             self.is_running = False
-            self.start_btn.configure(state="normal")
-            self.stop_btn.configure(state="disabled")
+            if self.applier is not None:
+                self.applier.journal.close()
+            self.ui_events.call(lambda: self.start_btn.configure(state="normal"))
+            self.ui_events.call(lambda: self.stop_btn.configure(state="disabled"))
 
     def stop_apply(self):
         """Migration stoppen"""
-        self.is_running = False
+        # Laufende Befehle (netsh, route, wmic ...) werden sofort beendet
+        self.cancel_token.cancel()
         self.stop_btn.configure(state="disabled")
-        self.status_label.configure(text="Wird gestoppt...", text_color=Colors.ERROR)
+        self.set_status("Wird gestoppt...", Colors.ERROR)
         self.log("\n⚠️ Stopp angefordert...")
 
     def log(self, message: str):
-        """Log-Nachricht hinzufügen"""
-        self.log_box.configure(state="normal")
-        self.log_box.insert("end", message + "\n")
-        self.log_box.see("end")
-        self.log_box.configure(state="disabled")
-        self.update_idletasks()
+        """Log-Nachricht hinzufügen (aus jedem Thread aufrufbar)"""
+        self.ui_events.log(message)
+
+    def set_status(self, text: str, color: str = None):
+        """Statuszeile setzen (aus jedem Thread aufrufbar)"""
+        self.ui_events.status(text, color)
+
+    def _drain_ui_events(self):
+        """Wartende Log-Zeilen, Status und Fortschritt gesammelt anzeigen (einmal pro Frame)"""
+        try:
+            batch = self.ui_events.drain()
+            if batch.lines:
+                self.log_spool.write(batch.lines)
+                text = "\n".join(batch.lines) + "\n"
+                self.log_box.configure(state="normal")
+                self.log_box.insert("end", text)
+                # Ringpuffer: älteste Zeilen verwerfen, das vollständige Log liegt in der Logdatei
+                self._log_line_count += text.count("\n")
+                excess = self._log_line_count - MAX_LOG_LINES
+                if excess > 0:
+                    self.log_box.delete("1.0", f"{excess + 1}.0")
+                    self._log_line_count -= excess
+                self.log_box.see("end")
+                self.log_box.configure(state="disabled")
+            if batch.status:
+                text, color = batch.status
+                if color:
+                    self.status_label.configure(text=text, text_color=color)
+                else:
+                    self.status_label.configure(text=text)
+            if batch.progress is not None:
+                self.progress_bar.set(batch.progress)
+            for func, args in batch.calls:
+                func(*args)
+        finally:
+            self.after(FRAME_MS, self._drain_ui_events)
 
     def start_mobackup(self):
         """MoBackup starten"""
@@ -452,7 +599,11 @@ class ApplyGUI(ctk.CTk):
             response = messagebox.askyesno("Beenden?", "Migration läuft noch. Wirklich beenden?")
             if not response:
                 return
-            self.is_running = False
+            self.cancel_token.cancel()
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+        self.log_spool.write(self.ui_events.drain().lines)
+        self.log_spool.close()
         self.quit()
 
 
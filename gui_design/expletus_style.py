@@ -4,9 +4,11 @@ eXpletus Style-Konfiguration
 Gemeinsame Optik für alle eXpletus-Tools (COLLECT, APPLY, etc.)
 """
 
+import hashlib
+import os
+import platform
 import customtkinter as ctk
 from pathlib import Path
-from PIL import Image
 
 # === THEME INITIALISIEREN ===
 def init_theme():
@@ -64,8 +66,15 @@ class Animation:
 
 # === HELPER FUNKTIONEN ===
 
+_logo_path = None
+_logo_memo = {}
+
+
 def get_logo_path():
-    """Gibt den Pfad zum Logo zurück"""
+    """Gibt den Pfad zum Logo zurück (Suche nur beim ersten Aufruf)"""
+    global _logo_path
+    if _logo_path is not None:
+        return _logo_path
     # Versuche verschiedene Pfade
     possible_paths = [
         Path(__file__).parent.parent / "media" / "expletus_1.png",
@@ -74,19 +83,67 @@ def get_logo_path():
     ]
     for p in possible_paths:
         if p.exists():
+            _logo_path = p
             return p
     return None
 
 
+def get_asset_cache_dir():
+    """Gibt das gemeinsame Cache-Verzeichnis aller eXpletus-Tools zurück"""
+    if platform.system() == 'Windows':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+        return Path(base) / 'eXpletus' / 'assets'
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'expletus-assets'
+
+
+def _resized_asset(source, height):
+    """
+    Gibt das Bild in der gewünschten Höhe als PIL-Image zurück
+
+    Skalierte Varianten liegen im Asset-Cache, Dateiname aus Inhalts-Hash der
+    Quelle und Zielhöhe. Nur beim ersten Mal wird skaliert (LANCZOS).
+    """
+    from PIL import Image
+
+    data = source.read_bytes()
+    digest = hashlib.sha1(data).hexdigest()[:16]
+    cached = get_asset_cache_dir() / f"{source.stem}_{digest}_{height}.png"
+    try:
+        img = Image.open(cached)
+        img.load()
+        return img
+    except (OSError, ValueError):
+        pass
+
+    from io import BytesIO
+    img = Image.open(BytesIO(data))
+    w = int(img.width * (height / img.height))
+    img = img.resize((w, height), Image.Resampling.LANCZOS)
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix('.tmp')
+        img.save(tmp, format='PNG')
+        os.replace(tmp, cached)
+    except OSError:
+        # Ohne Cache geht es auch, nur langsamer
+        pass
+    return img
+
+
 def load_logo(height=36):
-    """Lädt das Logo mit korrektem Seitenverhältnis"""
+    """Lädt das Logo mit korrektem Seitenverhältnis (einmal pro Prozess und Höhe)"""
     logo_path = get_logo_path()
-    if logo_path and logo_path.exists():
-        img = Image.open(logo_path)
-        w = int(img.width * (height / img.height))
-        img = img.resize((w, height), Image.Resampling.LANCZOS)
-        return ctk.CTkImage(light_image=img, dark_image=img, size=(w, height))
-    return None
+    if not logo_path:
+        return None
+    key = (str(logo_path), height)
+    if key not in _logo_memo:
+        try:
+            img = _resized_asset(logo_path, height)
+        except OSError:
+            return None
+        _logo_memo[key] = ctk.CTkImage(light_image=img, dark_image=img, size=(img.width, height))
+    return _logo_memo[key]
 
 
 def create_header(parent, title, version, show_logo=True):
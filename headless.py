@@ -0,0 +1,323 @@
+"""
+Headless Mode
+Command line entry point for scripted rollouts (no GUI modules are imported)
+"""
+import argparse
+import signal
+import sys
+from typing import List, Optional
+
+from apply_journal import Journal
+from apply_scheduler import ApplyScheduler, build_graph
+from backup_store import BackupStore
+from cancellation import CancelToken, DEFAULT_COMMAND_TIMEOUT
+from collect_parser import CollectParser
+from config_applier import ConfigApplier
+from network_state import NetworkState
+from parse_cache import ParseCache
+from resume import ResumeState, finish_run, register_resume, track_run, unregister_resume
+from selection import BUILTIN_PROFILES, ProfileStore
+from step_timing import format_timing_table
+
+DEFAULT_PROFILE = BUILTIN_PROFILES[0].name
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line interface of 'main.py'"""
+    parser = argparse.ArgumentParser(prog='main.py', description="eXpletus APPLY")
+    commands = parser.add_subparsers(dest='command')
+
+    apply_cmd = commands.add_parser('apply', help="COLLECT-Datei ohne GUI anwenden")
+    apply_cmd.add_argument('file', help="COLLECT-Datei (JSON)")
+    apply_cmd.add_argument('--profile', default=DEFAULT_PROFILE,
+                           help=f"Auswahlprofil (Standard: '{DEFAULT_PROFILE}')")
+    apply_cmd.add_argument('--dry-run', action='store_true', help="Nur simulieren, nichts ändern")
+    apply_cmd.add_argument('--no-backup', action='store_true', help="Kein Backup vor Änderungen erstellen")
+    apply_cmd.add_argument('--workers', type=int, default=None, help="Anzahl paralleler Worker")
+    apply_cmd.add_argument('--timeout', type=float, default=DEFAULT_COMMAND_TIMEOUT,
+                           help=f"Timeout je externem Befehl in Sekunden, 0 = unbegrenzt "
+                                f"(Standard: {DEFAULT_COMMAND_TIMEOUT})")
+    apply_cmd.add_argument('--trace', metavar='DATEI',
+                           help="Zeitprofil als Chrome-Trace (JSON) speichern")
+
+    resume_cmd = commands.add_parser('resume', help="Unterbrochenen Lauf fortsetzen (z.B. nach Neustart)")
+    resume_cmd.add_argument('--store', default=None, help="Backup-Ablage (Standard: APPLY_Backup)")
+    resume_cmd.add_argument('--trace', metavar='DATEI',
+                            help="Zeitprofil als Chrome-Trace (JSON) speichern")
+
+    commands.add_parser('profiles', help="Verfügbare Auswahlprofile anzeigen")
+
+    rollback_cmd = commands.add_parser('rollback', help="Änderungen eines Laufs rückgängig machen")
+    rollback_cmd.add_argument('run_id', nargs='?', help="Lauf-ID (Standard: letzter Lauf mit Journal)")
+    rollback_cmd.add_argument('--store', default=None, help="Backup-Ablage (Standard: APPLY_Backup)")
+    rollback_cmd.add_argument('--dry-run', action='store_true', help="Nur anzeigen, was zurückgesetzt würde")
+    rollback_cmd.add_argument('--timeout', type=float, default=DEFAULT_COMMAND_TIMEOUT,
+                              help=f"Timeout je externem Befehl in Sekunden (Standard: {DEFAULT_COMMAND_TIMEOUT})")
+
+    backups_cmd = commands.add_parser('backups', help="Backups anzeigen, aufräumen oder entpacken")
+    backups_cmd.add_argument('--store', default=None, help="Backup-Ablage (Standard: APPLY_Backup)")
+    backups_actions = backups_cmd.add_subparsers(dest='action')
+    backups_actions.add_parser('list', help="Backups mit Einträgen anzeigen")
+    gc_cmd = backups_actions.add_parser('gc', help="Nicht mehr referenzierte Daten löschen")
+    gc_cmd.add_argument('--keep', type=int, default=None, help="Nur die neuesten N Backups behalten")
+    extract_cmd = backups_actions.add_parser('extract', help="Backup als einzelne Dateien ausgeben")
+    extract_cmd.add_argument('run_id', help="Backup-ID (siehe 'backups list')")
+    extract_cmd.add_argument('target', help="Zielordner")
+    network_cmd = backups_actions.add_parser('network', help="Gesicherten Netzwerkzustand vergleichen "
+                                                             "oder wiederherstellen")
+    network_cmd.add_argument('run_id', help="Backup-ID (siehe 'backups list')")
+    network_cmd.add_argument('--restore', action='store_true', help="Abweichende Adapter zurücksetzen")
+    network_cmd.add_argument('--interface', action='append', help="Nur diesen Adapter (mehrfach möglich)")
+    network_cmd.add_argument('--dry-run', action='store_true', help="Nur anzeigen, was geändert würde")
+    return parser
+
+
+def _load_collect(path: str) -> Optional[CollectParser]:
+    print(f"Lade Datei: {path}")
+    parser = CollectParser(path, cache=ParseCache())
+    if not parser.load():
+        print("✗ Fehler beim Laden der Datei", file=sys.stderr)
+        return None
+    print(f"✓ Datei geladen (Format: {parser.get_schema()})")
+    return parser
+
+
+def run_apply(args: argparse.Namespace) -> int:
+    """
+    Apply a COLLECT file with the items of one profile
+
+    Returns:
+        Exit code: 0 on success, 1 if any item failed, 2 on usage errors,
+        130 if interrupted with Ctrl+C
+    """
+    profile = ProfileStore().get(args.profile)
+    if profile is None:
+        print(f"✗ Unbekanntes Profil: {args.profile}", file=sys.stderr)
+        return 2
+
+    parser = _load_collect(args.file)
+    if parser is None:
+        return 2
+
+    selected = [(category, item_key, item_value)
+                for category, item_key, item_value in parser.model.iter_items()
+                if profile.matches(category, f"{category}.{item_key}")]
+    mode = "Dry Run (Simulation)" if args.dry_run else "ECHTE ÄNDERUNGEN"
+    print(f"Profil '{profile.name}': {len(selected)} Konfigurationen, Modus: {mode}")
+
+    token = CancelToken()
+    applier = ConfigApplier(dry_run=args.dry_run, create_backup=not args.no_backup,
+                            cancel_token=token, command_timeout=args.timeout or None)
+    state = track_run(applier, args.file, [f"{category}.{item_key}" for category, item_key, _ in selected],
+                      workers=args.workers)
+    return _execute(applier, token, selected, args.workers, args.trace, state)
+
+
+def run_resume(args: argparse.Namespace) -> int:
+    """
+    Continue the unfinished run of a backup store (e.g. after a reboot)
+
+    Items the journal records as done are skipped.
+
+    Returns:
+        Exit code like ``run_apply``
+    """
+    store = BackupStore(args.store)
+    state = ResumeState.load(store)
+    # Ein manueller Aufruf ersetzt den noch ausstehenden Start bei der Anmeldung
+    unregister_resume()
+    if state is None:
+        print("Kein unterbrochener Lauf vorhanden")
+        return 0
+
+    print(f"Setze Lauf {state.run_id} fort (gestartet {state.created})")
+    parser = _load_collect(state.collect_file)
+    if parser is None:
+        return 2
+
+    done = Journal.completed_items(str(store.journal_path(state.run_id)))
+    wanted = set(state.selected_keys) - done
+    selected = [(category, item_key, item_value)
+                for category, item_key, item_value in parser.model.iter_items()
+                if f"{category}.{item_key}" in wanted]
+    print(f"{len(done & set(state.selected_keys))} bereits erledigt, {len(selected)} verbleibend")
+
+    state.resumes += 1
+    state.save(store)
+    token = CancelToken()
+    applier = ConfigApplier(create_backup=state.create_backup, cancel_token=token,
+                            command_timeout=state.command_timeout, backup_store=store,
+                            run_id=state.run_id)
+    register_resume(store)
+    return _execute(applier, token, selected, state.workers, args.trace, state)
+
+
+def _execute(applier: ConfigApplier, token: CancelToken, selected: list, workers: Optional[int],
+             trace: Optional[str], state: Optional[ResumeState]) -> int:
+    """Run the selected items, print the summary and keep or clear the resume state"""
+
+    def on_done(result):
+        if not result.skipped:
+            mark = "✓" if result.success else "✗"
+            print(f"  {mark} {result.task.config_key}: {result.message}", flush=True)
+            applier.journal.item_done(result.task.config_key, result.success)
+
+    def on_interrupt(signum, frame):
+        # Laufende Befehle beenden statt auf sie zu warten
+        print("\n⚠️ Abbruch angefordert...", file=sys.stderr, flush=True)
+        token.cancel()
+
+    previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+    try:
+        applier.preflight()
+        scheduler_args = {'max_workers': workers} if workers else {}
+        scheduler = ApplyScheduler(applier.apply_configuration, batch_func=applier.apply_batch,
+                                   should_continue=lambda: not token.cancelled,
+                                   on_done=on_done, **scheduler_args)
+        results = scheduler.run(build_graph(selected, ConfigApplier.BATCH_CATEGORIES))
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        applier.journal.close()
+
+    summary = applier.get_summary()
+    # Nicht jeder Fehlschlag landet in applier.errors (z.B. unbekannte Kategorien)
+    failed = sum(1 for result in results if not result.success and not result.skipped)
+    print(f"Erfolgreich: {summary['applied_count']}, Fehler: {summary['error_count']}, "
+          f"Abgebrochen: {summary['aborted_count']}, Fehlgeschlagene Konfigurationen: {failed}")
+    if summary['file_copy']:
+        print(f"Dateien kopiert: {summary['file_copy']}")
+    if summary['backup_manifest']:
+        print(f"Backup: {summary['backup_manifest']}")
+    if summary['journal']:
+        print(f"Journal: {summary['journal']} (rückgängig: main.py rollback)")
+    if summary['timings']:
+        print("Zeiten je Kategorie:")
+        for line in format_timing_table(summary['timings']):
+            print(f"  {line}")
+    if trace:
+        applier.timings.save_trace(trace)
+        print(f"Zeitprofil: {trace}")
+    pending = finish_run(applier, state)
+    if pending:
+        print(f"⚠️ {pending}")
+    elif summary['reboot_required']:
+        print("⚠️ Neustart erforderlich, damit Hostname/Arbeitsgruppe wirksam werden")
+    if token.cancelled:
+        return 130
+    return 1 if failed or summary['error_count'] else 0
+
+
+def list_profiles() -> int:
+    for name in ProfileStore().names():
+        print(name)
+    return 0
+
+
+def run_rollback(args: argparse.Namespace) -> int:
+    """Undo the journaled changes of a run; exit code 1 if anything could not be undone"""
+    store = BackupStore(args.store)
+    journals = store.journals()
+    run_id = args.run_id or (journals[-1] if journals else None)
+    if run_id is None or run_id not in journals:
+        print(f"✗ Kein Journal gefunden: {run_id or store.journal_dir}", file=sys.stderr)
+        return 2
+
+    print(f"Rollback von Lauf {run_id}{' (Dry Run)' if args.dry_run else ''}")
+    token = CancelToken()
+    applier = ConfigApplier(dry_run=args.dry_run, create_backup=False, cancel_token=token,
+                            command_timeout=args.timeout or None, backup_store=store)
+    previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: token.cancel())
+    try:
+        results = applier.rollback(str(store.journal_path(run_id)))
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    for entry, success, message in results:
+        print(f"  {'✓' if success else '✗'} {entry.kind} {entry.key}: {message}")
+    failed = sum(1 for _, success, _ in results if not success)
+    print(f"Zurückgesetzt: {len(results) - failed}, Fehler: {failed}")
+    if not results:
+        print("Nichts zurückzusetzen")
+    return 1 if failed else 0
+
+
+def run_backups(args: argparse.Namespace) -> int:
+    """List, garbage-collect or extract backups of the backup store"""
+    store = BackupStore(args.store)
+    if args.action == 'gc':
+        if args.keep is not None:
+            for run_id in store.prune(args.keep):
+                print(f"Entfernt: {run_id}")
+        removed, freed = store.gc()
+        print(f"{removed} Blöcke gelöscht, {freed / 1024:.1f} KB freigegeben")
+        return 0
+    if args.action == 'extract':
+        if args.run_id not in store.runs():
+            print(f"✗ Unbekanntes Backup: {args.run_id}", file=sys.stderr)
+            return 2
+        for path in store.load_run(args.run_id).extract(args.target):
+            print(path)
+        return 0
+
+    if args.action == 'network':
+        return _backup_network(store, args)
+
+    for run_id in store.runs():
+        run = store.load_run(run_id)
+        size = sum(entry['size'] for entry in run.entries.values())
+        print(f"{run_id}  {run.created}  {len(run.entries)} Einträge, {size / 1024:.1f} KB")
+    usage = store.usage()
+    print(f"Ablage {store.root}: {usage['runs']} Backups, {usage['chunks']} Blöcke, "
+          f"{usage['bytes'] / 1024:.1f} KB belegt")
+    return 0
+
+
+def _backup_network(store: BackupStore, args: argparse.Namespace) -> int:
+    """Compare the network state of a backup with the current one and optionally restore it"""
+    if args.run_id not in store.runs() or 'network_state.json' not in store.load_run(args.run_id).entries:
+        print(f"✗ Kein Netzwerkzustand im Backup: {args.run_id}", file=sys.stderr)
+        return 2
+    saved = NetworkState.from_dict(store.load_run(args.run_id).get_json('network_state.json'))
+    current = NetworkState.capture()
+    if current is None:
+        print("✗ Aktueller Netzwerkzustand nicht abfragbar (nur Windows)", file=sys.stderr)
+        return 2
+
+    changes = saved.diff(current)
+    wanted = {name.lower() for name in args.interface} if args.interface else None
+    for name, fields in changes.items():
+        if wanted is not None and name.lower() not in wanted:
+            continue
+        print(name)
+        for field, (before, now) in fields.items():
+            print(f"  {field}: {before} (Backup) -> {now} (jetzt)")
+    if not changes:
+        print("Netzwerk entspricht dem Backup")
+    if not args.restore or not changes:
+        return 0
+
+    applier = ConfigApplier(dry_run=args.dry_run, backup_store=store, cancel_token=CancelToken())
+    try:
+        results = applier.restore_network(saved, args.interface)
+    finally:
+        applier.journal.close()
+    for name, success, message in results:
+        print(f"  {'✓' if success else '✗'} {message}")
+    return 1 if any(not success for _, success, _ in results) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a headless command; returns the exit code"""
+    args = build_arg_parser().parse_args(argv)
+    if args.command == 'apply':
+        return run_apply(args)
+    if args.command == 'resume':
+        return run_resume(args)
+    if args.command == 'profiles':
+        return list_profiles()
+    if args.command == 'rollback':
+        return run_rollback(args)
+    if args.command == 'backups':
+        return run_backups(args)
+    build_arg_parser().print_help()
+    return 2
@@ -5,8 +5,17 @@ Main entry point
 
 This tool allows you to migrate configurations collected by the COLLECT tool
 to a new hardware/system.
+
+Without arguments the GUI starts. With a command (e.g.
+'python main.py apply --profile "Nur Netzwerk" migration.json') APPLY runs
+headless and never imports the GUI modules.
 """
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from headless import main
+        sys.exit(main(sys.argv[1:]))
+
     from gui import main
     main()
@@ -0,0 +1,215 @@
+"""
+Network State
+IPv4 configuration of all network adapters: captured in one query, diffed and restored in bulk
+"""
+import json
+import platform
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+# PowerShell-Teil, der $interfaces für alle Adapter füllt (auch Teil der Systemzustand-Abfrage)
+ADAPTER_QUERY = r"""
+$names = @{}
+Get-NetAdapter | ForEach-Object { $names[[int]$_.InterfaceIndex] = $_.Name }
+$metrics = @{}
+Get-NetIPInterface -AddressFamily IPv4 | ForEach-Object {
+  $metrics[[int]$_.InterfaceIndex] = @{ metric = $_.InterfaceMetric; auto = $_.AutomaticMetric -eq 'Enabled' } }
+$interfaces = @(Get-CimInstance Win32_NetworkAdapterConfiguration -Filter 'IPEnabled=True' | ForEach-Object {
+  $params = Get-ItemProperty "HKLM:\SYSTEM\CurrentControlSet\Services\Tcpip\Parameters\Interfaces\$($_.SettingID)"
+  $metric = $metrics[[int]$_.InterfaceIndex]
+  [pscustomobject]@{
+    name = $names[[int]$_.InterfaceIndex]; description = $_.Description; index = $_.InterfaceIndex
+    mac = $_.MACAddress; ip_addresses = @($_.IPAddress); subnets = @($_.IPSubnet)
+    gateways = @($_.DefaultIPGateway); gateway_metrics = @($_.GatewayCostMetric)
+    dns = @($_.DNSServerSearchOrder); dhcp = [bool]$_.DHCPEnabled; dns_static = [bool]$params.NameServer
+    metric = $metric.metric; automatic_metric = [bool]$metric.auto
+  } })
+"""
+
+NETWORK_SCRIPT = r"""
+$ErrorActionPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [Text.Encoding]::UTF8
+""" + ADAPTER_QUERY + r"""
+ConvertTo-Json -InputObject $interfaces -Depth 3 -Compress
+"""
+
+
+def _ipv4(value: str) -> bool:
+    return bool(value) and ':' not in value
+
+
+def compact_adapter(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce the raw WMI data of one adapter to its restorable IPv4 state
+
+    Already compact data is returned unchanged, so journal entries of
+    both forms can be restored.
+    """
+    if 'addresses' in raw:
+        return raw
+    addresses = [[address, subnet] for address, subnet in
+                 zip(raw.get('ip_addresses') or [], raw.get('subnets') or []) if _ipv4(address)]
+    gateway_metrics = list(raw.get('gateway_metrics') or [])
+    gateways = [[gateway, gateway_metrics[idx] if idx < len(gateway_metrics) else None]
+                for idx, gateway in enumerate(raw.get('gateways') or []) if _ipv4(gateway)]
+    dhcp = bool(raw.get('dhcp'))
+    # Ohne Angabe (ältere Abfrage) gelten DNS-Server bei statischer Adresse als statisch
+    dns_static = raw.get('dns_static')
+    if dns_static is None:
+        dns_static = not dhcp
+    return {
+        'dhcp': dhcp,
+        'addresses': addresses,
+        'gateways': gateways,
+        'dns_static': bool(dns_static),
+        'dns': [dns for dns in raw.get('dns') or [] if _ipv4(dns)],
+        'metric': raw.get('metric'),
+        'automatic_metric': raw.get('automatic_metric', True) is not False,
+        'mac': raw.get('mac') or '',
+    }
+
+
+def restore_lines(name: str, adapter: Dict[str, Any]) -> List[str]:
+    """
+    netsh script lines that bring one adapter back to ``adapter``
+
+    Args:
+        name: Adapter name
+        adapter: Compact adapter state (see ``compact_adapter``)
+    """
+    lines = []
+    if adapter.get('dhcp'):
+        lines.append(f'interface ip set address name="{name}" dhcp')
+    elif adapter.get('addresses'):
+        (address, subnet), *more = adapter['addresses']
+        # WMI meldet eine automatische Gateway-Metrik als 0
+        gateways = [(gateway, metric or 'automatic') for gateway, metric in adapter.get('gateways') or []]
+        first_gateway = f'{gateways[0][0]} {gateways[0][1]}' if gateways else 'none'
+        lines.append(f'interface ip set address name="{name}" static {address} {subnet} {first_gateway}')
+        for address, subnet in more:
+            lines.append(f'interface ip add address name="{name}" {address} {subnet}')
+        for gateway, gwmetric in gateways[1:]:
+            lines.append(f'interface ip add address name="{name}" gateway={gateway} gwmetric={gwmetric}')
+
+    dns_servers = adapter.get('dns') or []
+    if not adapter.get('dns_static'):
+        lines.append(f'interface ip set dns name="{name}" dhcp')
+    elif not dns_servers:
+        lines.append(f'interface ip set dns name="{name}" static none')
+    else:
+        for idx, dns in enumerate(dns_servers):
+            if idx == 0:
+                lines.append(f'interface ip set dns name="{name}" static {dns} validate=no')
+            else:
+                lines.append(f'interface ip add dns name="{name}" {dns} index={idx+1} validate=no')
+
+    if not adapter.get('automatic_metric', True) and adapter.get('metric') is not None:
+        lines.append(f'interface ipv4 set interface interface="{name}" metric={adapter["metric"]}')
+    return lines
+
+
+class NetworkState:
+    """
+    Compact IPv4 state of all adapters, keyed by adapter name
+
+    Per adapter: addresses with masks, gateways with metrics, DNS servers in
+    order, DHCP flags for address and DNS, and the interface metric. Only
+    restorable settings are kept and no timestamp, so unchanged states
+    deduplicate in the backup store.
+    """
+
+    def __init__(self, adapters: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.adapters: Dict[str, Dict[str, Any]] = adapters or {}
+
+    @classmethod
+    def from_interfaces(cls, interfaces: List[Dict[str, Any]]) -> 'NetworkState':
+        """Build the state from the raw adapter list of the query"""
+        return cls({iface['name']: compact_adapter(iface) for iface in interfaces if iface.get('name')})
+
+    @classmethod
+    def capture(cls, run=subprocess.run) -> Optional['NetworkState']:
+        """
+        Query all adapters with one PowerShell call
+
+        Args:
+            run: Command runner with the signature of subprocess.run
+
+        Returns:
+            The state, or None if it could not be queried (or not on Windows)
+        """
+        if platform.system() != 'Windows':
+            return None
+        try:
+            result = run(['powershell', '-NoProfile', '-NonInteractive', '-Command', NETWORK_SCRIPT],
+                         capture_output=True, text=True, encoding='utf-8', errors='replace')
+            data = json.loads(result.stdout or '[]')
+        except (OSError, ValueError, subprocess.SubprocessError):
+            return None
+        # ConvertTo-Json liefert bei nur einem Adapter ein Objekt statt einer Liste
+        return cls.from_interfaces([data] if isinstance(data, dict) else data)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NetworkState':
+        return cls({name: compact_adapter(adapter) for name, adapter in (data.get('adapters') or {}).items()})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'adapters': {name: self.adapters[name] for name in sorted(self.adapters)}}
+
+    def adapter(self, name: str) -> Optional[Dict[str, Any]]:
+        """State of an adapter by name (case-insensitive)"""
+        name = (name or '').lower()
+        for adapter_name, adapter in self.adapters.items():
+            if adapter_name.lower() == name:
+                return adapter
+        return None
+
+    def diff(self, other: 'NetworkState') -> Dict[str, Dict[str, Tuple[Any, Any]]]:
+        """
+        Settings that differ from ``other``
+
+        Args:
+            other: State to compare with (e.g. the current one)
+
+        Returns:
+            Adapter name -> {field: (value here, value in other)}; an adapter
+            missing on one side is reported as field 'adapter' with
+            (present here, present in other)
+        """
+        changes = {}
+        for name in sorted(set(self.adapters) | set(other.adapters)):
+            mine, theirs = self.adapters.get(name), other.adapters.get(name)
+            if mine is None or theirs is None:
+                changes[name] = {'adapter': (mine is not None, theirs is not None)}
+                continue
+            fields = {field: (mine.get(field), theirs.get(field))
+                      for field in sorted(set(mine) | set(theirs))
+                      if field != 'mac' and mine.get(field) != theirs.get(field)}
+            if fields:
+                changes[name] = fields
+        return changes
+
+    def restore_lines(self, current: Optional['NetworkState'] = None,
+                      names: Optional[List[str]] = None) -> List[Tuple[str, List[str]]]:
+        """
+        netsh lines that restore this state
+
+        Args:
+            current: Current state; adapters that already match are skipped
+            names: Only these adapters (default: all)
+
+        Returns:
+            List of (adapter name, netsh lines)
+        """
+        changed = self.diff(current) if current is not None else None
+        wanted = {name.lower() for name in names} if names else None
+        result = []
+        for name in sorted(self.adapters):
+            if wanted is not None and name.lower() not in wanted:
+                continue
+            if changed is not None and name not in changed:
+                continue
+            if current is not None and current.adapter(name) is None:
+                # Adapter gibt es nicht mehr (anderer Rechner, Adapter getauscht)
+                continue
+            result.append((name, restore_lines(name, self.adapters[name])))
+        return result
@@ -0,0 +1,147 @@
+"""
+Parse Cache
+Persistent cache for normalized COLLECT files
+"""
+import hashlib
+import os
+import pickle
+import platform
+from pathlib import Path
+from typing import Optional
+
+from collect_schema import CollectModel
+
+# Bei Änderungen am Modell erhöhen, alte Einträge werden dann verworfen
+CACHE_FORMAT = 2
+CACHE_SUFFIX = '.cache'
+
+
+def default_cache_dir() -> Path:
+    """Get the per-user cache directory for APPLY"""
+    if platform.system() == 'Windows':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+        return Path(base) / 'eXpletus' / 'APPLY' / 'cache'
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'expletus-apply'
+
+
+def file_digest(file_path: str) -> str:
+    """Hash the content of a file (BLAKE2b, 1 MB blocks)"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Binary cache of normalized COLLECT files
+
+    Entries are keyed by the absolute path of the source file and are only
+    used if size, mtime and content hash still match. The directory is kept
+    below ``max_bytes`` by evicting the least recently used entries.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Directory for cache entries (default: per-user cache dir)
+            max_bytes: Size cap for all entries together
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, file_path: str) -> Path:
+        key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, file_path: str) -> Optional[CollectModel]:
+        """
+        Get the cached model for a file
+
+        Returns:
+            The model, or None if there is no valid entry (invalid or
+            unreadable entries are removed)
+        """
+        entry_path = self._entry_path(file_path)
+        try:
+            stat = os.stat(file_path)
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                ValueError, TypeError, IndexError):
+            return None
+
+        if (not isinstance(entry, dict)
+                or entry.get('format') != CACHE_FORMAT
+                or entry.get('size') != stat.st_size
+                or entry.get('mtime_ns') != stat.st_mtime_ns
+                or entry.get('digest') != file_digest(file_path)):
+            self._remove(entry_path)
+            return None
+
+        try:
+            model = CollectModel.from_dict(entry['model'])
+        except (KeyError, TypeError):
+            self._remove(entry_path)
+            return None
+        # Zugriffszeit für LRU aktualisieren
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return model
+
+    def put(self, file_path: str, model: CollectModel):
+        """Store the model for a file and enforce the size cap"""
+        try:
+            stat = os.stat(file_path)
+            entry = {
+                'format': CACHE_FORMAT,
+                'path': os.path.abspath(file_path),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'digest': file_digest(file_path),
+                'model': model.to_dict(),
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self._entry_path(file_path)
+            tmp_path = entry_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Cache write failed for {file_path}: {e}")
+            return
+        self.prune()
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits ``max_bytes``"""
+        try:
+            entries = [(p.stat().st_mtime, p.stat().st_size, p)
+                       for p in self.cache_dir.glob(f"*{CACHE_SUFFIX}")]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove all cache entries"""
+        for path in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
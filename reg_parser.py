@@ -0,0 +1,405 @@
+"""
+Registry Export Parser
+Reads Windows .reg exports (e.g. albis.reg from COLLECT) into an indexed key tree
+"""
+import codecs
+import mmap
+import os
+import re
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+# Werttypen wie bei winreg
+REG_NONE = 'REG_NONE'
+REG_SZ = 'REG_SZ'
+REG_EXPAND_SZ = 'REG_EXPAND_SZ'
+REG_BINARY = 'REG_BINARY'
+REG_DWORD = 'REG_DWORD'
+REG_MULTI_SZ = 'REG_MULTI_SZ'
+REG_QWORD = 'REG_QWORD'
+
+# hex(<n>) -> Typname; unbekannte Nummern bleiben als 'hex(<n>)' erhalten
+_HEX_TYPES = {
+    '0': REG_NONE,
+    '1': REG_SZ,
+    '2': REG_EXPAND_SZ,
+    '3': REG_BINARY,
+    '4': REG_DWORD,
+    '7': REG_MULTI_SZ,
+    'b': REG_QWORD,
+}
+
+_QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+# Typname -> Nummer für hex(<n>)-Ausgabe
+_TYPE_IDS = {name: type_id for type_id, name in _HEX_TYPES.items()}
+
+REG_HEADER = 'Windows Registry Editor Version 5.00'
+
+# Größe der Blöcke, die aus der gemappten Datei dekodiert werden
+_CHUNK_SIZE = 1024 * 1024
+
+
+class RegValue:
+    """A single registry value"""
+
+    __slots__ = ('name', 'type', 'data')
+
+    def __init__(self, name: str, value_type: Optional[str], data: Any):
+        """
+        Args:
+            name: Value name ('' for the default value '@')
+            value_type: One of the REG_* constants, 'hex(<n>)', or None for a deletion
+            data: str, int, bytes or list of str depending on the type
+        """
+        self.name = name
+        self.type = value_type
+        self.data = data
+
+    @property
+    def deleted(self) -> bool:
+        """True if the export removes this value ("name"=-)"""
+        return self.type is None
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RegValue) and (self.name.lower(), self.type, self.data) == \
+            (other.name.lower(), other.type, other.data)
+
+    def __repr__(self) -> str:
+        return f"RegValue({self.name!r}, {self.type!r}, {self.data!r})"
+
+
+class RegKey:
+    """A registry key with its values and subkeys (names are case-insensitive)"""
+
+    __slots__ = ('name', 'path', 'values', 'subkeys', 'deleted')
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.values: Dict[str, RegValue] = {}
+        self.subkeys: Dict[str, 'RegKey'] = {}
+        self.deleted = False
+
+    def get_value(self, name: str) -> Optional[RegValue]:
+        """Get a value by name ('' or '@' for the default value)"""
+        if name == '@':
+            name = ''
+        return self.values.get(name.lower())
+
+    def child(self, name: str, create: bool = False) -> Optional['RegKey']:
+        """Get (or create) a direct subkey"""
+        lower = name.lower()
+        key = self.subkeys.get(lower)
+        if key is None and create:
+            path = f"{self.path}\\{name}" if self.path else name
+            key = RegKey(name, path)
+            self.subkeys[lower] = key
+        return key
+
+    def walk(self) -> Iterator['RegKey']:
+        """Iterate over this key and all keys below it (depth first)"""
+        stack = [self]
+        while stack:
+            key = stack.pop()
+            yield key
+            stack.extend(reversed(list(key.subkeys.values())))
+
+    def __repr__(self) -> str:
+        return f"RegKey({self.path!r}, values={len(self.values)}, subkeys={len(self.subkeys)})"
+
+
+def split_key_path(path: str) -> List[str]:
+    """Split a key path into its parts, ignoring empty parts"""
+    return [part for part in path.strip().strip('\\').split('\\') if part]
+
+
+def _parse_quoted(line: str, start: int) -> Tuple[str, int]:
+    """Parse a quoted .reg string beginning at line[start] == '"'; returns (text, end index)"""
+    m = _QUOTED_RE.match(line, start)
+    if not m:
+        raise ValueError(f"Unterminated string: {line[:80]}")
+    text = m.group(1)
+    if '\\' in text:
+        text = _ESCAPE_RE.sub(r'\1', text)
+    return text, m.end()
+
+
+def _hex_bytes(text: str) -> bytes:
+    try:
+        return bytes.fromhex(text.replace(',', ' '))
+    except ValueError:
+        # Nicht zweistellige Bytes einzeln umwandeln
+        parts = text.replace(' ', '').replace('\t', '').strip(',')
+        return bytes(int(part, 16) for part in parts.split(',')) if parts else b''
+
+
+def parse_value_data(raw: str) -> Tuple[Optional[str], Any]:
+    """
+    Parse the right-hand side of a value line
+
+    Returns:
+        Tuple of (type, data)
+    """
+    raw = raw.strip()
+    if raw == '-':
+        return None, None
+    if raw.startswith('"'):
+        text, _ = _parse_quoted(raw, 0)
+        return REG_SZ, text
+    lower = raw.lower()
+    if lower.startswith('dword:'):
+        return REG_DWORD, int(raw[6:].strip() or '0', 16)
+    if lower.startswith('hex:'):
+        return REG_BINARY, _hex_bytes(raw[4:])
+    if lower.startswith('hex('):
+        close = raw.index(')')
+        type_id = raw[4:close].lower().lstrip('0') or '0'
+        data = _hex_bytes(raw[close + 2:])
+        value_type = _HEX_TYPES.get(type_id, f"hex({type_id})")
+        if value_type in (REG_SZ, REG_EXPAND_SZ):
+            return value_type, data.decode('utf-16-le', errors='replace').rstrip('\x00')
+        if value_type == REG_MULTI_SZ:
+            text = data.decode('utf-16-le', errors='replace').rstrip('\x00')
+            return value_type, text.split('\x00') if text else []
+        if value_type == REG_QWORD:
+            return value_type, int.from_bytes(data, 'little')
+        if value_type == REG_DWORD:
+            return value_type, int.from_bytes(data, 'little')
+        return value_type, data
+    raise ValueError(f"Unknown value format: {raw[:40]}")
+
+
+def _detect_encoding(head: bytes) -> Tuple[str, int]:
+    """Return (codec, BOM length) for the start of a .reg file"""
+    if head.startswith(codecs.BOM_UTF16_LE):
+        return 'utf-16-le', 2
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8', 3
+    # REGEDIT4-Exporte sind ANSI
+    return 'cp1252', 0
+
+
+def _decode_lines(buf, encoding: str, offset: int) -> Iterator[str]:
+    """Decode the buffer blockwise and yield its physical lines"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    pending = ''
+    size = len(buf)
+    for pos in range(offset, size, _CHUNK_SIZE):
+        pending += decoder.decode(buf[pos:pos + _CHUNK_SIZE], final=pos + _CHUNK_SIZE >= size)
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def _logical_lines(lines: Iterator[str]) -> Iterator[str]:
+    """Join hex continuation lines (trailing backslash) into one line"""
+    logical = ''
+    for line in lines:
+        if logical:
+            line = line.lstrip()
+        if line.endswith('\\'):
+            logical += line[:-1]
+            continue
+        yield logical + line
+        logical = ''
+    if logical:
+        yield logical
+
+
+class RegFile:
+    """Indexed content of a .reg export"""
+
+    def __init__(self):
+        self.root = RegKey('', '')
+        self.header = ''
+        # Kleingeschriebener Pfad -> Schlüssel
+        self._index: Dict[str, RegKey] = {}
+
+    @classmethod
+    def load(cls, file_path: str) -> 'RegFile':
+        """
+        Parse a .reg file
+
+        The file is memory-mapped and decoded in blocks, so large exports
+        are never held as one decoded string.
+
+        Args:
+            file_path: Path to the .reg file
+
+        Returns:
+            Parsed RegFile
+        """
+        reg = cls()
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return reg
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                encoding, offset = _detect_encoding(buf[:4])
+                reg._parse_lines(_logical_lines(_decode_lines(buf, encoding, offset)))
+        return reg
+
+    @classmethod
+    def from_text(cls, text: str) -> 'RegFile':
+        """Parse .reg content that is already decoded"""
+        reg = cls()
+        reg._parse_lines(_logical_lines(iter(text.lstrip('\ufeff').splitlines())))
+        return reg
+
+    def _parse_lines(self, lines: Iterator[str]):
+        current = None
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped.startswith(';'):
+                continue
+            if not self.header and current is None and not stripped.startswith('['):
+                self.header = stripped
+                continue
+            if stripped.startswith('[') and stripped.endswith(']'):
+                path = stripped[1:-1]
+                deleted = path.startswith('-')
+                current = self.add_key(path[1:] if deleted else path)
+                current.deleted = deleted
+                continue
+            if current is None:
+                continue
+            if stripped.startswith('@='):
+                name, rest = '', stripped[2:]
+            elif stripped.startswith('"'):
+                name, end = _parse_quoted(stripped, 0)
+                rest = stripped[end:].lstrip()
+                if not rest.startswith('='):
+                    continue
+                rest = rest[1:]
+            else:
+                continue
+            value_type, data = parse_value_data(rest)
+            current.values[name.lower()] = RegValue(name, value_type, data)
+
+    def add_key(self, path: str) -> RegKey:
+        """Get or create the key for a full path"""
+        parts = split_key_path(path)
+        if not parts:
+            return self.root
+        lower = '\\'.join(parts).lower()
+        key = self._index.get(lower)
+        if key is None:
+            parent = self.add_key('\\'.join(parts[:-1])) if len(parts) > 1 else self.root
+            key = parent.child(parts[-1], create=True)
+            self._index[lower] = key
+        return key
+
+    def drop_index(self, key: RegKey):
+        """Remove a detached key and all keys below it from the path index"""
+        for sub in key.walk():
+            self._index.pop(sub.path.lower(), None)
+
+    def find(self, path: str) -> Optional[RegKey]:
+        """Look up a key by its full path (case-insensitive)"""
+        parts = split_key_path(path)
+        if not parts:
+            return self.root
+        return self._index.get('\\'.join(parts).lower())
+
+    def get_value(self, path: str, name: str) -> Optional[RegValue]:
+        """Look up a value by key path and value name"""
+        key = self.find(path)
+        return key.get_value(name) if key else None
+
+    def iter_prefix(self, prefix: str) -> Iterator[RegKey]:
+        """Iterate over all keys at or below the given key path"""
+        key = self.find(prefix)
+        if key is not None:
+            yield from key.walk()
+
+    def keys(self) -> Iterator[RegKey]:
+        """Iterate over all keys in the file"""
+        for hive in self.root.subkeys.values():
+            yield from hive.walk()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _value_bytes(value: RegValue) -> bytes:
+    """Raw bytes of a value as stored in hex(...) notation"""
+    if value.type in (REG_SZ, REG_EXPAND_SZ):
+        return (value.data + '\x00').encode('utf-16-le')
+    if value.type == REG_MULTI_SZ:
+        return (''.join(part + '\x00' for part in value.data) + '\x00').encode('utf-16-le')
+    if value.type == REG_DWORD:
+        return int(value.data).to_bytes(4, 'little')
+    if value.type == REG_QWORD:
+        return int(value.data).to_bytes(8, 'little')
+    return bytes(value.data or b'')
+
+
+def format_value(value: RegValue) -> str:
+    """Format a value as a (possibly wrapped) .reg line"""
+    prefix = '@=' if value.name == '' else _quote(value.name) + '='
+    if value.deleted:
+        return prefix + '-'
+    if value.type == REG_SZ:
+        return prefix + _quote(value.data)
+    if value.type == REG_DWORD:
+        return prefix + f"dword:{int(value.data):08x}"
+    if value.type == REG_BINARY:
+        prefix += 'hex:'
+    elif value.type in _TYPE_IDS:
+        prefix += f"hex({_TYPE_IDS[value.type]}):"
+    else:
+        prefix += value.type + ':'
+
+    # Wie regedit: nach ca. 80 Zeichen mit Backslash umbrechen
+    lines = []
+    line = prefix
+    octets = [f"{b:02x}" for b in _value_bytes(value)]
+    for i, octet in enumerate(octets):
+        line += octet
+        if i < len(octets) - 1:
+            line += ','
+            if len(line) >= 76:
+                lines.append(line + '\\')
+                line = '  '
+    lines.append(line)
+    return '\r\n'.join(lines)
+
+
+def format_keys(keys: Iterable[RegKey]) -> Iterator[str]:
+    """Yield .reg sections (one string per key) for the keys and their subtrees"""
+    for root in keys:
+        for key in root.walk():
+            lines = [f"[-{key.path}]" if key.deleted else f"[{key.path}]"]
+            if not key.deleted:
+                lines.extend(format_value(value) for value in key.values.values())
+            yield '\r\n'.join(lines) + '\r\n\r\n'
+
+
+def encode_reg_file(sections: Iterable[str]) -> bytes:
+    """Complete UTF-16LE .reg file (BOM, header) from sections produced by format_keys"""
+    return codecs.BOM_UTF16_LE + (REG_HEADER + '\r\n\r\n' + ''.join(sections)).encode('utf-16-le')
+
+
+def write_reg_file(file_path: str, keys: Iterable[RegKey], append: bool = False):
+    """
+    Write keys (with their subtrees) as a UTF-16LE .reg file
+
+    Args:
+        file_path: Target file
+        keys: Root keys to write
+        append: Append to an existing file instead of overwriting it
+    """
+    exists = append and os.path.exists(file_path) and os.path.getsize(file_path) > 0
+    with open(file_path, 'ab' if exists else 'wb') as f:
+        if not exists:
+            f.write(codecs.BOM_UTF16_LE)
+            f.write((REG_HEADER + '\r\n\r\n').encode('utf-16-le'))
+        for section in format_keys(keys):
+            f.write(section.encode('utf-16-le'))
@@ -0,0 +1,207 @@
+"""
+Registry Backends
+Access to the live registry (winreg) or to an in-memory registry for tests
+"""
+import platform
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+from reg_parser import (RegFile, RegKey, RegValue, split_key_path,
+                        REG_NONE, REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD,
+                        REG_MULTI_SZ, REG_QWORD)
+
+# Kurzformen der Hives, wie sie auch 'reg.exe' akzeptiert
+HIVE_ALIASES = {
+    'HKLM': 'HKEY_LOCAL_MACHINE',
+    'HKCU': 'HKEY_CURRENT_USER',
+    'HKCR': 'HKEY_CLASSES_ROOT',
+    'HKU': 'HKEY_USERS',
+    'HKCC': 'HKEY_CURRENT_CONFIG',
+}
+
+
+def normalize_key_path(path: str) -> str:
+    """Expand hive aliases and remove redundant backslashes"""
+    parts = split_key_path(path)
+    if parts:
+        parts[0] = HIVE_ALIASES.get(parts[0].upper(), parts[0].upper())
+    return '\\'.join(parts)
+
+
+def is_same_or_below(path: str, ancestor: str) -> bool:
+    """True if ``path`` equals ``ancestor`` or lies below it (both normalized)"""
+    path, ancestor = path.lower(), ancestor.lower()
+    return path == ancestor or path.startswith(ancestor + '\\')
+
+
+def merge_key_paths(paths: Iterable[str]) -> List[str]:
+    """
+    Reduce key paths to the minimal set of subtree roots
+
+    Paths below another path in the set are dropped, since backing up or
+    exporting the parent already covers them.
+    """
+    merged: List[str] = []
+    # Nach Pfadteilen sortieren: 'ALBIS-Hotline' darf nicht zwischen 'ALBIS' und 'ALBIS\...' liegen
+    for path in sorted({normalize_key_path(p) for p in paths if p},
+                       key=lambda p: p.lower().split('\\')):
+        if not merged or not is_same_or_below(path, merged[-1]):
+            merged.append(path)
+    return merged
+
+
+class RegistryBackend(ABC):
+    """Interface for reading and writing a registry"""
+
+    @abstractmethod
+    def read_tree(self, path: str) -> Optional[RegKey]:
+        """Read the key at ``path`` with all subkeys; None if it does not exist"""
+
+    @abstractmethod
+    def create_key(self, path: str):
+        """Create a key (and missing parents)"""
+
+    @abstractmethod
+    def delete_key(self, path: str):
+        """Delete a key with all subkeys"""
+
+    @abstractmethod
+    def set_value(self, path: str, value: RegValue):
+        """Create or overwrite a value"""
+
+    @abstractmethod
+    def delete_value(self, path: str, name: str):
+        """Delete a value"""
+
+
+class MemoryRegistryBackend(RegistryBackend):
+    """Registry held in memory (for tests and dry runs on any platform)"""
+
+    def __init__(self, reg_file: Optional[RegFile] = None):
+        self.reg = reg_file or RegFile()
+
+    @classmethod
+    def from_text(cls, text: str) -> 'MemoryRegistryBackend':
+        """Create a backend pre-filled from .reg content"""
+        return cls(RegFile.from_text(text))
+
+    def read_tree(self, path: str) -> Optional[RegKey]:
+        return self.reg.find(normalize_key_path(path))
+
+    def create_key(self, path: str):
+        self.reg.add_key(normalize_key_path(path))
+
+    def delete_key(self, path: str):
+        parts = split_key_path(normalize_key_path(path))
+        parent = self.reg.find('\\'.join(parts[:-1]))
+        key = parent.subkeys.pop(parts[-1].lower(), None) if parent else None
+        if key is not None:
+            self.reg.drop_index(key)
+
+    def set_value(self, path: str, value: RegValue):
+        key = self.reg.add_key(normalize_key_path(path))
+        key.values[value.name.lower()] = RegValue(value.name, value.type, value.data)
+
+    def delete_value(self, path: str, name: str):
+        key = self.reg.find(normalize_key_path(path))
+        if key is not None:
+            key.values.pop(name.lower(), None)
+
+
+class WinRegistryBackend(RegistryBackend):
+    """Live Windows registry via winreg (imported when the backend is created)"""
+
+    def __init__(self):
+        import winreg
+        self._winreg = winreg
+        self._types: Dict[int, str] = {
+            winreg.REG_NONE: REG_NONE,
+            winreg.REG_SZ: REG_SZ,
+            winreg.REG_EXPAND_SZ: REG_EXPAND_SZ,
+            winreg.REG_BINARY: REG_BINARY,
+            winreg.REG_DWORD: REG_DWORD,
+            winreg.REG_MULTI_SZ: REG_MULTI_SZ,
+            winreg.REG_QWORD: REG_QWORD,
+        }
+        self._type_ids = {name: type_id for type_id, name in self._types.items()}
+
+    def _split(self, path: str):
+        parts = split_key_path(normalize_key_path(path))
+        hive = getattr(self._winreg, parts[0])
+        return hive, '\\'.join(parts[1:])
+
+    def _to_value(self, name: str, data, type_id: int) -> RegValue:
+        value_type = self._types.get(type_id, f"hex({type_id:x})")
+        if data is None:
+            data = b'' if value_type not in (REG_SZ, REG_EXPAND_SZ) else ''
+        if value_type == REG_MULTI_SZ:
+            data = list(data)
+        return RegValue(name, value_type, data)
+
+    def _from_value(self, value: RegValue):
+        if value.type in self._type_ids:
+            return self._type_ids[value.type], value.data
+        # hex(<n>): unbekannter Typ, Rohdaten schreiben
+        return int(value.type[4:-1], 16), value.data
+
+    def read_tree(self, path: str) -> Optional[RegKey]:
+        winreg = self._winreg
+        hive, sub_path = self._split(path)
+        try:
+            handle = winreg.OpenKey(hive, sub_path, 0, winreg.KEY_READ)
+        except OSError:
+            return None
+
+        full_path = normalize_key_path(path)
+        root = RegKey(split_key_path(full_path)[-1], full_path)
+        stack = [(handle, root)]
+        while stack:
+            handle, key = stack.pop()
+            with handle:
+                subkey_count, value_count, _ = winreg.QueryInfoKey(handle)
+                for i in range(value_count):
+                    name, data, type_id = winreg.EnumValue(handle, i)
+                    key.values[name.lower()] = self._to_value(name, data, type_id)
+                for i in range(subkey_count):
+                    name = winreg.EnumKey(handle, i)
+                    child = key.child(name, create=True)
+                    try:
+                        stack.append((winreg.OpenKey(handle, name, 0, winreg.KEY_READ), child))
+                    except OSError:
+                        # Kein Lesezugriff: Schlüssel ohne Inhalt übernehmen
+                        pass
+        return root
+
+    def create_key(self, path: str):
+        hive, sub_path = self._split(path)
+        self._winreg.CreateKeyEx(hive, sub_path, 0, self._winreg.KEY_WRITE).Close()
+
+    def delete_key(self, path: str):
+        key = self.read_tree(path)
+        if key is None:
+            return
+        # Von unten nach oben löschen, DeleteKey entfernt nur leere Schlüssel
+        for sub in reversed(list(key.walk())):
+            hive, sub_path = self._split(sub.path)
+            self._winreg.DeleteKey(hive, sub_path)
+
+    def set_value(self, path: str, value: RegValue):
+        hive, sub_path = self._split(path)
+        type_id, data = self._from_value(value)
+        with self._winreg.CreateKeyEx(hive, sub_path, 0, self._winreg.KEY_SET_VALUE) as handle:
+            self._winreg.SetValueEx(handle, value.name, 0, type_id, data)
+
+    def delete_value(self, path: str, name: str):
+        hive, sub_path = self._split(path)
+        try:
+            with self._winreg.OpenKey(hive, sub_path, 0, self._winreg.KEY_SET_VALUE) as handle:
+                self._winreg.DeleteValue(handle, name)
+        except FileNotFoundError:
+            pass
+
+
+def get_default_backend() -> RegistryBackend:
+    """Live registry on Windows, an empty in-memory registry elsewhere"""
+    if platform.system() == 'Windows':
+        return WinRegistryBackend()
+    return MemoryRegistryBackend()
@@ -0,0 +1,180 @@
+"""
+Registry Diff
+Compares a collected registry tree with the target system using subtree hashes
+"""
+import hashlib
+from typing import Dict, List, Optional
+
+from reg_parser import RegFile, RegKey, RegValue
+from registry_backend import RegistryBackend, normalize_key_path
+
+ADD = 'add'
+MODIFY = 'modify'
+DELETE = 'delete'
+
+
+class RegChange:
+    """A single change needed to bring the target in line with the collected tree"""
+
+    __slots__ = ('op', 'key_path', 'value_name', 'old', 'new')
+
+    def __init__(self, op: str, key_path: str, value_name: Optional[str] = None,
+                 old: Optional[RegValue] = None, new: Optional[RegValue] = None):
+        """
+        Args:
+            op: ADD, MODIFY or DELETE
+            key_path: Full key path
+            value_name: Affected value, or None if the change concerns the key itself
+            old: Value on the target (MODIFY/DELETE)
+            new: Collected value (ADD/MODIFY)
+        """
+        self.op = op
+        self.key_path = key_path
+        self.value_name = value_name
+        self.old = old
+        self.new = new
+
+    @property
+    def is_key(self) -> bool:
+        return self.value_name is None
+
+    def describe(self) -> str:
+        """Short human-readable description for the log"""
+        target = self.key_path if self.is_key else f"{self.key_path} -> {self.value_name or '@'}"
+        return f"{self.op}: {target}"
+
+    def __repr__(self) -> str:
+        return f"RegChange({self.op!r}, {self.key_path!r}, {self.value_name!r})"
+
+
+class MerkleHasher:
+    """Computes and memoizes a hash over each key's values and subkeys"""
+
+    def __init__(self):
+        self._memo: Dict[int, bytes] = {}
+
+    def digest(self, key: RegKey) -> bytes:
+        """Hash of the key (name-independent) including everything below it"""
+        cached = self._memo.get(id(key))
+        if cached is not None:
+            return cached
+
+        # Iterativ in Post-Order, damit tiefe Bäume keinen Rekursionsfehler auslösen
+        stack = [(key, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in self._memo:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.subkeys.values()
+                             if id(child) not in self._memo)
+                continue
+            h = hashlib.blake2b(digest_size=16)
+            h.update(b'D' if node.deleted else b'K')
+            for name in sorted(node.values):
+                value = node.values[name]
+                h.update(repr((name, value.type, value.data)).encode('utf-8', 'surrogatepass'))
+            for name in sorted(node.subkeys):
+                h.update(name.encode('utf-8', 'surrogatepass'))
+                h.update(self._memo[id(node.subkeys[name])])
+            self._memo[id(node)] = h.digest()
+        return self._memo[id(key)]
+
+
+def diff_trees(collected: Optional[RegKey], live: Optional[RegKey],
+               delete_extra: bool = True) -> List[RegChange]:
+    """
+    Compute the changes that turn ``live`` into ``collected``
+
+    Subtrees with identical hashes on both sides are skipped without being
+    visited. Deletion markers from the export ([-key], "name"=-) become
+    DELETE changes.
+
+    Args:
+        collected: Desired state (key from a RegFile)
+        live: Current state on the target, or None if the key is missing
+        delete_extra: Also delete keys/values that only exist on the target
+
+    Returns:
+        List of changes in key order (parents before children)
+    """
+    changes: List[RegChange] = []
+    if collected is None:
+        return changes
+
+    hasher = MerkleHasher()
+    stack = [(collected, live)]
+    while stack:
+        want, have = stack.pop()
+        path = want.path
+
+        if want.deleted:
+            if have is not None:
+                changes.append(RegChange(DELETE, path))
+            continue
+
+        if have is None:
+            changes.append(RegChange(ADD, path))
+            for value in want.values.values():
+                if not value.deleted:
+                    changes.append(RegChange(ADD, path, value.name, new=value))
+            stack.extend((child, None) for child in reversed(list(want.subkeys.values())))
+            continue
+
+        if hasher.digest(want) == hasher.digest(have):
+            continue
+
+        for name, value in want.values.items():
+            current = have.values.get(name)
+            if value.deleted:
+                if current is not None:
+                    changes.append(RegChange(DELETE, path, current.name, old=current))
+            elif current is None:
+                changes.append(RegChange(ADD, path, value.name, new=value))
+            elif (current.type, current.data) != (value.type, value.data):
+                changes.append(RegChange(MODIFY, path, value.name, old=current, new=value))
+
+        if delete_extra:
+            for name, current in have.values.items():
+                if name not in want.values:
+                    changes.append(RegChange(DELETE, path, current.name, old=current))
+            for name, child in have.subkeys.items():
+                if name not in want.subkeys:
+                    changes.append(RegChange(DELETE, child.path))
+
+        stack.extend((child, have.subkeys.get(name))
+                     for name, child in reversed(list(want.subkeys.items())))
+    return changes
+
+
+def diff_registry(reg_file: RegFile, backend: RegistryBackend, root_path: str,
+                  delete_extra: bool = True) -> List[RegChange]:
+    """
+    Compare the collected subtree at ``root_path`` with the target registry
+
+    Args:
+        reg_file: Parsed collected export
+        backend: Access to the target registry
+        root_path: Key to compare, e.g. 'HKEY_CURRENT_USER\\Software\\ALBIS'
+        delete_extra: Also delete keys/values that only exist on the target
+
+    Returns:
+        Minimal list of changes
+    """
+    root_path = normalize_key_path(root_path)
+    return diff_trees(reg_file.find(root_path), backend.read_tree(root_path), delete_extra)
+
+
+def apply_changes(changes: List[RegChange], backend: RegistryBackend):
+    """Write a change set to the backend in order"""
+    for change in changes:
+        if change.is_key:
+            if change.op == DELETE:
+                backend.delete_key(change.key_path)
+            else:
+                backend.create_key(change.key_path)
+        elif change.op == DELETE:
+            backend.delete_value(change.key_path, change.value_name)
+        else:
+            backend.set_value(change.key_path, change.new)
@@ -0,0 +1,186 @@
+"""
+Resume
+Progress of an unfinished run, resumed automatically at the next logon
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backup_store import BackupStore
+
+# Einmaliger Start nach der nächsten Anmeldung (Windows löscht den Wert vor dem Ausführen)
+RUNONCE_KEY = r'HKCU\Software\Microsoft\Windows\CurrentVersion\RunOnce'
+RUNONCE_VALUE = 'eXpletusAPPLY'
+
+RESUME_FILE = 'resume.json'
+
+
+class ResumeState:
+    """
+    What is needed to continue a run: the COLLECT file, the selected items
+    and the options. Which items are already done is not stored here but
+    read from the run's journal, so progress survives a hard reset.
+    """
+
+    def __init__(self, run_id: str, collect_file: str, selected_keys: List[str],
+                 create_backup: bool = True, workers: Optional[int] = None,
+                 command_timeout: Optional[float] = None, resumes: int = 0,
+                 created: Optional[str] = None):
+        """
+        Args:
+            run_id: Run id in the backup store (journal and backup manifest)
+            collect_file: Absolute path of the COLLECT file
+            selected_keys: Config keys ('<category>.<item>') selected for the run
+            create_backup: Backup option of the run
+            workers: Worker pool size (None = default)
+            command_timeout: Timeout per external command (None = no limit)
+            resumes: How often the run was resumed already
+            created: Start time of the run
+        """
+        self.run_id = run_id
+        self.collect_file = collect_file
+        self.selected_keys = list(selected_keys)
+        self.create_backup = create_backup
+        self.workers = workers
+        self.command_timeout = command_timeout
+        self.resumes = resumes
+        self.created = created or datetime.now().isoformat(timespec='seconds')
+
+    @staticmethod
+    def path(store: BackupStore) -> Path:
+        return store.root / RESUME_FILE
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'run_id': self.run_id, 'collect_file': self.collect_file,
+                'selected_keys': self.selected_keys, 'create_backup': self.create_backup,
+                'workers': self.workers, 'command_timeout': self.command_timeout,
+                'resumes': self.resumes, 'created': self.created}
+
+    def save(self, store: BackupStore):
+        """Write the state (atomically, fsynced: it must survive the reboot)"""
+        path = self.path(store)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, store: BackupStore) -> Optional['ResumeState']:
+        """The unfinished run of this store, or None"""
+        try:
+            with open(cls.path(store), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Could not read resume state from {cls.path(store)}: {e}")
+            return None
+
+    @classmethod
+    def clear(cls, store: BackupStore):
+        try:
+            cls.path(store).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def resume_command(store: BackupStore) -> List[str]:
+    """Command line that resumes the unfinished run of ``store``"""
+    store_path = str(store.root.resolve())
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, 'resume', '--store', store_path]
+    main_py = str(Path(__file__).resolve().with_name('main.py'))
+    return [sys.executable, main_py, 'resume', '--store', store_path]
+
+
+def register_resume(store: BackupStore, run=subprocess.run) -> bool:
+    """
+    Resume the run once at the next logon of this user (Windows RunOnce)
+
+    The console stays open ('cmd /k') so the technician sees the result.
+
+    Args:
+        store: Backup store of the run
+        run: Command runner with the signature of subprocess.run
+
+    Returns:
+        True if registered
+    """
+    if platform.system() != 'Windows':
+        return False
+    command = 'cmd /k "' + subprocess.list2cmdline(resume_command(store)) + '"'
+    result = run(['reg', 'add', RUNONCE_KEY, '/v', RUNONCE_VALUE, '/t', 'REG_SZ', '/d', command, '/f'],
+                 capture_output=True, text=True, errors='replace')
+    return result.returncode == 0
+
+
+def unregister_resume(run=subprocess.run):
+    """Remove a pending RunOnce entry (e.g. when resumed by hand)"""
+    if platform.system() == 'Windows':
+        run(['reg', 'delete', RUNONCE_KEY, '/v', RUNONCE_VALUE, '/f'],
+            capture_output=True, text=True, errors='replace')
+
+
+def track_run(applier, collect_file: str, selected_keys: List[str],
+              workers: Optional[int] = None) -> Optional[ResumeState]:
+    """
+    Make a run resumable before it starts
+
+    Saves the resume state and registers the resume at the next logon, so
+    an unexpected reboot in the middle of the run continues where it stopped.
+    Dry runs are not tracked.
+
+    Args:
+        applier: ConfigApplier of the run
+        collect_file: COLLECT file of the run
+        selected_keys: Config keys of the selected items
+        workers: Worker pool size of the run
+
+    Returns:
+        The saved state, or None for dry runs
+    """
+    if applier.dry_run or applier.store is None:
+        return None
+    state = ResumeState(applier.run_id, os.path.abspath(collect_file), selected_keys,
+                        create_backup=applier.create_backup, workers=workers,
+                        command_timeout=applier.command_timeout)
+    state.save(applier.store)
+    register_resume(applier.store)
+    return state
+
+
+def finish_run(applier, state: Optional[ResumeState]) -> Optional[str]:
+    """
+    Clear or keep the resume state after a run
+
+    A complete run (every selected item succeeded, per journal) removes the
+    state and the logon entry. Otherwise the state is kept; the logon entry
+    only stays if a reboot is pending anyway.
+
+    Returns:
+        Message for the technician, or None if nothing is left to do
+    """
+    if state is None:
+        return None
+    from apply_journal import Journal
+
+    done = Journal.completed_items(str(applier.store.journal_path(state.run_id)))
+    remaining = [key for key in state.selected_keys if key not in done]
+    if not remaining:
+        ResumeState.clear(applier.store)
+        unregister_resume()
+        return None
+    if applier.reboot_required and register_resume(applier.store):
+        return (f"{len(remaining)} Konfigurationen offen. APPLY setzt nach dem Neustart bei der "
+                f"nächsten Anmeldung automatisch fort.")
+    unregister_resume()
+    return f"{len(remaining)} Konfigurationen offen. Fortsetzen mit: main.py resume"
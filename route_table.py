@@ -0,0 +1,126 @@
+"""
+Route Table
+Snapshot of the IPv4 route table, indexed by destination/mask/gateway
+"""
+import re
+import subprocess
+from typing import Dict, Iterable, Optional, Tuple
+
+RouteKey = Tuple[str, str, str]
+
+_IPV4 = r'\d{1,3}(?:\.\d{1,3}){3}'
+_ROW_RE = re.compile(rf'^\s*({_IPV4})\s+({_IPV4})\s+(Auf Verbindung|\S+)(?:\s+(\S+))?(?:\s+(\d+))?\s*$')
+# Überschrift des Abschnitts mit persistenten Routen (englisch/deutsch)
+_PERSISTENT_RE = re.compile(r'persistent|st(?:ä|ae|\W)ndige', re.IGNORECASE)
+_ACTIVE_RE = re.compile(r'active routes|aktive routen', re.IGNORECASE)
+
+
+def route_key(destination: str, mask: str, gateway: str) -> RouteKey:
+    """Normalized index key of a route"""
+    return (destination.strip(), (mask or '255.255.255.255').strip(), (gateway or '').strip().lower())
+
+
+class Route:
+    """A single route table entry"""
+
+    __slots__ = ('destination', 'mask', 'gateway', 'interface', 'metric', 'persistent')
+
+    def __init__(self, destination: str, mask: str, gateway: str,
+                 interface: str = '', metric: Optional[int] = None, persistent: bool = False):
+        self.destination = destination
+        self.mask = mask
+        self.gateway = gateway
+        self.interface = interface
+        self.metric = metric
+        self.persistent = persistent
+
+    @property
+    def key(self) -> RouteKey:
+        return route_key(self.destination, self.mask, self.gateway)
+
+    def __repr__(self) -> str:
+        flag = ', persistent' if self.persistent else ''
+        return f"Route({self.destination} mask {self.mask} via {self.gateway}{flag})"
+
+
+class RouteTable:
+    """
+    Indexed IPv4 route table
+
+    Active and persistent entries for the same destination/mask/gateway are
+    merged into one Route with ``persistent=True``.
+    """
+
+    def __init__(self, routes: Iterable[Route] = ()):
+        self._index: Dict[RouteKey, Route] = {}
+        for route in routes:
+            self.add(route)
+
+    @classmethod
+    def parse(cls, text: str) -> 'RouteTable':
+        """
+        Parse the output of 'route print -4'
+
+        Only the "Active Routes" and "Persistent Routes" sections are read;
+        the interface list at the top is ignored.
+        """
+        table = cls()
+        section = None
+        for line in text.splitlines():
+            if _PERSISTENT_RE.search(line) and ':' in line:
+                section = 'persistent'
+                continue
+            if _ACTIVE_RE.search(line):
+                section = 'active'
+                continue
+            if section is None:
+                continue
+            match = _ROW_RE.match(line)
+            if not match:
+                continue
+            dest, mask, gateway, fourth, fifth = match.groups()
+            if section == 'persistent':
+                # Netzwerkadresse  Netzmaske  Gatewayadresse  Metrik
+                metric = fourth if fourth and fourth.isdigit() else fifth
+                table.add(Route(dest, mask, gateway, metric=int(metric) if metric else None,
+                                persistent=True))
+            else:
+                # Netzwerkziel  Netzwerkmaske  Gateway  Schnittstelle  Metrik
+                table.add(Route(dest, mask, gateway, interface=fourth or '',
+                                metric=int(fifth) if fifth else None))
+        return table
+
+    @classmethod
+    def read(cls, run=subprocess.run) -> 'RouteTable':
+        """
+        Read the current route table of this system (Windows, one 'route print' call)
+
+        Args:
+            run: Command runner with the signature of subprocess.run
+        """
+        result = run(['route', 'print', '-4'], capture_output=True, text=True, errors='replace')
+        return cls.parse(result.stdout)
+
+    def add(self, route: Route):
+        """Insert a route, merging it with an existing entry for the same key"""
+        existing = self._index.get(route.key)
+        if existing is None:
+            self._index[route.key] = route
+            return
+        existing.persistent = existing.persistent or route.persistent
+        existing.interface = existing.interface or route.interface
+        if existing.metric is None:
+            existing.metric = route.metric
+
+    def find(self, destination: str, mask: str, gateway: str) -> Optional[Route]:
+        """Look up a route by destination, mask and gateway"""
+        return self._index.get(route_key(destination, mask, gateway))
+
+    def __contains__(self, key: RouteKey) -> bool:
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
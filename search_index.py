@@ -0,0 +1,89 @@
+"""
+Search Index
+Inverted prefix index for filtering configuration items as you type
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, FrozenSet, List, Optional, Set
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+class SearchIndex:
+    """
+    Maps word prefixes to item numbers
+
+    Every token of an item's texts goes into an inverted index (token ->
+    item numbers). A sorted token list answers prefix queries with a binary
+    search; results per prefix are memoized, so typing one more character
+    only intersects small sets. Single-character prefixes, which match the
+    most tokens, are maintained while indexing.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+        self._initials: Dict[str, Set[int]] = {}
+        self._tokens: List[str] = []
+        self._sorted = True
+        self._memo: Dict[str, FrozenSet[int]] = {}
+
+    def add(self, item: int, *texts: str):
+        """Index the texts of item number ``item``"""
+        for token in {token for text in texts for token in tokenize(text)}:
+            self._initials.setdefault(token[0], set()).add(item)
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = [item]
+                self._sorted = False
+            else:
+                postings.append(item)
+        self._memo.clear()
+
+    def prepare(self):
+        """Sort the token list now instead of on the next query"""
+        if not self._sorted:
+            self._tokens = sorted(self._postings)
+            self._sorted = True
+
+    def _prefix(self, prefix: str) -> FrozenSet[int]:
+        cached = self._memo.get(prefix)
+        if cached is not None:
+            return cached
+        if len(prefix) == 1:
+            result = frozenset(self._initials.get(prefix, ()))
+            self._memo[prefix] = result
+            return result
+        self.prepare()
+        matches = set()
+        for i in range(bisect_left(self._tokens, prefix), len(self._tokens)):
+            token = self._tokens[i]
+            if not token.startswith(prefix):
+                break
+            matches.update(self._postings[token])
+        result = frozenset(matches)
+        self._memo[prefix] = result
+        return result
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """
+        Find items that have a token starting with each word of the query
+
+        Returns:
+            Sorted item numbers, or None for an empty query (no filter)
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+        # Kleinste Treffermenge zuerst schneiden
+        sets = sorted((self._prefix(term) for term in terms), key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return sorted(result)
@@ -0,0 +1,222 @@
+"""
+Selection
+Compact, thread-safe selection state and reusable selection profiles
+"""
+import glob
+import json
+import os
+import platform
+import threading
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Byte -> Positionen der gesetzten Bits
+_BIT_POSITIONS = [tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256)]
+
+
+class SelectionSet:
+    """
+    Bitset of selected item numbers
+
+    One bit per item in a bytearray; bulk operations work on whole bytes.
+    All methods take a lock, so the GUI and worker threads can share it.
+    """
+
+    def __init__(self, size: int = 0, selected: bool = True):
+        self._size = 0
+        self._bits = bytearray()
+        self._lock = threading.Lock()
+        self.extend(size, selected)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _trim(self):
+        # Unbenutzte Bits im letzten Byte immer auf 0 halten (für count/indices)
+        spare = len(self._bits) * 8 - self._size
+        if spare:
+            self._bits[-1] &= 0xFF >> spare
+
+    def extend(self, count: int = 1, selected: bool = True):
+        """Add ``count`` items at the end"""
+        with self._lock:
+            for _ in range(count):
+                if self._size % 8 == 0:
+                    self._bits.append(0)
+                if selected:
+                    self._bits[self._size >> 3] |= 1 << (self._size & 7)
+                self._size += 1
+
+    def get(self, index: int) -> bool:
+        with self._lock:
+            return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def set(self, index: int, selected: bool):
+        with self._lock:
+            if selected:
+                self._bits[index >> 3] |= 1 << (index & 7)
+            else:
+                self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def set_all(self, selected: bool):
+        """Select or clear every item"""
+        with self._lock:
+            self._bits = bytearray(b'\xff' if selected else b'\x00') * len(self._bits)
+            self._trim()
+
+    def select_only(self, indices: Iterable[int]):
+        """Select exactly the given item numbers"""
+        bits = bytearray(len(self._bits))
+        for index in indices:
+            bits[index >> 3] |= 1 << (index & 7)
+        with self._lock:
+            self._bits = bits
+            self._trim()
+
+    def count(self) -> int:
+        """Number of selected items"""
+        with self._lock:
+            return bin(int.from_bytes(self._bits, 'little')).count('1')
+
+    def indices(self) -> List[int]:
+        """Selected item numbers in ascending order"""
+        with self._lock:
+            bits = bytes(self._bits)
+        result = []
+        for byte_index, byte in enumerate(bits):
+            if byte:
+                base = byte_index << 3
+                result.extend(base + bit for bit in _BIT_POSITIONS[byte])
+        return result
+
+
+class SelectionProfile:
+    """
+    Named selection rule, independent of a particular COLLECT file
+
+    An item is selected if its category is in ``categories`` or its config
+    key matches one of ``include`` (shell-style patterns, e.g. 'network.*'),
+    and it matches none of ``exclude``.
+    """
+
+    def __init__(self, name: str, categories: Iterable[str] = (), include: Iterable[str] = (),
+                 exclude: Iterable[str] = (), builtin: bool = False):
+        """
+        Args:
+            name: Display name
+            categories: Categories selected as a whole ('*' for all)
+            include: Config key patterns to select
+            exclude: Config key patterns to leave out
+            builtin: True for profiles shipped with APPLY (not saved or deleted)
+        """
+        self.name = name
+        self.categories = list(categories)
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.builtin = builtin
+
+    @classmethod
+    def from_keys(cls, name: str, config_keys: Iterable[str]) -> 'SelectionProfile':
+        """Profile that selects exactly the given config keys"""
+        return cls(name, include=sorted(glob.escape(key) for key in config_keys))
+
+    def matches(self, category: str, config_key: str) -> bool:
+        """True if the item belongs to this profile"""
+        if any(fnmatchcase(config_key, pattern) for pattern in self.exclude):
+            return False
+        if '*' in self.categories or category in self.categories:
+            return True
+        return any(fnmatchcase(config_key, pattern) for pattern in self.include)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'categories': self.categories,
+                'include': self.include, 'exclude': self.exclude}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SelectionProfile':
+        return cls(data['name'], data.get('categories', ()), data.get('include', ()),
+                   data.get('exclude', ()))
+
+
+BUILTIN_PROFILES = [
+    SelectionProfile("Kompletter ALBIS-Arbeitsplatz", categories=['*'], builtin=True),
+    SelectionProfile("Nur Netzwerk", categories=['network', 'routes', 'network_drives'], builtin=True),
+    SelectionProfile("Nur Standardprogramme",
+                     categories=['default_browser', 'default_pdf', 'default_mail', 'default_word'],
+                     builtin=True),
+]
+
+# Frühere Namen vordefinierter Profile (z.B. in Skripten mit --profile)
+RENAMED_PROFILES = {
+    "Komplette ALBIS-Arbeitsplatz": "Kompletter ALBIS-Arbeitsplatz",
+}
+
+
+def default_profile_path() -> Path:
+    """Get the per-user file for saved selection profiles"""
+    if platform.system() == 'Windows':
+        base = os.environ.get('APPDATA') or Path.home() / 'AppData' / 'Roaming'
+        return Path(base) / 'eXpletus' / 'APPLY' / 'profiles.json'
+    base = os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config'
+    return Path(base) / 'expletus-apply' / 'profiles.json'
+
+
+class ProfileStore:
+    """Built-in profiles plus the user's saved profiles (JSON file)"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Profile file (default: per-user config dir)
+        """
+        self.path = Path(path) if path else default_profile_path()
+        self._saved: Dict[str, SelectionProfile] = {}
+        self.load()
+
+    def load(self):
+        """Read saved profiles; a missing or broken file means no saved profiles"""
+        self._saved = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for entry in data.get('profiles', []):
+                profile = SelectionProfile.from_dict(entry)
+                self._saved[profile.name] = profile
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            print(f"Could not read selection profiles from {self.path}: {e}")
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'profiles': [p.to_dict() for p in self._saved.values()]}, f,
+                      indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def names(self) -> List[str]:
+        """Profile names, built-in ones first"""
+        builtin = [p.name for p in BUILTIN_PROFILES]
+        return builtin + [name for name in self._saved if name not in builtin]
+
+    def get(self, name: str) -> Optional[SelectionProfile]:
+        """Profile by name; former names of built-in profiles are accepted too"""
+        if name not in self._saved:
+            name = RENAMED_PROFILES.get(name, name)
+        for profile in BUILTIN_PROFILES:
+            if profile.name == name:
+                return profile
+        return self._saved.get(name)
+
+    def save(self, profile: SelectionProfile):
+        """Store a profile (replacing one with the same name)"""
+        if any(p.name == profile.name for p in BUILTIN_PROFILES):
+            raise ValueError(f"Profil '{profile.name}' ist vordefiniert und kann nicht überschrieben werden")
+        self._saved[profile.name] = profile
+        self._write()
+
+    def delete(self, name: str):
+        if self._saved.pop(name, None) is not None:
+            self._write()
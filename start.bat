@@ -194,7 +194,7 @@ echo ---------------------------------------------------------------
 echo.
 
 REM Start the application
-!PYTHON_CMD! main.py
+!PYTHON_CMD! main.py %*
 set "EXIT_CODE=!errorlevel!"
 
 if !EXIT_CODE! equ 0 (
@@ -276,7 +276,7 @@ print_status "Starting eXpletus APPLY..."
 print_status "Using Python command: $PYTHON_CMD"
 echo ""
 
-$PYTHON_CMD main.py
+$PYTHON_CMD main.py "$@"
 
 # Capture exit code
 EXIT_CODE=$?
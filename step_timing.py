@@ -0,0 +1,205 @@
+"""
+Step Timing
+Wall-clock timing of applier steps and the external commands they spawn
+"""
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from cancellation import OperationCancelled
+
+
+class CommandTiming:
+    """One external command: duration, exit code and output size"""
+
+    def __init__(self, args, start: float, retry: bool = False):
+        self.args = [str(arg) for arg in args]
+        self.start = start
+        self.duration = 0.0
+        self.returncode: Optional[int] = None
+        self.output_bytes = 0
+        self.retry = retry
+        self.outcome = 'ok'
+        self.thread = threading.get_ident()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.args[0]) if self.args else ''
+
+    def set_result(self, returncode: Optional[int], *outputs):
+        """Store exit code and output size of a finished process"""
+        self.returncode = returncode
+        self.output_bytes = sum(len(out.encode('utf-8', 'replace') if isinstance(out, str) else out)
+                                for out in outputs if out)
+        if returncode:
+            self.outcome = 'error'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'command': self.name, 'args': self.args, 'start': round(self.start, 6),
+                'duration': round(self.duration, 6), 'returncode': self.returncode,
+                'output_bytes': self.output_bytes, 'retry': self.retry, 'outcome': self.outcome}
+
+
+class StepTiming:
+    """One applier call (single item or batch) with the commands it ran"""
+
+    def __init__(self, category: str, items: List[str], start: float):
+        self.category = category
+        self.items = items
+        self.start = start
+        self.duration = 0.0
+        self.success: Optional[bool] = None
+        self.commands: List[CommandTiming] = []
+        self.thread = threading.get_ident()
+
+    @property
+    def retries(self) -> int:
+        return sum(1 for command in self.commands if command.retry)
+
+    @property
+    def label(self) -> str:
+        if not self.items:
+            return self.category
+        if len(self.items) == 1:
+            return f"{self.category}.{self.items[0]}"
+        return f"{self.category} ({len(self.items)} Elemente)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'category': self.category, 'items': self.items, 'start': round(self.start, 6),
+                'duration': round(self.duration, 6), 'success': self.success,
+                'retries': self.retries, 'commands': [c.to_dict() for c in self.commands]}
+
+
+class StepRecorder:
+    """
+    Collects step and command timings of one run
+
+    Steps are opened per thread with ``step()``; commands started on that
+    thread while a step is open are attached to it. Times are seconds since
+    the recorder was created (perf_counter), so they line up across threads.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.steps: List[StepTiming] = []
+        self.commands: List[CommandTiming] = []
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    @contextmanager
+    def step(self, category: str, items: Optional[List[str]] = None):
+        """Time an applier call; yields the StepTiming (set ``success`` on it)"""
+        timing = StepTiming(category, [item for item in (items or []) if item], self._now())
+        parent = getattr(self._local, 'step', None)
+        self._local.step = timing
+        try:
+            yield timing
+        finally:
+            timing.duration = self._now() - timing.start
+            self._local.step = parent
+            with self._lock:
+                self.steps.append(timing)
+
+    @contextmanager
+    def command(self, args, retry: bool = False):
+        """Time an external command; call ``set_result`` on the yielded CommandTiming"""
+        timing = CommandTiming(args, self._now(), retry)
+        try:
+            yield timing
+        except OperationCancelled:
+            timing.outcome = 'cancelled'
+            raise
+        except subprocess.TimeoutExpired as e:
+            timing.set_result(None, e.output, e.stderr)
+            timing.outcome = 'timeout'
+            raise
+        except subprocess.CalledProcessError as e:
+            timing.set_result(e.returncode, e.output, e.stderr)
+            raise
+        except Exception:
+            timing.outcome = 'error'
+            raise
+        finally:
+            timing.duration = self._now() - timing.start
+            step = getattr(self._local, 'step', None)
+            with self._lock:
+                self.commands.append(timing)
+                if step is not None:
+                    step.commands.append(timing)
+
+    def table(self) -> List[Dict[str, Any]]:
+        """
+        Timing table, one row per category, slowest category first
+
+        Returns:
+            List of dicts with category, steps, seconds, max_seconds, slowest,
+            commands, command_seconds, output_bytes, retries and failures
+        """
+        with self._lock:
+            steps = list(self.steps)
+        rows: Dict[str, Dict[str, Any]] = {}
+        for step in steps:
+            row = rows.setdefault(step.category, {
+                'category': step.category, 'steps': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                'slowest': '', 'commands': 0, 'command_seconds': 0.0, 'output_bytes': 0,
+                'retries': 0, 'failures': 0})
+            row['steps'] += 1
+            row['seconds'] += step.duration
+            if step.duration >= row['max_seconds']:
+                row['max_seconds'] = step.duration
+                row['slowest'] = step.label
+            row['commands'] += len(step.commands)
+            row['command_seconds'] += sum(c.duration for c in step.commands)
+            row['output_bytes'] += sum(c.output_bytes for c in step.commands)
+            row['retries'] += step.retries
+            if step.success is False:
+                row['failures'] += 1
+        for row in rows.values():
+            for key in ('seconds', 'max_seconds', 'command_seconds'):
+                row[key] = round(row[key], 3)
+        return sorted(rows.values(), key=lambda row: row['seconds'], reverse=True)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Steps and commands as Chrome trace events (chrome://tracing, Perfetto)"""
+        with self._lock:
+            steps = list(self.steps)
+            commands = list(self.commands)
+        pid = os.getpid()
+        events = []
+        for step in steps:
+            events.append({'name': step.label, 'cat': step.category, 'ph': 'X', 'pid': pid,
+                           'tid': step.thread, 'ts': int(step.start * 1e6), 'dur': int(step.duration * 1e6),
+                           'args': {'success': step.success, 'retries': step.retries}})
+        for command in commands:
+            events.append({'name': command.name, 'cat': 'command', 'ph': 'X', 'pid': pid,
+                           'tid': command.thread, 'ts': int(command.start * 1e6),
+                           'dur': int(command.duration * 1e6),
+                           'args': {'args': ' '.join(command.args), 'returncode': command.returncode,
+                                    'output_bytes': command.output_bytes, 'retry': command.retry,
+                                    'outcome': command.outcome}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'started_at': self.started_at.isoformat()}}
+
+    def save_trace(self, file_path: str):
+        """Write the Chrome trace as JSON"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+
+def format_timing_table(rows: List[Dict[str, Any]]) -> List[str]:
+    """Render timing table rows as fixed-width text lines for the log"""
+    lines = [f"{'Kategorie':<18} {'Schritte':>8} {'Zeit (s)':>9} {'Max (s)':>8} "
+             f"{'Befehle':>7} {'Ausgabe':>9} {'Wdh.':>5}  Langsamster Schritt"]
+    for row in rows:
+        lines.append(f"{row['category']:<18} {row['steps']:>8} {row['seconds']:>9.2f} {row['max_seconds']:>8.2f} "
+                     f"{row['commands']:>7} {row['output_bytes']:>9} {row['retries']:>5}  {row['slowest']}")
+    return lines
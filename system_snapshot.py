@@ -0,0 +1,147 @@
+"""
+System Snapshot
+Current state of the target system, captured once before applying
+"""
+import json
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from network_state import ADAPTER_QUERY, NetworkState
+from route_table import Route, RouteTable
+
+# Eine PowerShell-Abfrage für den gesamten Ist-Zustand (statt je ein Prozess pro Applier)
+SNAPSHOT_SCRIPT = r"""
+$ErrorActionPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [Text.Encoding]::UTF8
+$cs = Get-CimInstance Win32_ComputerSystem
+""" + ADAPTER_QUERY + r"""
+[pscustomobject]@{
+  hostname = $env:COMPUTERNAME
+  domain = $cs.Domain
+  workgroup = $cs.Workgroup
+  part_of_domain = [bool]$cs.PartOfDomain
+  interfaces = $interfaces
+  drives = @(Get-CimInstance Win32_NetworkConnection | ForEach-Object {
+    [pscustomobject]@{ letter = $_.LocalName; unc_path = $_.RemoteName; persistent = [bool]$_.Persistent } })
+  routes = @(Get-CimInstance Win32_IP4RouteTable | ForEach-Object {
+    [pscustomobject]@{ destination = $_.Destination; mask = $_.Mask; gateway = $_.NextHop; metric = $_.Metric1 } })
+  persistent_routes = @(Get-CimInstance Win32_IP4PersistedRouteTable | ForEach-Object {
+    [pscustomobject]@{ destination = $_.Destination; mask = $_.Mask; gateway = $_.NextHop; metric = $_.Metric1 } })
+} | ConvertTo-Json -Depth 4 -Compress
+"""
+
+
+def _ipv4_only(values) -> List[str]:
+    return [v for v in (values or []) if v and ':' not in v]
+
+
+class SystemSnapshot:
+    """
+    Indexed view of hostname, workgroup/domain, interfaces, mapped drives and routes
+
+    Appliers use it to detect settings that are already in place; the raw
+    data is also written to the backup directory.
+    """
+
+    def __init__(self, data: Dict[str, Any], complete: bool = True):
+        """
+        Initialize snapshot
+
+        Args:
+            data: Raw state as returned by the snapshot query
+            complete: False if the query failed and only partial data is known
+        """
+        self.data = data
+        self.complete = complete
+        self.captured_at = data.get('captured_at') or datetime.now().isoformat()
+        self.hostname = data.get('hostname') or ''
+        self.part_of_domain = bool(data.get('part_of_domain'))
+        self.domain = data.get('domain') or ''
+        # Ohne Domäne liefert WMI den Arbeitsgruppennamen in 'Domain'
+        self.workgroup = data.get('workgroup') or ('' if self.part_of_domain else self.domain)
+
+        self.interfaces: Dict[str, Dict[str, Any]] = {}
+        for iface in data.get('interfaces') or []:
+            if iface.get('name'):
+                self.interfaces[iface['name'].lower()] = iface
+
+        # Kompakter IPv4-Zustand aller Adapter (Backup, Vergleich, Wiederherstellung)
+        self.network = NetworkState.from_interfaces(list(self.interfaces.values()))
+
+        self.drives: Dict[str, Dict[str, Any]] = {}
+        for drive in data.get('drives') or []:
+            letter = (drive.get('letter') or '').rstrip(':').upper()
+            if letter:
+                self.drives[letter] = drive
+
+        self.routes = RouteTable()
+        for route in data.get('routes') or []:
+            self.routes.add(Route(route.get('destination', ''), route.get('mask', ''),
+                                  route.get('gateway', ''), metric=route.get('metric')))
+        for route in data.get('persistent_routes') or []:
+            self.routes.add(Route(route.get('destination', ''), route.get('mask', ''),
+                                  route.get('gateway', ''), metric=route.get('metric'),
+                                  persistent=True))
+
+    @classmethod
+    def capture(cls, run=subprocess.run) -> 'SystemSnapshot':
+        """
+        Query the current system state
+
+        On Windows this is a single PowerShell call. If it fails, or on other
+        platforms, only the hostname (and on Windows the route table) is filled
+        in and ``complete`` is False.
+
+        Args:
+            run: Command runner with the signature of subprocess.run
+        """
+        if platform.system() != 'Windows':
+            return cls({'hostname': platform.node()}, complete=False)
+
+        try:
+            result = run(['powershell', '-NoProfile', '-NonInteractive', '-Command', SNAPSHOT_SCRIPT],
+                         capture_output=True, text=True, encoding='utf-8', errors='replace')
+            return cls(json.loads(result.stdout))
+        except (OSError, ValueError, subprocess.SubprocessError):
+            snapshot = cls({'hostname': platform.node()}, complete=False)
+            snapshot.routes = RouteTable.read(run)
+            return snapshot
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Raw state for backups"""
+        return dict(self.data, captured_at=self.captured_at, complete=self.complete)
+
+    def save(self, file_path: str):
+        """Write the snapshot as JSON"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def interface(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the current state of a network interface by name"""
+        return self.interfaces.get((name or '').lower())
+
+    def drive(self, letter: str) -> Optional[Dict[str, Any]]:
+        """Get the current mapping of a drive letter"""
+        return self.drives.get((letter or '').rstrip(':').upper())
+
+    def network_matches(self, config: Dict[str, Any]) -> bool:
+        """True if the interface already has the static address, gateway and DNS order of ``config``"""
+        iface = self.interface(config.get('interface', 'LAN'))
+        if iface is None or iface.get('dhcp'):
+            return False
+        # IPAddress und IPSubnet sind paarweise sortiert (IPv4 vor IPv6)
+        addresses = list(zip(iface.get('ip_addresses') or [], iface.get('subnets') or []))
+        if (config.get('ip_address', ''), config.get('netmask', '')) not in addresses:
+            return False
+        gateway = config.get('gateway', '')
+        gateways = _ipv4_only(iface.get('gateways'))
+        if (gateway and gateway not in gateways) or (not gateway and gateways):
+            return False
+        return _ipv4_only(iface.get('dns')) == list(config.get('dns') or [])
+
+    def drive_matches(self, letter: str, unc_path: str) -> bool:
+        """True if the drive letter is already mapped to ``unc_path``"""
+        drive = self.drive(letter)
+        return drive is not None and (drive.get('unc_path') or '').lower() == (unc_path or '').lower()
@@ -0,0 +1,103 @@
+"""
+Journal replay and rollback planning
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apply_journal import Journal, JournalEntry, plan_rollback  # noqa: E402
+
+
+def _entry(seq, kind, success=True, rolled_back=False):
+    entry = JournalEntry(seq, kind, f"{kind}{seq}", None, None)
+    entry.success = success
+    entry.rolled_back = rolled_back
+    return entry
+
+
+class JournalReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.journal')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_merges_outcome_and_rollback(self):
+        journal = Journal(self.path)
+        first = journal.intent('drive', 'F', None, {'unc_path': '\\\\srv\\daten'})
+        journal.outcome(first, True)
+        second = journal.intent('route', '10.0.0.0', None, {'gateway': '10.0.0.1'})
+        journal.outcome(second, False, 'Zugriff verweigert')
+        journal.rolled_back(first, True)
+        journal.intent('hostname', 'PC', 'ALT', 'NEU')
+        journal.close()
+
+        entries = Journal.read(self.path)
+        self.assertEqual([(e.seq, e.kind, e.success) for e in entries],
+                         [(1, 'drive', True), (2, 'route', False), (3, 'hostname', None)])
+        self.assertTrue(entries[0].rolled_back)
+        self.assertEqual(entries[1].message, 'Zugriff verweigert')
+        self.assertEqual(entries[0].after, {'unc_path': '\\\\srv\\daten'})
+
+    def test_truncated_last_line_is_ignored(self):
+        journal = Journal(self.path)
+        journal.outcome(journal.intent('drive', 'F', None, 'x'), True)
+        journal.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"t": "intent", "seq": 2, "kind": "ro')
+
+        self.assertEqual([e.seq for e in Journal.read(self.path)], [1])
+        # Fortsetzen: nächster Eintrag beginnt in einer neuen Zeile und wird gelesen
+        resumed = Journal(self.path)
+        resumed.intent('route', '10.0.0.0', None, 'y')
+        resumed.close()
+        self.assertEqual([(e.seq, e.kind) for e in Journal.read(self.path)], [(1, 'drive'), (2, 'route')])
+
+    def test_completed_items(self):
+        journal = Journal(self.path)
+        journal.item_done('network.lan', True)
+        journal.item_done('routes.r1', False)
+        journal.item_done('network_drives.F', True)
+        journal.item_done('network_drives.F', False)
+        journal.item_done('routes.r1', True)
+        journal.close()
+        self.assertEqual(Journal.completed_items(self.path), {'network.lan', 'routes.r1'})
+        self.assertEqual(Journal.completed_items(os.path.join(self.tmp.name, 'fehlt')), set())
+
+    def test_journal_without_path_writes_nothing(self):
+        journal = Journal()
+        journal.outcome(journal.intent('drive', 'F', None, 'x'), True)
+        journal.close()
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+class PlanRollbackTest(unittest.TestCase):
+
+    def test_failed_single_commands_are_skipped(self):
+        plan = plan_rollback([_entry(1, 'drive', False), _entry(2, 'route', False),
+                              _entry(3, 'hostname', False), _entry(4, 'workgroup', False)])
+        self.assertEqual(plan, [])
+
+    def test_failed_partial_kinds_are_kept(self):
+        plan = plan_rollback([_entry(1, 'network', False), _entry(2, 'file', False)])
+        self.assertEqual([kind for kind, _ in plan], ['file', 'network'])
+
+    def test_latest_kind_first_and_reverse_within_group(self):
+        entries = [_entry(1, 'network'), _entry(2, 'drive'), _entry(3, 'drive'),
+                   _entry(4, 'route'), _entry(5, 'drive', rolled_back=True)]
+        plan = plan_rollback(entries)
+        self.assertEqual([(kind, [e.seq for e in group]) for kind, group in plan],
+                         [('route', [4]), ('drive', [3, 2]), ('network', [1])])
+
+    def test_unknown_outcome_is_undone(self):
+        plan = plan_rollback([_entry(1, 'drive', None)])
+        self.assertEqual([(kind, [e.seq for e in group]) for kind, group in plan], [('drive', [1])])
+
+
+if __name__ == '__main__':
+    unittest.main()
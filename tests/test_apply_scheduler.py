@@ -0,0 +1,67 @@
+"""
+Dependency order and error handling of ApplyScheduler
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apply_scheduler import ApplyScheduler, build_graph  # noqa: E402
+
+
+def _items():
+    return [('network', 'lan', {}), ('routes', 'r1', {}), ('network_drives', 'F', {}),
+            ('hostname', 'name', {})]
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def run_with_timeout(self, scheduler, tasks):
+        outcome = []
+        worker = threading.Thread(target=lambda: outcome.append(scheduler.run(tasks)), daemon=True)
+        worker.start()
+        worker.join(5)
+        self.assertFalse(worker.is_alive(), "run() kehrt nicht zurück")
+        return outcome[0]
+
+    def test_dependency_order(self):
+        order = []
+        lock = threading.Lock()
+
+        def apply(category, config, item_key):
+            with lock:
+                order.append(category)
+            return True, 'ok'
+
+        results = self.run_with_timeout(ApplyScheduler(apply), build_graph(_items()))
+        self.assertEqual(len(results), 4)
+        self.assertEqual(order[0], 'network')
+        self.assertEqual(order[-1], 'hostname')
+
+    def test_failing_on_done_becomes_item_failure(self):
+        def on_done(result):
+            if result.task.category == 'routes':
+                raise RuntimeError('UI weg')
+
+        scheduler = ApplyScheduler(lambda c, cfg, k: (True, 'ok'), on_done=on_done)
+        results = self.run_with_timeout(scheduler, build_graph(_items()))
+        by_key = {result.task.config_key: result for result in results}
+        self.assertEqual(len(results), 4)
+        self.assertFalse(by_key['routes.r1'].success)
+        self.assertIn('UI weg', by_key['routes.r1'].message)
+        self.assertTrue(by_key['hostname.name'].success)
+
+    def test_every_on_done_failing_still_returns(self):
+        def on_done(result):
+            raise RuntimeError('kaputt')
+
+        scheduler = ApplyScheduler(lambda c, cfg, k: (True, 'ok'), on_done=on_done)
+        results = self.run_with_timeout(scheduler, build_graph(_items()))
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(not result.success for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Deduplication, manifests and cleanup of the backup store
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup_store import CHUNK_SIZE, BackupStore  # noqa: E402
+
+
+class BackupStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BackupStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_chunks_are_stored_once(self):
+        block = os.urandom(CHUNK_SIZE)
+        first = self.store.begin_run('run1')
+        first.put_bytes('a.bin', block * 3)
+        first.put_bytes('b.bin', block + b'Ende')
+        second = self.store.begin_run('run2')
+        second.put_bytes('a.bin', block * 3)
+
+        self.assertEqual(first.entries['a.bin']['chunks'], [first.entries['a.bin']['chunks'][0]] * 3)
+        # block + Rest von b.bin
+        self.assertEqual(self.store.usage()['chunks'], 2)
+        self.assertEqual(second.get_bytes('a.bin'), block * 3)
+
+    def test_put_file_matches_put_bytes(self):
+        data = os.urandom(CHUNK_SIZE * 2 + 123)
+        source = os.path.join(self.tmp.name, 'ALBIS.DAT')
+        with open(source, 'wb') as f:
+            f.write(data)
+        run = self.store.begin_run('run1')
+        run.put_file('datei.dat', source)
+        run.put_bytes('bytes.dat', data)
+        self.assertEqual(run.entries['datei.dat']['chunks'], run.entries['bytes.dat']['chunks'])
+        self.assertEqual(run.entries['datei.dat']['digest'], run.entries['bytes.dat']['digest'])
+
+        target = os.path.join(self.tmp.name, 'zurueck.dat')
+        self.store.load_run('run1').write_file('datei.dat', target)
+        with open(target, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_write_file_detects_damaged_chunk(self):
+        run = self.store.begin_run('run1')
+        run.put_bytes('a.bin', b'original')
+        self.store._chunk_path(run.entries['a.bin']['chunks'][0]).write_bytes(b'kaputt')
+        with self.assertRaises(ValueError):
+            run.write_file('a.bin', os.path.join(self.tmp.name, 'a.bin'))
+
+    def test_manifest_round_trip(self):
+        run = self.store.begin_run('run1')
+        run.put_json('system_snapshot.json', {'hostname': 'PRAXIS-01', 'umlaut': 'Größe'})
+        run.put_text('notiz.txt', 'Zeile 1\nZeile 2')
+        run.put_bytes('leer.bin', b'')
+
+        loaded = self.store.load_run('run1')
+        self.assertEqual(loaded.names(), ['leer.bin', 'notiz.txt', 'system_snapshot.json'])
+        self.assertEqual(loaded.created, run.created)
+        self.assertEqual(loaded.get_json('system_snapshot.json')['umlaut'], 'Größe')
+        self.assertEqual(loaded.get_bytes('notiz.txt'), b'Zeile 1\nZeile 2')
+        self.assertEqual(loaded.get_bytes('leer.bin'), b'')
+
+    def test_begin_run_without_entries_leaves_no_manifest(self):
+        self.store.begin_run('run1')
+        self.assertEqual(self.store.runs(), [])
+
+    def test_prune_and_gc_remove_unreferenced_chunks(self):
+        for idx in range(3):
+            run = self.store.begin_run(f'run{idx}')
+            run.put_bytes('gemeinsam.bin', b'gleich')
+            run.put_bytes('eigen.bin', f'nur in run{idx}'.encode())
+        self.assertEqual(self.store.usage()['chunks'], 4)
+
+        self.assertEqual(self.store.prune(keep=1), ['run0', 'run1'])
+        self.assertEqual(self.store.runs(), ['run2'])
+        # In der Schonfrist bleibt alles liegen
+        self.assertEqual(self.store.gc(), (0, 0))
+        removed, freed = self.store.gc(grace_seconds=-1)
+        self.assertEqual(removed, 2)
+        self.assertEqual(freed, len(b'nur in run0') + len(b'nur in run1'))
+        self.assertEqual(self.store.load_run('run2').get_bytes('eigen.bin'), b'nur in run2')
+
+    def test_gc_keeps_everything_with_unreadable_manifest(self):
+        self.store.begin_run('run1').put_bytes('a.bin', b'daten')
+        self.store.delete_run('run1')
+        self.store.runs_dir.joinpath('kaputt.json').write_text('{', encoding='utf-8')
+        self.assertEqual(self.store.gc(grace_seconds=-1), (0, 0))
+
+    def test_open_run_continues_existing_run(self):
+        self.store.begin_run('run1').put_bytes('vorher.bin', b'vorher')
+        reopened = self.store.open_run('run1')
+        self.assertEqual(reopened.names(), ['vorher.bin'])
+        reopened.put_bytes('danach.bin', b'danach')
+        self.assertEqual(self.store.load_run('run1').names(), ['danach.bin', 'vorher.bin'])
+
+        fresh = self.store.open_run('neu')
+        self.assertEqual(fresh.names(), [])
+        self.assertEqual(fresh.run_id, 'neu')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Timeouts and cancellation of external commands
+"""
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cancellation import CancelToken, OperationCancelled, run_command  # noqa: E402
+
+# Shell mit einem Enkelprozess, der stdout/stderr erbt
+TREE = ['sh', '-c', 'sleep 30 & sleep 30; wait']
+
+
+@unittest.skipIf(platform.system() == 'Windows', "POSIX-Prozessgruppen")
+class RunCommandTest(unittest.TestCase):
+
+    def test_output_and_exit_code(self):
+        result = run_command(['sh', '-c', 'echo hallo; exit 3'], text=True)
+        self.assertEqual((result.returncode, result.stdout), (3, 'hallo\n'))
+
+    def test_cancel_kills_process_group_quickly(self):
+        token = CancelToken()
+        threading.Timer(0.2, token.cancel).start()
+        started = time.monotonic()
+        with self.assertRaises(OperationCancelled):
+            run_command(TREE, token=token)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_timeout_kills_process_group_quickly(self):
+        started = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            run_command(TREE, timeout=0.3)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_cancelled_token_starts_nothing(self):
+        token = CancelToken()
+        token.cancel()
+        with self.assertRaises(OperationCancelled):
+            run_command(['sh', '-c', 'exit 0'], token=token)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Synthetic COLLECT files load through the schema adapters
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collect_generator import generate_collection, generate_reg_text, write_collection  # noqa: E402
+from collect_parser import CollectParser  # noqa: E402
+from reg_parser import RegFile  # noqa: E402
+
+SIZES = {'interfaces': 3, 'routes': 7, 'drives': 5, 'printers': 2, 'software': 4, 'registry_keys': 9}
+
+
+class CollectGeneratorTest(unittest.TestCase):
+
+    def _load(self, schema):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_collection(os.path.join(tmp, 'collect.json'), schema, **SIZES)
+            parser = CollectParser(str(path), streaming=False)
+            self.assertTrue(parser.load())
+            return parser.model
+
+    def test_legacy_counts(self):
+        model = self._load('legacy')
+        self.assertEqual(model.schema, 'legacy')
+        self.assertEqual(len(model.get_category_items('network')), 3)
+        self.assertEqual(len(model.get_category_items('routes')), 7)
+        self.assertEqual(len(model.get_category_items('network_drives')), 5)
+        self.assertEqual(len(model.get_category_items('albis_registry')), 9)
+
+    def test_v26_counts(self):
+        model = self._load('2.6')
+        self.assertEqual(model.schema, '2.6')
+        self.assertEqual(len(model.get_category_items('network')), 3)
+        self.assertEqual(len(model.get_category_items('routes')), 7)
+        self.assertEqual(len(model.get_category_items('network_drives')), 5)
+
+    def test_deterministic(self):
+        self.assertEqual(generate_collection('2.6', seed=3), generate_collection('2.6', seed=3))
+
+    def test_reg_text(self):
+        reg = RegFile.from_text(generate_reg_text(12))
+        values = sum(len(key.values) for key in reg.keys())
+        self.assertEqual(values, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Streaming load mode of CollectParser against json.load
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collect_parser import CollectParser, _index_sections  # noqa: E402
+
+# Zeichen, die den Offset-Scanner stören könnten (Struktur, Escapes, Mehrbyte-UTF-8)
+_TRICKY = ['"', '\\', '{', '}', '[', ']', ',', ':', '\n', '\t', 'ä', 'ß', '€', '\U0001f600', '\\"', ' ']
+
+
+def _random_string(rng: random.Random) -> str:
+    return ''.join(rng.choice(_TRICKY) if rng.random() < 0.3 else rng.choice('abcXYZ019_-. ')
+                   for _ in range(rng.randint(0, 12)))
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randint(0, 7 if depth < 3 else 4)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.choice([True, False])
+    if kind == 2:
+        return rng.randint(-10 ** 6, 10 ** 6)
+    if kind == 3:
+        return rng.uniform(-1e6, 1e6)
+    if kind == 4:
+        return _random_string(rng)
+    if kind == 5:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {_random_string(rng): _random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+def _random_document(rng: random.Random) -> dict:
+    doc = {_random_string(rng): _random_value(rng) for _ in range(rng.randint(0, 4))}
+    if rng.random() < 0.8:
+        doc['configurations'] = {_random_string(rng): _random_value(rng)
+                                 for _ in range(rng.randint(0, 5))}
+    return doc
+
+
+def _encode(rng: random.Random, doc: dict) -> bytes:
+    text = json.dumps(doc, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 1, 2, '\t']),
+                      separators=rng.choice([None, (',', ':'), (' , ', ' : ')]))
+    data = text.encode('utf-8')
+    return (b'\xef\xbb\xbf' + data) if rng.random() < 0.2 else data
+
+
+class StreamingIndexTest(unittest.TestCase):
+
+    def test_matches_json_load_on_random_documents(self):
+        rng = random.Random(20261018)
+        for run in range(300):
+            doc = _random_document(rng)
+            data = _encode(rng, doc)
+            with self.subTest(run=run):
+                sections, children = _index_sections(data)
+                self.assertEqual(list(sections), list(doc))
+                for key, (start, end) in sections.items():
+                    self.assertEqual(json.loads(data[start:end].decode('utf-8')), doc[key])
+                if isinstance(doc.get('configurations'), dict):
+                    nested = children['configurations']
+                    self.assertEqual(list(nested), list(doc['configurations']))
+                    for key, (start, end) in nested.items():
+                        self.assertEqual(json.loads(data[start:end].decode('utf-8')),
+                                         doc['configurations'][key])
+
+    def test_parser_streaming_equals_full_load(self):
+        rng = random.Random(7)
+        with tempfile.TemporaryDirectory() as tmp:
+            for run in range(20):
+                path = os.path.join(tmp, f'collect_{run}.json')
+                doc = _random_document(rng)
+                with open(path, 'wb') as f:
+                    f.write(_encode(rng, doc))
+                parser = CollectParser(path, streaming=True)
+                with self.subTest(run=run):
+                    self.assertTrue(parser.load())
+                    self.assertEqual(parser.data.to_dict(), doc)
+
+    def test_broken_documents_are_rejected(self):
+        for data in (b'{"a": "offen', b'{"a": [1, 2}', b'{"a": 1'):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                _index_sections(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Normalization of COLLECT files, checked against the shipped v2.6 sample
+"""
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from collect_parser import CollectParser  # noqa: E402
+from collect_schema import normalize  # noqa: E402
+
+SAMPLE = os.path.join(REPO_DIR, 'DATEN JSON', 'Daten 281125_1825', 'migration.json')
+
+
+class SampleFileTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        parser = CollectParser(SAMPLE, streaming=False)
+        assert parser.load()
+        cls.model = parser.model
+
+    def test_no_static_item_without_mask(self):
+        # Das Beispiel liefert für "Ethernet" weder netmask noch prefix
+        self.assertEqual(self.model.get_category_items('network'), {})
+        for _, _, item in self.model.iter_items():
+            if 'ip_address' in item:
+                self.assertTrue(item['netmask'])
+
+    def test_adapter_shown_as_information(self):
+        note = self.model.system_info['netzwerk_Ethernet']
+        self.assertIn('172.23.19.22', note)
+        self.assertIn('ohne Subnetzmaske', note)
+
+    def test_drive_of_adapter_is_kept(self):
+        drive = self.model.get_category_items('network_drives')['F']
+        self.assertEqual(drive['unc_path'], '\\\\TOPLAP\\HYPERTEMP')
+
+
+class NetworkNormalizationTest(unittest.TestCase):
+
+    def test_prefix_becomes_mask(self):
+        model = normalize({'version': '2.6', 'network': [
+            {'name': 'LAN', 'ipv4': '10.0.0.5', 'prefix': 24, 'gateway': '10.0.0.1', 'dns': '10.0.0.2, 8.8.8.8'}]})
+        item = model.get_category_items('network')['LAN']
+        self.assertEqual(item['netmask'], '255.255.255.0')
+        self.assertEqual(item['gateway'], '10.0.0.1')
+        self.assertEqual(item['dns'], ['10.0.0.2', '8.8.8.8'])
+
+
+if __name__ == '__main__':
+    unittest.main()
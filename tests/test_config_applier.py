@@ -0,0 +1,243 @@
+"""
+Command rendering and output splitting of ConfigApplier (no system changes)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_restore  # noqa: E402
+from backup_store import BackupStore  # noqa: E402
+from config_applier import ConfigApplier  # noqa: E402
+from reg_parser import RegFile  # noqa: E402
+from registry_backend import MemoryRegistryBackend  # noqa: E402
+from system_snapshot import SystemSnapshot  # noqa: E402
+
+REG_BEFORE = """Windows Registry Editor Version 5.00
+
+[HKEY_LOCAL_MACHINE\\SOFTWARE\\Test]
+"Wert"="vorher"
+"""
+
+
+class NetshLinesTest(unittest.TestCase):
+
+    def test_named_arguments(self):
+        lines = ConfigApplier._netsh_lines({'interface': 'Ethernet', 'ip_address': '10.0.0.5',
+                                            'netmask': '255.255.255.0', 'gateway': '10.0.0.1',
+                                            'dns': ['10.0.0.2', '8.8.8.8']})
+        self.assertEqual(lines[0], 'interface ip set address name="Ethernet" source=static '
+                                   'address=10.0.0.5 mask=255.255.255.0 gateway=10.0.0.1')
+        self.assertEqual(lines[1], 'interface ip set dns name="Ethernet" static 10.0.0.2 validate=no')
+        self.assertEqual(lines[2], 'interface ip add dns name="Ethernet" 8.8.8.8 index=2 validate=no')
+
+    def test_without_gateway(self):
+        lines = ConfigApplier._netsh_lines({'interface': 'LAN', 'ip_address': '10.0.0.5',
+                                            'netmask': '255.0.0.0'})
+        self.assertTrue(lines[0].endswith('mask=255.0.0.0 gateway=none'))
+
+    def test_missing_mask_is_refused(self):
+        with self.assertRaises(ValueError):
+            ConfigApplier._netsh_lines({'interface': 'LAN', 'ip_address': '172.23.19.22',
+                                        'netmask': '', 'gateway': '172.23.16.1'})
+
+    def test_missing_mask_fails_item(self):
+        applier = ConfigApplier(dry_run=True)
+        results = applier.apply_network_batch([('LAN', {'interface': 'LAN', 'ip_address': '172.23.19.22',
+                                                        'netmask': '', 'gateway': '172.23.16.1'})])
+        self.assertFalse(results['LAN'][0])
+        self.assertEqual(len(applier.errors), 1)
+
+
+class FakeCmdApplier(ConfigApplier):
+    """Dry-run applier whose commands are answered from ``responses``"""
+
+    def __init__(self, cmd_output='', netsh_output=''):
+        super().__init__(dry_run=True, create_backup=False)
+        self.cmd_output = cmd_output
+        self.netsh_output = netsh_output
+        self.calls = []
+
+    def _run(self, args, retry=False, **kwargs):
+        with open(args[-1], encoding='utf-8', errors='replace') as f:
+            self.calls.append((args[0], retry, f.read()))
+        stdout = self.cmd_output if args[0] == 'cmd' else self.netsh_output
+        return subprocess.CompletedProcess(args, 0, stdout, '')
+
+
+class CmdScriptTest(unittest.TestCase):
+
+    def test_split_by_markers(self):
+        applier = FakeCmdApplier(cmd_output=(
+            "@@begin 0\nOK!\n@@end 0 0\n"
+            "@@begin 1\nDer Vorgang ist fehlgeschlagen\n@@end 1 0\n"
+            "@@begin 2\n@@end 2 1\n"))
+        outcomes = applier._run_cmd_script([['route add a'], ['route add b'], ['route add c'], ['route add d']])
+        self.assertEqual(outcomes[0], (True, 'OK!'))
+        self.assertFalse(outcomes[1][0])
+        self.assertEqual(outcomes[2], (False, ''))
+        # Ohne Marker (z.B. Abbruch des Skripts) kein Erfolg
+        self.assertFalse(outcomes[3][0])
+
+    def test_script_frames_blocks(self):
+        applier = FakeCmdApplier(cmd_output="@@begin 0\n@@end 0 0\n")
+        applier._run_cmd_script([['net use X: \\\\srv\\share /persistent:yes']])
+        script = applier.calls[0][2].splitlines()
+        self.assertEqual(script[:2], ['@echo off', 'echo @@begin 0'])
+        self.assertEqual(script[-1], 'echo @@end 0 %ERRORLEVEL%')
+
+    def test_netsh_batch_retries_only_failed_items(self):
+        applier = FakeCmdApplier(cmd_output=("@@begin 0\nOk.\n@@end 0 0\n"
+                                             "@@begin 1\nElement nicht gefunden.\n@@end 1 1\n"
+                                             "@@begin 2\n@@end 2 0\n"),
+                                 netsh_output='Ok.')
+        outcomes = applier._run_netsh_batch([['set a'], ['set b'], ['set c']])
+        self.assertEqual([ok for ok, _ in outcomes], [True, True, True])
+        retries = [call for call in applier.calls if call[0] == 'netsh']
+        self.assertEqual(len(retries), 1)
+        self.assertTrue(retries[0][1])
+        self.assertIn('set b', retries[0][2])
+
+
+class ResumeBackupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BackupStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def applier(self, snapshot, registry, run_id=None):
+        applier = ConfigApplier(backup_store=self.store, run_id=run_id,
+                                registry_backend=MemoryRegistryBackend.from_text(registry))
+        with mock.patch.object(SystemSnapshot, 'capture', return_value=SystemSnapshot(snapshot)):
+            applier.preflight()
+        applier.backup_registry_keys(['HKLM\\SOFTWARE\\Test'])
+        return applier
+
+    def test_resume_keeps_state_of_first_attempt(self):
+        first = self.applier({'hostname': 'ALT'}, REG_BEFORE)
+        resumed = self.applier({'hostname': 'NEU'}, REG_BEFORE.replace('vorher', 'nachher'),
+                               run_id=first.run_id)
+
+        run = self.store.load_run(first.run_id)
+        self.assertEqual(run.get_json('system_snapshot.json')['hostname'], 'ALT')
+        self.assertIn('"vorher"', run.get_bytes('registry_backup.reg').decode('utf-16'))
+        self.assertIn('"nachher"', run.get_bytes('registry_backup_2.reg').decode('utf-16'))
+        self.assertEqual(resumed.errors, [])
+
+
+class CountingBackend(MemoryRegistryBackend):
+    """Memory registry that records which subtrees were read"""
+
+    def __init__(self, reg_file=None):
+        super().__init__(reg_file)
+        self.reads = []
+
+    def read_tree(self, path):
+        self.reads.append(path)
+        return super().read_tree(path)
+
+
+class RegistryBackupTest(unittest.TestCase):
+
+    ROOT = 'HKEY_CURRENT_USER\\Software\\ALBIS'
+
+    def test_overlapping_keys_are_exported_once(self):
+        registry = (f"Windows Registry Editor Version 5.00\n\n[{self.ROOT}]\n\"Pfad\"=\"C:\\\\CGM\"\n\n"
+                    f"[{self.ROOT}\\Hotline\\1001]\n\"Nummer\"=\"1001\"\n\n"
+                    f"[{self.ROOT}-Hotline]\n\"Aktiv\"=dword:00000001\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = CountingBackend(RegFile.from_text(registry))
+            applier = ConfigApplier(backup_store=BackupStore(tmp), registry_backend=backend)
+            name = applier.backup_registry_keys([self.ROOT + '\\Hotline\\1001', self.ROOT + '-Hotline',
+                                                 self.ROOT])
+            applier.backup_registry_keys(['HKCU\\Software\\ALBIS\\Hotline'])
+            content = applier.backup.get_bytes(name).decode('utf-16')
+
+        self.assertEqual(backend.reads, [self.ROOT, self.ROOT + '-Hotline'])
+        for section in (self.ROOT, self.ROOT + '\\Hotline\\1001', self.ROOT + '-Hotline'):
+            self.assertEqual(content.count(f"[{section}]"), 1, section)
+
+
+class FileRestoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, 'Sammlung', 'ALBISWIN')
+        self.target = os.path.join(self.tmp.name, 'CGM', 'ALBISWIN')
+        os.makedirs(self.source)
+        os.makedirs(self.target)
+        self.write(self.source, 'ALBIS.INI', b'neu')
+        self.write(self.source, 'PRAXIS.DAT', b'neu' * 50000)
+        self.write(self.target, 'ALBIS.INI', b'alt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, folder, name, data):
+        with open(os.path.join(folder, name), 'wb') as f:
+            f.write(data)
+
+    def read(self, name):
+        with open(os.path.join(self.target, name), 'rb') as f:
+            return f.read()
+
+    def test_restore_and_rollback(self):
+        store = BackupStore(os.path.join(self.tmp.name, 'APPLY_Backup'))
+        applier = ConfigApplier(backup_store=store)
+        items = [(name, {'file': name, 'source_dir': self.source, 'target_dir': self.target})
+                 for name in ('ALBIS.INI', 'PRAXIS.DAT')]
+        results = applier.apply_albis_files_batch(items)
+        self.assertTrue(all(success for success, _ in results.values()), results)
+        self.assertEqual(self.read('PRAXIS.DAT'), b'neu' * 50000)
+        self.assertEqual(store.load_run(applier.run_id).get_bytes('ALBISWIN/ALBIS.INI'), b'alt')
+        applier.journal.close()
+
+        undone = ConfigApplier(backup_store=store).rollback(str(store.journal_path(applier.run_id)))
+        self.assertTrue(all(success for _, success, _ in undone), undone)
+        self.assertEqual(self.read('ALBIS.INI'), b'alt')
+        self.assertFalse(os.path.exists(os.path.join(self.target, 'PRAXIS.DAT')))
+
+    def test_unreadable_source_fails_only_its_item(self):
+        applier = ConfigApplier(backup_store=BackupStore(os.path.join(self.tmp.name, 'APPLY_Backup')))
+        items = [(name, {'file': name, 'source_dir': self.source, 'target_dir': self.target})
+                 for name in ('ALBIS.INI', 'FEHLT.DAT', 'PRAXIS.DAT')]
+        results = applier.apply_albis_files_batch(items)
+        applier.journal.close()
+
+        self.assertFalse(results['FEHLT.DAT'][0])
+        self.assertIn('Quelldatei nicht lesbar', results['FEHLT.DAT'][1])
+        self.assertTrue(results['ALBIS.INI'][0] and results['PRAXIS.DAT'][0], results)
+        self.assertEqual(self.read('ALBIS.INI'), b'neu')
+        self.assertEqual(len(applier.errors), 1)
+
+    def test_unreadable_target_fails_only_its_item(self):
+        self.write(self.target, 'PRAXIS.DAT', b'alt' * 50000)
+        real_digest = file_restore.file_digest
+
+        def digest(path):
+            if path == os.path.join(self.target, 'PRAXIS.DAT'):
+                raise PermissionError(13, 'Zugriff verweigert', path)
+            return real_digest(path)
+
+        with mock.patch.object(file_restore, 'file_digest', side_effect=digest):
+            tasks = file_restore.plan_restore(self.source, self.target)
+        by_name = {task.name: task for task in tasks}
+        self.assertIn('Zieldatei nicht lesbar', by_name['PRAXIS.DAT'].error)
+        self.assertEqual(by_name['ALBIS.INI'].error, '')
+
+        results, stats = file_restore.copy_files(tasks)
+        self.assertFalse(results['PRAXIS.DAT'][0])
+        self.assertTrue(results['ALBIS.INI'][0])
+        self.assertEqual(stats.files, 1)
+        self.assertEqual(self.read('PRAXIS.DAT'), b'alt' * 50000)
+
+
+if __name__ == '__main__':
+    unittest.main()
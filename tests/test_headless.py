@@ -0,0 +1,39 @@
+"""
+Exit codes of the headless commands
+"""
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cancellation import CancelToken  # noqa: E402
+from config_applier import ConfigApplier  # noqa: E402
+from headless import _execute  # noqa: E402
+
+
+class ExecuteExitCodeTest(unittest.TestCase):
+
+    def execute(self, selected):
+        token = CancelToken()
+        applier = ConfigApplier(dry_run=True, cancel_token=token)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            code = _execute(applier, token, selected, None, None, None)
+        return code, applier, output.getvalue()
+
+    def test_failure_outside_applier_errors(self):
+        code, applier, output = self.execute([('unbekannt', 'x', {})])
+        # Unbekannte Kategorie: Fehlschlag ohne Eintrag in applier.errors
+        self.assertEqual(applier.errors, [])
+        self.assertEqual(code, 1)
+        self.assertIn('Fehlgeschlagene Konfigurationen: 1', output)
+
+    def test_success(self):
+        code, _, _ = self.execute([])
+        self.assertEqual(code, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
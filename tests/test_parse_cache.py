@@ -0,0 +1,154 @@
+"""
+Persistent cache of normalized COLLECT files
+"""
+import json
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_cache  # noqa: E402
+from collect_parser import CollectParser  # noqa: E402
+from collect_schema import CollectModel  # noqa: E402
+from parse_cache import CACHE_SUFFIX, ParseCache  # noqa: E402
+
+COLLECT = {
+    'system_info': {'hostname': 'PRAXIS-01'},
+    'configurations': {
+        'hostname': {'PRAXIS-01': {'hostname': 'PRAXIS-01'}},
+        'network_drives': {'F': {'drive_letter': 'F', 'unc_path': '\\\\srv\\daten'}},
+    },
+}
+
+
+class ParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmp.name, 'cache'))
+        self.file = self.write('migration.json', COLLECT)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+    def model(self, hostname='PRAXIS-01'):
+        return CollectModel('legacy', {'hostname': hostname}, {'hostname': {hostname: {'hostname': hostname}}})
+
+    def entries(self):
+        return sorted(path.name for path in self.cache.cache_dir.glob(f"*{CACHE_SUFFIX}"))
+
+    def test_hit(self):
+        self.assertIsNone(self.cache.get(self.file))
+        self.cache.put(self.file, self.model())
+        cached = self.cache.get(self.file)
+        self.assertEqual(cached.to_dict(), self.model().to_dict())
+
+    def test_parser_uses_cache(self):
+        first = CollectParser(self.file, streaming=False, cache=self.cache)
+        self.assertTrue(first.load())
+        self.assertFalse(first.from_cache)
+        second = CollectParser(self.file, streaming=False, cache=self.cache)
+        self.assertTrue(second.load())
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.model.to_dict(), first.model.to_dict())
+
+    def test_invalidated_by_mtime(self):
+        self.cache.put(self.file, self.model())
+        stat = os.stat(self.file)
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(self.cache.get(self.file))
+        # Ungültiger Eintrag wird entfernt
+        self.assertEqual(self.entries(), [])
+
+    def test_invalidated_by_size(self):
+        self.cache.put(self.file, self.model())
+        stat = os.stat(self.file)
+        with open(self.file, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertIsNone(self.cache.get(self.file))
+
+    def test_invalidated_by_content_with_same_size_and_mtime(self):
+        self.cache.put(self.file, self.model())
+        stat = os.stat(self.file)
+        with open(self.file, 'r+', encoding='utf-8') as f:
+            content = f.read()
+            f.seek(0)
+            f.write(content.replace('PRAXIS-01', 'PRAXIS-02'))
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertIsNone(self.cache.get(self.file))
+
+    def test_invalidated_by_format(self):
+        self.cache.put(self.file, self.model())
+        with mock.patch.object(parse_cache, 'CACHE_FORMAT', parse_cache.CACHE_FORMAT + 1):
+            self.assertIsNone(self.cache.get(self.file))
+
+    def test_broken_entry_is_a_miss(self):
+        self.cache.put(self.file, self.model())
+        entry = self.cache.cache_dir / self.entries()[0]
+        entry.write_bytes(b'kein pickle')
+        self.assertIsNone(self.cache.get(self.file))
+
+    def test_non_dict_entry_is_a_miss(self):
+        self.cache.put(self.file, self.model())
+        entry = self.cache.cache_dir / self.entries()[0]
+        entry.write_bytes(b'\x80\x04K\x05.')
+        self.assertIsNone(self.cache.get(self.file))
+        self.assertEqual(self.entries(), [])
+
+        # Der Parser liest die Datei dann neu ein
+        parser = CollectParser(self.file, streaming=False, cache=self.cache)
+        self.assertTrue(parser.load())
+        self.assertFalse(parser.from_cache)
+
+    def test_entry_without_model_is_a_miss(self):
+        self.cache.put(self.file, self.model())
+        entry_path = self.cache.cache_dir / self.entries()[0]
+        with open(entry_path, 'rb') as f:
+            entry = pickle.load(f)
+        del entry['model']
+        with open(entry_path, 'wb') as f:
+            pickle.dump(entry, f)
+        self.assertIsNone(self.cache.get(self.file))
+        self.assertEqual(self.entries(), [])
+
+    def test_lru_eviction(self):
+        files = [self.write(f'collect_{idx}.json', COLLECT) for idx in range(3)]
+        for idx, path in enumerate(files):
+            self.cache.put(path, self.model(f'PC-{idx}'))
+        entry_size = max(path.stat().st_size for path in self.cache.cache_dir.glob(f"*{CACHE_SUFFIX}"))
+        # Zugriffsreihenfolge festlegen: collect_0 zuletzt benutzt, collect_1 am längsten nicht
+        for age, path in ((300, files[1]), (200, files[2]), (100, files[0])):
+            entry = self.cache._entry_path(path)
+            mtime = entry.stat().st_mtime - age
+            os.utime(entry, (mtime, mtime))
+
+        self.cache.max_bytes = entry_size * 2
+        self.cache.prune()
+        self.assertEqual(self.entries(), sorted(self.cache._entry_path(p).name for p in (files[0], files[2])))
+
+    def test_get_refreshes_lru_time(self):
+        self.cache.put(self.file, self.model())
+        entry = self.cache._entry_path(self.file)
+        os.utime(entry, (1, 1))
+        self.cache.get(self.file)
+        self.assertGreater(entry.stat().st_mtime, 1)
+
+    def test_clear(self):
+        self.cache.put(self.file, self.model())
+        self.cache.clear()
+        self.assertEqual(self.entries(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
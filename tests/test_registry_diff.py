@@ -0,0 +1,113 @@
+"""
+Registry diff against an in-memory target registry
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reg_parser import RegFile  # noqa: E402
+from registry_backend import MemoryRegistryBackend, RegistryBackend, merge_key_paths  # noqa: E402
+from registry_diff import ADD, DELETE, MODIFY, apply_changes, diff_registry  # noqa: E402
+
+ROOT = 'HKEY_CURRENT_USER\\Software\\ALBIS'
+
+COLLECTED = """Windows Registry Editor Version 5.00
+
+[HKEY_CURRENT_USER\\Software\\ALBIS]
+"Pfad"="C:\\\\CGM\\\\ALBISWIN"
+"Port"=dword:00000010
+
+[HKEY_CURRENT_USER\\Software\\ALBIS\\Drucker]
+"Standard"="Rezept"
+
+[HKEY_CURRENT_USER\\Software\\ALBIS\\Drucker\\Schacht]
+"Nummer"=dword:00000002
+"""
+
+
+class RecordingBackend(MemoryRegistryBackend):
+    """Memory registry that counts write operations"""
+
+    def __init__(self, reg_file=None):
+        super().__init__(reg_file)
+        self.writes = []
+
+    def create_key(self, path):
+        self.writes.append(('create_key', path))
+        super().create_key(path)
+
+    def delete_key(self, path):
+        self.writes.append(('delete_key', path))
+        super().delete_key(path)
+
+    def set_value(self, path, value):
+        self.writes.append(('set_value', path, value.name))
+        super().set_value(path, value)
+
+    def delete_value(self, path, name):
+        self.writes.append(('delete_value', path, name))
+        super().delete_value(path, name)
+
+
+class RegistryDiffTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collected = RegFile.from_text(COLLECTED)
+
+    def sync(self, live_text):
+        backend = RecordingBackend(RegFile.from_text(live_text))
+        changes = diff_registry(self.collected, backend, ROOT)
+        apply_changes(changes, backend)
+        # Nach dem Anwenden darf kein Unterschied mehr bestehen
+        self.assertEqual(diff_registry(self.collected, backend, ROOT), [])
+        return changes, backend
+
+    def test_identical_tree_writes_nothing(self):
+        changes, backend = self.sync(COLLECTED)
+        self.assertEqual(changes, [])
+        self.assertEqual(backend.writes, [])
+
+    def test_changed_value(self):
+        changes, backend = self.sync(COLLECTED.replace('dword:00000010', 'dword:00000020'))
+        self.assertEqual([(c.op, c.value_name) for c in changes], [(MODIFY, 'Port')])
+        self.assertEqual(backend.writes, [('set_value', ROOT, 'Port')])
+
+    def test_missing_subkey(self):
+        live = COLLECTED.split('[HKEY_CURRENT_USER\\Software\\ALBIS\\Drucker\\Schacht]')[0]
+        changes, backend = self.sync(live)
+        self.assertEqual([(c.op, c.key_path, c.value_name) for c in changes],
+                         [(ADD, ROOT + '\\Drucker\\Schacht', None),
+                          (ADD, ROOT + '\\Drucker\\Schacht', 'Nummer')])
+        self.assertEqual(len(backend.writes), 2)
+
+    def test_deleted_value(self):
+        self.collected = RegFile.from_text(COLLECTED.replace('"Standard"="Rezept"', '"Standard"=-'))
+        changes, backend = self.sync(COLLECTED)
+        self.assertEqual([(c.op, c.value_name) for c in changes], [(DELETE, 'Standard')])
+        self.assertEqual(backend.writes, [('delete_value', ROOT + '\\Drucker', 'Standard')])
+
+    def test_extra_value_on_target(self):
+        changes, _ = self.sync(COLLECTED.replace('"Standard"="Rezept"', '"Standard"="Rezept"\n"Alt"="x"'))
+        self.assertEqual([(c.op, c.value_name) for c in changes], [(DELETE, 'Alt')])
+
+    def test_backend_interface_is_abstract(self):
+        with self.assertRaises(TypeError):
+            RegistryBackend()
+
+
+class MergeKeyPathsTest(unittest.TestCase):
+
+    def test_prefix_sharing_sibling(self):
+        # '-' sortiert vor '\': das Geschwister darf die Zusammenführung nicht verhindern
+        self.assertEqual(merge_key_paths([ROOT, ROOT + '-Hotline', ROOT + '\\Hotline\\1001']),
+                         [ROOT, ROOT + '-Hotline'])
+
+    def test_aliases_and_case(self):
+        self.assertEqual(merge_key_paths(['HKCU\\Software\\albis\\Drucker', ROOT, '']),
+                         [ROOT])
+
+
+if __name__ == '__main__':
+    unittest.main()
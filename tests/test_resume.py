@@ -0,0 +1,66 @@
+"""
+Resume state and completion check of interrupted runs
+"""
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apply_journal import Journal  # noqa: E402
+from backup_store import BackupStore  # noqa: E402
+from resume import ResumeState, finish_run, track_run  # noqa: E402
+
+
+class ResumeStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BackupStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def applier(self, dry_run=False):
+        return SimpleNamespace(dry_run=dry_run, store=self.store, run_id='20261018_120000',
+                               create_backup=True, command_timeout=30.0, reboot_required=False)
+
+    def test_round_trip(self):
+        state = ResumeState('run1', 'C:\\COLLECT\\migration.json', ['network.lan', 'routes.r1'],
+                            workers=2, command_timeout=None, resumes=1)
+        state.save(self.store)
+        loaded = ResumeState.load(self.store)
+        self.assertEqual(loaded.to_dict(), state.to_dict())
+        ResumeState.clear(self.store)
+        self.assertIsNone(ResumeState.load(self.store))
+
+    def test_unreadable_state_is_ignored(self):
+        ResumeState.path(self.store).parent.mkdir(parents=True, exist_ok=True)
+        ResumeState.path(self.store).write_text('{"run_id": ', encoding='utf-8')
+        self.assertIsNone(ResumeState.load(self.store))
+
+    def test_dry_run_is_not_tracked(self):
+        self.assertIsNone(track_run(self.applier(dry_run=True), 'migration.json', ['network.lan']))
+        self.assertIsNone(ResumeState.load(self.store))
+
+    def test_finish_keeps_state_until_all_items_done(self):
+        applier = self.applier()
+        state = track_run(applier, 'migration.json', ['network.lan', 'routes.r1'])
+        self.assertEqual(ResumeState.load(self.store).selected_keys, ['network.lan', 'routes.r1'])
+
+        journal = Journal(str(self.store.journal_path(applier.run_id)))
+        journal.item_done('network.lan', True)
+        journal.item_done('routes.r1', False)
+        self.assertIn('1 Konfigurationen offen', finish_run(applier, state))
+        self.assertIsNotNone(ResumeState.load(self.store))
+
+        journal.item_done('routes.r1', True)
+        journal.close()
+        self.assertIsNone(finish_run(applier, state))
+        self.assertIsNone(ResumeState.load(self.store))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Parsing of 'route print -4' output (German and English Windows)
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_table import _PERSISTENT_RE, RouteTable  # noqa: E402
+
+ROUTE_PRINT_EN = """===========================================================================
+Interface List
+ 12...00 15 5d 01 02 03 ......Intel(R) Ethernet Connection (7) I219-LM
+  1...........................Software Loopback Interface 1
+===========================================================================
+
+IPv4 Route Table
+===========================================================================
+Active Routes:
+Network Destination        Netmask          Gateway       Interface  Metric
+          0.0.0.0          0.0.0.0      192.168.1.1     192.168.1.50     25
+        127.0.0.0        255.0.0.0         On-link         127.0.0.1    331
+      192.168.1.0    255.255.255.0         On-link      192.168.1.50    281
+         10.1.0.0      255.255.0.0    192.168.1.254     192.168.1.50     26
+===========================================================================
+Persistent Routes:
+  Network Address          Netmask  Gateway Address  Metric
+         10.1.0.0      255.255.0.0    192.168.1.254       1
+       172.16.0.0      255.240.0.0    192.168.1.253  Default
+===========================================================================
+"""
+
+ROUTE_PRINT_DE = """===========================================================================
+Schnittstellenliste
+ 12...00 15 5d 01 02 03 ......Intel(R) Ethernet Connection (7) I219-LM
+  1...........................Software Loopback Interface 1
+===========================================================================
+
+IPv4-Routentabelle
+===========================================================================
+Aktive Routen:
+     Netzwerkziel    Netzwerkmaske          Gateway    Schnittstelle Metrik
+          0.0.0.0          0.0.0.0      192.168.1.1     192.168.1.50     25
+        127.0.0.0        255.0.0.0   Auf Verbindung         127.0.0.1    331
+         10.1.0.0      255.255.0.0    192.168.1.254     192.168.1.50     26
+===========================================================================
+Ständige Routen:
+  Netzwerkadresse          Netzmaske  Gatewayadresse  Metrik
+         10.1.0.0      255.255.0.0    192.168.1.254       1
+===========================================================================
+"""
+
+
+class RouteTableParseTest(unittest.TestCase):
+
+    def check_common(self, table, on_link):
+        default = table.find('0.0.0.0', '0.0.0.0', '192.168.1.1')
+        self.assertEqual((default.interface, default.metric, default.persistent), ('192.168.1.50', 25, False))
+        loopback = table.find('127.0.0.0', '255.0.0.0', on_link)
+        self.assertEqual(loopback.metric, 331)
+        # Aktive und persistente Route werden zu einem Eintrag zusammengeführt
+        merged = table.find('10.1.0.0', '255.255.0.0', '192.168.1.254')
+        self.assertTrue(merged.persistent)
+        self.assertEqual((merged.interface, merged.metric), ('192.168.1.50', 26))
+
+    def test_english(self):
+        table = RouteTable.parse(ROUTE_PRINT_EN)
+        self.assertEqual(len(table), 5)
+        self.check_common(table, 'On-link')
+        only_persistent = table.find('172.16.0.0', '255.240.0.0', '192.168.1.253')
+        self.assertTrue(only_persistent.persistent)
+        self.assertIsNone(only_persistent.metric)
+
+    def test_german(self):
+        table = RouteTable.parse(ROUTE_PRINT_DE)
+        self.assertEqual(len(table), 3)
+        self.check_common(table, 'Auf Verbindung')
+
+    def test_german_in_wrong_codepage(self):
+        # OEM-Ausgabe (cp850) als ANSI gelesen
+        table = RouteTable.parse(ROUTE_PRINT_DE.replace('Ständige', 'St„ndige'))
+        self.assertTrue(table.find('10.1.0.0', '255.255.0.0', '192.168.1.254').persistent)
+
+    def test_no_persistent_routes(self):
+        text = ROUTE_PRINT_EN.split('Persistent Routes:')[0] + 'Persistent Routes:\n  None\n'
+        table = RouteTable.parse(text)
+        self.assertEqual(len(table), 4)
+        self.assertFalse(any(route.persistent for route in table))
+
+    def test_interface_list_is_ignored(self):
+        self.assertEqual(len(RouteTable.parse(ROUTE_PRINT_EN.split('IPv4 Route Table')[0])), 0)
+
+
+class PersistentHeaderTest(unittest.TestCase):
+
+    def test_matches(self):
+        for header in ('Persistent Routes:', 'Ständige Routen:', 'Staendige Routen:',
+                       'St�ndige Routen:', 'St„ndige Routen:'):
+            self.assertTrue(_PERSISTENT_RE.search(header), header)
+
+    def test_does_not_match(self):
+        for line in ('Aktive Routen:', 'Active Routes:', 'Standige Routen:',
+                     'Network Destination        Netmask          Gateway'):
+            self.assertFalse(_PERSISTENT_RE.search(line), line)
+
+
+if __name__ == '__main__':
+    unittest.main()
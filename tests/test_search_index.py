@@ -0,0 +1,55 @@
+"""
+Prefix search of the configuration item filter
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex, tokenize  # noqa: E402
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add(0, 'Netzwerk', 'Ethernet 10.0.0.5')
+        self.index.add(1, 'Netzlaufwerke', 'F: \\\\server\\daten')
+        self.index.add(2, 'Routen', '10.1.0.0 via 10.0.0.254')
+        self.index.add(3, 'Standardbrowser', 'Mozilla Firefox')
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('F: \\\\Server\\Daten'), ['f', 'server', 'daten'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_empty_query_means_no_filter(self):
+        self.assertIsNone(self.index.search('   '))
+
+    def test_prefix(self):
+        self.assertEqual(self.index.search('netz'), [0, 1])
+        self.assertEqual(self.index.search('NETZW'), [0])
+        self.assertEqual(self.index.search('fire'), [3])
+        self.assertEqual(self.index.search('xyz'), [])
+
+    def test_initials(self):
+        # Ein Zeichen: alle Items mit einem Token, das so beginnt
+        self.assertEqual(self.index.search('f'), [1, 3])
+        self.assertEqual(self.index.search('1'), [0, 2])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.index.search('netz daten'), [1])
+        self.assertEqual(self.index.search('10 via'), [2])
+        self.assertEqual(self.index.search('netz firefox'), [])
+
+    def test_add_invalidates_memo(self):
+        self.assertEqual(self.index.search('netz'), [0, 1])
+        self.assertEqual(self.index.search('s'), [1, 3])
+        self.index.add(4, 'Netzwerk', 'WLAN')
+        self.index.add(5, 'Scanner')
+        self.assertEqual(self.index.search('netz'), [0, 1, 4])
+        self.assertEqual(self.index.search('s'), [1, 3, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Selection bitset and selection profiles
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selection import BUILTIN_PROFILES, ProfileStore, SelectionProfile, SelectionSet  # noqa: E402
+
+
+class SelectionSetTest(unittest.TestCase):
+
+    def test_initial_state(self):
+        self.assertEqual(SelectionSet(11).indices(), list(range(11)))
+        self.assertEqual(SelectionSet(11, selected=False).count(), 0)
+        self.assertEqual(len(SelectionSet(11)), 11)
+
+    def test_set_and_get(self):
+        selection = SelectionSet(20, selected=False)
+        for index in (0, 7, 8, 19):
+            selection.set(index, True)
+        selection.set(7, False)
+        self.assertEqual(selection.indices(), [0, 8, 19])
+        self.assertTrue(selection.get(19))
+        self.assertFalse(selection.get(7))
+
+    def test_set_all_keeps_spare_bits_clear(self):
+        selection = SelectionSet(10, selected=False)
+        selection.set_all(True)
+        self.assertEqual(selection.count(), 10)
+        self.assertEqual(selection.indices(), list(range(10)))
+        selection.set_all(False)
+        self.assertEqual(selection.indices(), [])
+
+    def test_select_only(self):
+        selection = SelectionSet(17)
+        selection.select_only([3, 16])
+        self.assertEqual(selection.indices(), [3, 16])
+        self.assertEqual(selection.count(), 2)
+
+    def test_extend_across_byte_boundary(self):
+        selection = SelectionSet(7, selected=False)
+        selection.extend(3, selected=True)
+        self.assertEqual(len(selection), 10)
+        self.assertEqual(selection.indices(), [7, 8, 9])
+
+
+class SelectionProfileTest(unittest.TestCase):
+
+    def test_matches(self):
+        profile = SelectionProfile('Test', categories=['routes'], include=['network.*'],
+                                   exclude=['network.WLAN'])
+        self.assertTrue(profile.matches('routes', 'routes.10.1.0.0'))
+        self.assertTrue(profile.matches('network', 'network.Ethernet'))
+        self.assertFalse(profile.matches('network', 'network.WLAN'))
+        self.assertFalse(profile.matches('printers', 'printers.Rezept'))
+
+    def test_from_keys_escapes_patterns(self):
+        profile = SelectionProfile.from_keys('Auswahl', ['printers.Rezept [A4]'])
+        self.assertTrue(profile.matches('printers', 'printers.Rezept [A4]'))
+        self.assertFalse(profile.matches('printers', 'printers.Rezept A'))
+
+
+class ProfileStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sub', 'profiles.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_and_load(self):
+        store = ProfileStore(self.path)
+        store.save(SelectionProfile('Empfang', categories=['printers'], include=['network.*'],
+                                    exclude=['network.WLAN']))
+
+        loaded = ProfileStore(self.path).get('Empfang')
+        self.assertEqual(loaded.to_dict(), {'name': 'Empfang', 'categories': ['printers'],
+                                            'include': ['network.*'], 'exclude': ['network.WLAN']})
+        self.assertEqual(ProfileStore(self.path).names(),
+                         [p.name for p in BUILTIN_PROFILES] + ['Empfang'])
+
+        store.delete('Empfang')
+        self.assertIsNone(ProfileStore(self.path).get('Empfang'))
+
+    def test_former_builtin_name(self):
+        store = ProfileStore(self.path)
+        self.assertEqual(store.names()[0], "Kompletter ALBIS-Arbeitsplatz")
+        self.assertIs(store.get("Komplette ALBIS-Arbeitsplatz"), BUILTIN_PROFILES[0])
+
+    def test_builtin_cannot_be_overwritten(self):
+        store = ProfileStore(self.path)
+        with self.assertRaises(ValueError):
+            store.save(SelectionProfile(BUILTIN_PROFILES[0].name))
+
+    def test_broken_file_means_no_saved_profiles(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"profiles": [')
+        self.assertEqual(ProfileStore(self.path).names(), [p.name for p in BUILTIN_PROFILES])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Startup budget of the headless entry point
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Obergrenze für den Import des Headless-Pfads (Sekunden, frischer Interpreter)
+IMPORT_BUDGET = 0.5
+
+GUI_MODULES = ('gui', 'customtkinter', 'tkinter', 'PIL', 'expletus_style', 'winreg')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import headless
+elapsed = time.perf_counter() - started
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+class HeadlessStartupTest(unittest.TestCase):
+
+    def _probe(self):
+        result = subprocess.run([sys.executable, '-c', _PROBE], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+
+    def test_import_within_budget(self):
+        self._probe()  # Bytecode-Cache anlegen, gemessen wird der zweite Start
+        elapsed = min(self._probe()['elapsed'] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET,
+                        f"Import von headless dauert {elapsed:.3f}s (Budget {IMPORT_BUDGET}s)")
+
+    def test_no_gui_or_platform_modules(self):
+        modules = set(self._probe()['modules'])
+        leaked = [name for name in GUI_MODULES if name in modules]
+        self.assertEqual(leaked, [], f"Headless-Pfad importiert {leaked}")
+
+    def test_cli_help(self):
+        result = subprocess.run([sys.executable, 'main.py', '--help'], cwd=REPO_DIR,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('apply', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
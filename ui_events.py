@@ -0,0 +1,127 @@
+"""
+UI Events
+Thread-safe hand-over of log lines, status and progress to the Tk main loop
+"""
+import os
+import platform
+import queue
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+# Abfrageintervall der GUI (ca. 30 Bilder/s)
+FRAME_MS = 33
+
+# Zeilen, die das Log-Fenster höchstens behält (vollständiges Log liegt auf der Platte)
+MAX_LOG_LINES = 2000
+
+_LOG, _STATUS, _PROGRESS, _CALL = range(4)
+
+
+def default_log_dir() -> Path:
+    """Get the per-user log directory for APPLY"""
+    if platform.system() == 'Windows':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+        return Path(base) / 'eXpletus' / 'APPLY' / 'logs'
+    base = os.environ.get('XDG_STATE_HOME') or Path.home() / '.local' / 'state'
+    return Path(base) / 'expletus-apply' / 'logs'
+
+
+class UiBatch:
+    """Everything queued since the last frame; status and progress coalesced to the latest value"""
+
+    __slots__ = ('lines', 'status', 'progress', 'calls')
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.status: Optional[Tuple[str, Optional[str]]] = None
+        self.progress: Optional[float] = None
+        self.calls: List[Tuple[Callable, tuple]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.lines or self.status or self.progress is not None or self.calls)
+
+
+class UiEventQueue:
+    """
+    Queue between worker threads and the Tk main loop
+
+    Workers only enqueue; the GUI drains the queue once per frame with
+    ``after()`` and updates its widgets from the main thread.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def log(self, message: str):
+        """Queue a log line"""
+        self._queue.put((_LOG, message))
+
+    def status(self, text: str, color: Optional[str] = None):
+        """Queue a status text (only the latest one per frame is shown)"""
+        self._queue.put((_STATUS, (text, color)))
+
+    def progress(self, value: float):
+        """Queue a progress value between 0 and 1"""
+        self._queue.put((_PROGRESS, value))
+
+    def call(self, func: Callable, *args: Any):
+        """Run ``func(*args)`` on the main thread (dialogs, button states)"""
+        self._queue.put((_CALL, (func, args)))
+
+    def drain(self, max_events: int = 10000) -> UiBatch:
+        """
+        Take up to ``max_events`` queued events without blocking
+
+        The limit keeps a single frame short if a worker floods the queue;
+        the rest is picked up in the next frame.
+        """
+        batch = UiBatch()
+        for _ in range(max_events):
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == _LOG:
+                batch.lines.append(payload)
+            elif kind == _STATUS:
+                batch.status = payload
+            elif kind == _PROGRESS:
+                batch.progress = payload
+            else:
+                batch.calls.append(payload)
+        return batch
+
+
+class LogSpool:
+    """Complete log of a session on disk, written in batches"""
+
+    def __init__(self, log_dir: Optional[str] = None):
+        """
+        Args:
+            log_dir: Directory for log files (default: per-user log dir)
+        """
+        log_dir = Path(log_dir) if log_dir else default_log_dir()
+        self.path = log_dir / f"APPLY_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self._file = None
+        self._failed = False
+
+    def write(self, lines: List[str]):
+        """Append lines and flush once"""
+        if self._failed or not lines:
+            return
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+        except OSError as e:
+            # Logdatei ist optional, die GUI läuft ohne weiter
+            print(f"Log write failed for {self.path}: {e}")
+            self._failed = True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
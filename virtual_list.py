@@ -0,0 +1,151 @@
+"""
+Virtual List
+Scrollable configuration list that only creates widgets for visible rows
+"""
+import customtkinter as ctk
+
+from config_list import ConfigListModel, ListRow, HEADER, INFO, SEPARATOR, ITEM
+from expletus_style import Colors, Fonts
+
+
+class _RowView:
+    """Pooled widgets for one visible line, re-bound to different rows while scrolling"""
+
+    def __init__(self, parent, height: int, on_toggle):
+        self.frame = ctk.CTkFrame(parent, height=height, fg_color="transparent", corner_radius=0)
+        self.checkbox = ctk.CTkCheckBox(self.frame, text="", font=Fonts.NORMAL,
+                                        command=lambda: on_toggle(self))
+        self.label = ctk.CTkLabel(self.frame, text="", anchor="w")
+        self.separator = ctk.CTkFrame(self.frame, height=2, fg_color=Colors.GRAY)
+        self.row = None
+        self.kind = None
+
+    def bind_row(self, row: ListRow, selected: bool):
+        """Show ``row`` in this line (only touches widgets whose content changed)"""
+        if row.kind != self.kind:
+            self.checkbox.pack_forget()
+            self.label.pack_forget()
+            self.separator.pack_forget()
+            if row.kind == ITEM:
+                self.checkbox.pack(side="left", padx=(20, 10))
+                self.label.configure(font=Fonts.SMALL, text_color=Colors.MUTED)
+                self.label.pack(side="left", fill="x", expand=True)
+            elif row.kind == HEADER:
+                self.label.configure(font=Fonts.SUBTITLE, text_color=("gray10", "gray90"))
+                self.label.pack(side="left", fill="x", expand=True)
+            elif row.kind == INFO:
+                self.label.configure(font=Fonts.SMALL, text_color=Colors.MUTED)
+                self.label.pack(side="left", fill="x", expand=True, padx=(20, 0))
+            elif row.kind == SEPARATOR:
+                self.separator.pack(fill="x", expand=True)
+            self.kind = row.kind
+
+        if row is not self.row:
+            if row.kind == ITEM:
+                self.checkbox.configure(text=row.text)
+                self.label.configure(text=row.detail)
+            elif row.kind in (HEADER, INFO):
+                self.label.configure(text=row.text)
+            self.row = row
+
+        if row.kind == ITEM and bool(self.checkbox.get()) != selected:
+            if selected:
+                self.checkbox.select()
+            else:
+                self.checkbox.deselect()
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    List view over a ConfigListModel
+
+    A fixed pool of row widgets (one per visible line) is re-bound to the
+    model while scrolling, so creating and scrolling the list costs the same
+    for ten items as for ten thousand. All rows have the same height and the
+    list scrolls by whole rows.
+    """
+
+    ROW_HEIGHT = 26
+
+    def __init__(self, master, model: ConfigListModel = None, height: int = 250, **kwargs):
+        super().__init__(master, height=height, **kwargs)
+        self.model = model or ConfigListModel()
+        self._first = 0
+        self._visible = 0
+        self._pool = []
+
+        self._body = ctk.CTkFrame(self, fg_color="transparent")
+        self._body.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y")
+
+        self._body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self._body)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        widget.bind("<Button-5>", lambda e: self.scroll_rows(3))
+
+    def set_model(self, model: ConfigListModel):
+        """Show another model and scroll back to the top"""
+        self.model = model
+        self._first = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-bind the visible rows to the model (after data or selection changes)"""
+        rows = self.model.visible_rows
+        total = len(rows)
+        self._first = max(0, min(self._first, total - self._visible))
+        for i, view in enumerate(self._pool):
+            index = self._first + i
+            if i < self._visible and index < total:
+                row = rows[index]
+                view.bind_row(row, self.model.is_row_selected(row))
+                view.frame.place(x=0, y=i * self.ROW_HEIGHT, relwidth=1.0)
+            else:
+                view.frame.place_forget()
+                view.row = None
+
+        if total <= self._visible or total == 0:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._first / total, (self._first + self._visible) / total)
+
+    def scroll_rows(self, delta: int):
+        """Scroll by ``delta`` rows"""
+        self._first += delta
+        self.refresh()
+
+    def scroll_to(self, index: int):
+        """Make row ``index`` the first visible row"""
+        self._first = index
+        self.refresh()
+
+    def _on_resize(self, event):
+        self._visible = max(1, event.height // self.ROW_HEIGHT)
+        while len(self._pool) < self._visible:
+            view = _RowView(self._body, self.ROW_HEIGHT, self._on_toggle)
+            for widget in (view.frame, view.checkbox, view.label):
+                self._bind_wheel(widget)
+            self._pool.append(view)
+        self.refresh()
+
+    def _on_wheel(self, event):
+        # Windows: Vielfache von 120 je Raststufe, macOS: kleine Werte
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_rows(-3 * steps)
+
+    def _on_scrollbar(self, *args):
+        total = len(self.model.visible_rows)
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = self._visible if args[2] == 'pages' else 1
+            self._first += int(args[1]) * step
+        self.refresh()
+
+    def _on_toggle(self, view: _RowView):
+        if view.row is not None and view.row.kind == ITEM:
+            self.model.set_selected(view.row.config_key, bool(view.checkbox.get()))